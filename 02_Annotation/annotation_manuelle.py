@@ -2,12 +2,17 @@
 Module d'annotation manuelle des sentiments
 """
 
+import sys
 import json
 import argparse
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.colonnes import ecrire_parquet
+
 
 class AnnotateurSentiment:
     """Outil d'annotation de sentiments"""
@@ -154,6 +159,10 @@ class AnnotateurSentiment:
         with open(self.chemin_sortie, 'w', encoding='utf-8') as f:
             json.dump(self.donnees, f, ensure_ascii=False, indent=2)
         print(f"\n✓ Annotations sauvegardées dans : {self.chemin_sortie}")
+        
+        # Copie en colonnes pour les statistiques (ignorée sans pyarrow)
+        if ecrire_parquet(self.chemin_sortie, self.donnees):
+            print(f"✓ Copie Parquet : {self.chemin_sortie.with_suffix('.parquet')}")
 
 
 def main():
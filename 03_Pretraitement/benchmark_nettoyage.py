@@ -0,0 +1,117 @@
+"""
+Vérification et micro-benchmark du normaliseur nettoyer_texte
+
+1. Équivalence : compare nettoyer_texte à l'ancienne chaîne de re.sub
+   (cas limites, corpus annoté et textes aléatoires construits à partir de
+   fragments piégeux : mentions collées aux URLs, ponctuation, unicode...)
+2. Coût par texte sur 100k publications pour les deux implémentations
+
+Utilisation :
+    python benchmark_nettoyage.py --nombre 100000 --aleatoires 200000
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from pretraitement import nettoyer_texte, nettoyer_textes
+
+
+def nettoyer_texte_reference(texte):
+    """Ancienne implémentation : quatre re.sub successifs"""
+    if not isinstance(texte, str):
+        return ""
+    
+    texte = re.sub(r'@\w+', '', texte)
+    texte = re.sub(r'#\w+', '', texte)
+    texte = re.sub(r'https?://\S+|www\.\S+', '', texte)
+    texte = re.sub(r'[^\w\s]', ' ', texte)
+    texte = ' '.join(texte.split())
+    return texte.lower()
+
+
+CAS_LIMITES = [
+    None, 42, "", "   ", "\n\t",
+    "Excellent programme à l'UVBF ! #Formation @uvbf_officiel",
+    "Voir https://uvbf.bf/inscription et www.uvbf.bf/faq.",
+    "http@a://x.com", "https@as://x", "ww@aw.x", "www@a.x", "htt#ap://x",
+    "https:/#a/x", "https:/@a/@b/x", "a@b#c", "#@a", "@#a", "##ab", "@@ab",
+    "x@y.com", "mail: a.b@uvbf.bf", "https://x.com/@user/status#frag",
+    "@xhttps://y", "awww.x", "ÉCOLE Ça VA ? — «Oui»… 😊", "İstanbul",
+    "under_score @_ #_ a_@b", "ligne1\nligne2\r\nligne3", "100% #1 @2",
+]
+
+FRAGMENTS = [
+    "@", "#", "a", "b", "_", "é", "1", " ", "\n", "http", "https", "://", ":", "/",
+    "www", ".", "w", "p", "s", "!", "?", "'", "-", "😊", "UVBF", "@uvbf", "#UVBF",
+]
+
+
+def textes_aleatoires(nombre, graine=0):
+    rng = random.Random(graine)
+    return [''.join(rng.choices(FRAGMENTS, k=rng.randint(1, 12))) for _ in range(nombre)]
+
+
+def verifier_equivalence(textes, nom):
+    differences = [t for t in textes if nettoyer_texte(t) != nettoyer_texte_reference(t)]
+    statut = "✓" if not differences else "❌"
+    print(f"  {statut} {nom} : {len(textes) - len(differences)}/{len(textes)} identiques")
+    for texte in differences[:5]:
+        print(f"      {texte!r} -> {nettoyer_texte(texte)!r} "
+              f"(attendu {nettoyer_texte_reference(texte)!r})")
+    return not differences
+
+
+def cout_par_texte(fonction, textes):
+    debut = time.perf_counter()
+    fonction(textes)
+    return (time.perf_counter() - debut) / len(textes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nombre', type=int, default=100_000,
+                        help='Nombre de publications pour le micro-benchmark')
+    parser.add_argument('--aleatoires', type=int, default=200_000,
+                        help="Nombre de textes aléatoires pour l'équivalence")
+    args = parser.parse_args()
+    
+    chemin = Path(__file__).parent.parent / '02_Annotation' / 'uvbf_data_annote.json'
+    with open(chemin, 'r', encoding='utf-8') as f:
+        corpus = [item.get('texte') for item in json.load(f)]
+    
+    print("="*70)
+    print("ÉQUIVALENCE AVEC L'ANCIENNE CHAÎNE DE re.sub")
+    print("="*70)
+    ok = all([
+        verifier_equivalence(CAS_LIMITES, "Cas limites"),
+        verifier_equivalence(corpus, "Corpus annoté"),
+        verifier_equivalence(textes_aleatoires(args.aleatoires), "Textes aléatoires"),
+    ])
+    serie = pd.Series(corpus, index=range(100, 100 + len(corpus)))
+    resultat = nettoyer_textes(serie)
+    ok_serie = (resultat.index.equals(serie.index)
+                and resultat.tolist() == [nettoyer_texte_reference(t) for t in corpus])
+    print(f"  {'✓' if ok_serie else '❌'} nettoyer_textes sur une Series (index conservé)")
+    
+    print("\n" + "="*70)
+    print(f"MICRO-BENCHMARK ({args.nombre} publications)")
+    print("="*70)
+    publications = (corpus * (args.nombre // len(corpus) + 1))[:args.nombre]
+    reference = cout_par_texte(lambda ts: [nettoyer_texte_reference(t) for t in ts], publications)
+    fusionne = cout_par_texte(nettoyer_textes, publications)
+    print(f"  Chaîne de re.sub     : {reference:6.2f} µs/texte")
+    print(f"  Normaliseur fusionné : {fusionne:6.2f} µs/texte  ×{reference / fusionne:.1f}")
+    print("="*70)
+    
+    if not (ok and ok_serie):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
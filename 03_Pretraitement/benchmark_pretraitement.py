@@ -0,0 +1,81 @@
+"""
+Benchmark du prétraitement spaCy : boucle nlp(texte) vs moteur par lots nlp.pipe
+
+Compare le débit (documents/seconde) de l'ancien chemin (pipeline complet,
+un appel nlp() par texte) avec pretraitement_lot, et vérifie que les
+texte_traite produits sont identiques.
+
+Utilisation :
+    python benchmark_pretraitement.py --repetitions 10 --n-process 1 2 4
+"""
+
+import json
+import time
+import argparse
+from pathlib import Path
+
+import spacy
+
+from pretraitement import nettoyer_texte, extraire_lemmes, pretraitement_lot
+
+
+def chemin_historique(nlp_complet, textes):
+    """Reproduit l'ancienne boucle : un appel nlp() par texte, pipeline complet"""
+    resultats = []
+    for texte in textes:
+        if not isinstance(texte, str) or not texte.strip():
+            resultats.append('')
+            continue
+        resultats.append(' '.join(extraire_lemmes(nlp_complet(texte))))
+    return resultats
+
+
+def mesurer(fonction, nb_textes):
+    """Exécute fonction() et renvoie (résultat, docs/sec)"""
+    debut = time.perf_counter()
+    resultat = fonction()
+    duree = time.perf_counter() - debut
+    return resultat, nb_textes / duree if duree > 0 else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repetitions', type=int, default=10,
+                        help='Nombre de copies du corpus annoté à traiter')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--n-process', type=int, nargs='+', default=[1, 2])
+    args = parser.parse_args()
+    
+    script_dir = Path(__file__).parent
+    chemin_entree = script_dir.parent / '02_Annotation' / 'uvbf_data_annote.json'
+    
+    with open(chemin_entree, 'r', encoding='utf-8') as f:
+        donnees = json.load(f)
+    
+    textes = [nettoyer_texte(item['texte']) for item in donnees if 'texte' in item]
+    textes = textes * args.repetitions
+    
+    print("="*70)
+    print("BENCHMARK PRÉTRAITEMENT SPACY")
+    print("="*70)
+    print(f"Textes : {len(textes)} ({args.repetitions} × corpus annoté)")
+    
+    nlp_complet = spacy.load('fr_core_news_sm')
+    reference, debit_ref = mesurer(lambda: chemin_historique(nlp_complet, textes), len(textes))
+    print(f"\n  Boucle nlp(texte), pipeline complet : {debit_ref:8.1f} docs/sec")
+    
+    for n_process in args.n_process:
+        tokens, debit = mesurer(
+            lambda: pretraitement_lot(textes, batch_size=args.batch_size, n_process=n_process),
+            len(textes)
+        )
+        identique = [' '.join(t) for t in tokens] == reference
+        print(f"  nlp.pipe (batch_size={args.batch_size}, n_process={n_process}) : "
+              f"{debit:8.1f} docs/sec  ×{debit / debit_ref:.1f}  "
+              f"{'✓ identique' if identique else '❌ DIFFÉRENT'}")
+    
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
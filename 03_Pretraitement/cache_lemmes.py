@@ -0,0 +1,161 @@
+"""
+Cache persistant des lemmes produits par spaCy
+
+Les textes nettoyés sont identifiés par une empreinte SHA-256 qui inclut le
+nom et la version du modèle spaCy : changer de modèle invalide donc le cache
+sans qu'il soit nécessaire de le supprimer.
+
+Deux niveaux :
+- une LRU en mémoire (OrderedDict) pour les textes répétés dans un même run
+- une base SQLite sur disque, bornée à taille_max entrées (éviction LRU)
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+from collections import OrderedDict
+
+
+class CacheLemmes:
+    """Cache mémoire + disque des tokens lemmatisés"""
+    
+    def __init__(self, chemin, modele, version, taille_max=200_000, taille_memoire=10_000):
+        """
+        Initialise le cache
+        
+        Args:
+            chemin: Fichier SQLite du cache
+            modele: Nom du modèle spaCy (ex: fr_core_news_sm)
+            version: Version du modèle spaCy
+            taille_max: Nombre maximal d'entrées conservées sur disque
+            taille_memoire: Nombre maximal d'entrées de la LRU en mémoire
+        """
+        self.chemin = chemin
+        self.prefixe = f"{modele}\0{version}\0"
+        self.taille_max = taille_max
+        self.taille_memoire = taille_memoire
+        self.memoire = OrderedDict()
+        
+        self.succes_memoire = 0
+        self.succes_disque = 0
+        self.echecs = 0
+        self.evictions = 0
+        
+        self.connexion = sqlite3.connect(str(chemin))
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS lemmes ("
+            "cle TEXT PRIMARY KEY, tokens TEXT NOT NULL, dernier_acces REAL NOT NULL)"
+        )
+        self.connexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_dernier_acces ON lemmes (dernier_acces)"
+        )
+    
+    def cle(self, texte):
+        """Empreinte du texte nettoyé pour ce modèle"""
+        return hashlib.sha256((self.prefixe + texte).encode('utf-8')).hexdigest()
+    
+    def _memoriser(self, cle, tokens):
+        self.memoire[cle] = tokens
+        self.memoire.move_to_end(cle)
+        if len(self.memoire) > self.taille_memoire:
+            self.memoire.popitem(last=False)
+    
+    def obtenir_lot(self, textes):
+        """
+        Cherche une liste de textes dans le cache
+        
+        Returns:
+            Dictionnaire texte -> tokens pour les textes trouvés
+        """
+        trouves = {}
+        manquants = {}
+        # Clés lues (mémoire ou disque) : leur dernier accès sur disque est mis à jour,
+        # sinon l'éviction LRU supprimerait d'abord les textes servis par la mémoire
+        lues = []
+        for texte in dict.fromkeys(textes):
+            cle = self.cle(texte)
+            if cle in self.memoire:
+                self.memoire.move_to_end(cle)
+                trouves[texte] = self.memoire[cle]
+                lues.append(cle)
+                self.succes_memoire += 1
+            else:
+                manquants[cle] = texte
+        
+        cles = list(manquants)
+        maintenant = time.time()
+        # SQLite limite le nombre de paramètres par requête
+        for debut in range(0, len(cles), 500):
+            morceau = cles[debut:debut + 500]
+            marqueurs = ','.join('?' * len(morceau))
+            lignes = self.connexion.execute(
+                f"SELECT cle, tokens FROM lemmes WHERE cle IN ({marqueurs})", morceau
+            ).fetchall()
+            for cle, tokens in lignes:
+                tokens = json.loads(tokens)
+                trouves[manquants[cle]] = tokens
+                self._memoriser(cle, tokens)
+                lues.append(cle)
+            self.succes_disque += len(lignes)
+            self.echecs += len(morceau) - len(lignes)
+        
+        self.connexion.executemany(
+            "UPDATE lemmes SET dernier_acces = ? WHERE cle = ?",
+            [(maintenant, cle) for cle in lues]
+        )
+        self.connexion.commit()
+        return trouves
+    
+    def obtenir(self, texte):
+        """Renvoie les tokens d'un texte, ou None s'il n'est pas en cache"""
+        return self.obtenir_lot([texte]).get(texte)
+    
+    def enregistrer_lot(self, paires):
+        """Enregistre des couples (texte, tokens) puis applique la limite de taille"""
+        maintenant = time.time()
+        lignes = []
+        for texte, tokens in paires:
+            cle = self.cle(texte)
+            self._memoriser(cle, tokens)
+            lignes.append((cle, json.dumps(tokens, ensure_ascii=False), maintenant))
+        
+        self.connexion.executemany(
+            "INSERT OR REPLACE INTO lemmes (cle, tokens, dernier_acces) VALUES (?, ?, ?)",
+            lignes
+        )
+        self._evincer()
+        self.connexion.commit()
+    
+    def enregistrer(self, texte, tokens):
+        self.enregistrer_lot([(texte, tokens)])
+    
+    def _evincer(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de taille_max"""
+        (taille,) = self.connexion.execute("SELECT COUNT(*) FROM lemmes").fetchone()
+        excedent = taille - self.taille_max
+        if excedent > 0:
+            self.connexion.execute(
+                "DELETE FROM lemmes WHERE cle IN ("
+                "SELECT cle FROM lemmes ORDER BY dernier_acces LIMIT ?)",
+                (excedent,)
+            )
+            self.evictions += excedent
+    
+    def statistiques(self):
+        """Compteurs de succès/échecs du cache"""
+        (taille,) = self.connexion.execute("SELECT COUNT(*) FROM lemmes").fetchone()
+        succes = self.succes_memoire + self.succes_disque
+        total = succes + self.echecs
+        return {
+            'succes_memoire': self.succes_memoire,
+            'succes_disque': self.succes_disque,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'taux_succes': succes / total if total else 0.0,
+            'entrees_disque': taille,
+            'entrees_memoire': len(self.memoire)
+        }
+    
+    def fermer(self):
+        self.connexion.close()
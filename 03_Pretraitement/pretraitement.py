@@ -1,68 +1,264 @@
-import json
 import re
+import sys
+import argparse
+from pathlib import Path
+from itertools import islice
+import pandas as pd
 import spacy
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.corpus import lire_corpus, ecrire_corpus, resoudre_corpus, empreinte_texte
+from outils.colonnes import ecrire_parquet
+from cache_lemmes import CacheLemmes
+
+# Composants de fr_core_news_sm inutiles pour la lemmatisation et les stop words
+COMPOSANTS_DESACTIVES = ['parser', 'ner']
+
 # Charger le modèle français de spaCy
-nlp = spacy.load('fr_core_news_sm')
+nlp = spacy.load('fr_core_news_sm', disable=COMPOSANTS_DESACTIVES)
+
+# Mentions, hashtags, URLs et ponctuation, remplacés par un espace en une passe
+MOTIF_NETTOYAGE = re.compile(r'[@#]\w+|https?://\S+|www\.\S+|[^\w\s]')
+# Ponctuation seule, pour les textes sans mention, hashtag ni URL
+MOTIF_PONCTUATION = re.compile(r'[^\w\s]')
+# Mentions et hashtags seuls, supprimés sans espace
+MOTIF_MENTIONS = re.compile(r'[@#]\w+')
+# Mentions ou hashtags dont la suppression recollerait un début d'URL
+# ("http@a://x") ou viderait la fin d'une URL ("http://#a")
+MOTIF_JOINTURE = re.compile(r'[psw:/](?:[@#]\w+)+[:/.]|(?:https?://|www\.)[@#]')
 
 def nettoyer_texte(texte):
     if not isinstance(texte, str):
         return ""
     
-    # Suppression des mentions @utilisateur
-    texte = re.sub(r'@\w+', '', texte)
-    # Suppression des hashtags
-    texte = re.sub(r'#\w+', '', texte)
-    # Suppression des URLs
-    texte = re.sub(r'https?://\S+|www\.\S+', '', texte)
-    # Suppression des caractères spéciaux et de la ponctuation
-    texte = re.sub(r'[^\w\s]', ' ', texte)
-    # Suppression des espaces multiples
-    texte = ' '.join(texte.split())
-    return texte.lower()
-
-def pretraitement_texte(texte):
+    if '@' in texte or '#' in texte:
+        # Remplacer une mention par un espace plutôt que par '' ne change le
+        # résultat que lorsqu'elle touche une URL : dans ce cas (rare), les
+        # mentions et hashtags sont d'abord supprimés à part.
+        if MOTIF_JOINTURE.search(texte):
+            texte = MOTIF_MENTIONS.sub('', texte)
+        motif = MOTIF_NETTOYAGE
+    elif 'http' in texte or 'www.' in texte:
+        motif = MOTIF_NETTOYAGE
+    else:
+        motif = MOTIF_PONCTUATION
+    
+    # Suppression des mentions, hashtags, URLs et de la ponctuation,
+    # puis des espaces multiples
+    return ' '.join(motif.sub(' ', texte).split()).lower()
+
+def nettoyer_textes(textes):
+    """
+    Nettoie une liste ou une Series pandas de textes
+    
+    Boucle Python sur nettoyer_texte, gardée volontairement : les méthodes
+    .str de pandas appliquent re.sub texte par texte (plus lent, ×2,8 sur
+    100k publications), et les chaînes pyarrow passent par RE2, dont \\w
+    ne reconnaît pas les lettres accentuées.
+    
+    Returns:
+        Une liste, ou une Series de même index si l'entrée est une Series
+    """
+    resultats = [nettoyer_texte(texte) for texte in textes]
+    if isinstance(textes, pd.Series):
+        return pd.Series(resultats, index=textes.index, name=textes.name)
+    return resultats
+
+def extraire_lemmes(doc):
+    """Lemmatisation et suppression des stop words sur un Doc spaCy"""
+    return [token.lemma_ for token in doc
+            if not token.is_stop and not token.is_punct
+            and not token.is_space and not token.is_digit
+            and len(token.text) > 2]  # Suppression des mots trop courts
+
+def creer_cache(chemin, **options):
+    """Crée un cache de lemmes lié au modèle spaCy chargé"""
+    return CacheLemmes(chemin, f"{nlp.meta['lang']}_{nlp.meta['name']}",
+                       nlp.meta['version'], **options)
+
+def pretraitement_texte(texte, cache=None):
     if not isinstance(texte, str) or not texte.strip():
         return []
     
-    doc = nlp(texte)
-    # Lemmatisation et suppression des stop words
-    tokens = [token.lemma_ for token in doc 
-              if not token.is_stop and not token.is_punct 
-              and not token.is_space and not token.is_digit
-              and len(token.text) > 2]  # Suppression des mots trop courts
+    if cache is not None:
+        tokens = cache.obtenir(texte)
+        if tokens is None:
+            tokens = extraire_lemmes(nlp(texte))
+            cache.enregistrer(texte, tokens)
+        return list(tokens)
+    
+    return extraire_lemmes(nlp(texte))
+
+def pretraitement_lot(textes, batch_size=256, n_process=1, progression=False, cache=None):
+    """
+    Prétraite une liste de textes nettoyés avec nlp.pipe
+    
+    Args:
+        textes: Liste de textes (déjà passés par nettoyer_texte)
+        batch_size: Nombre de textes envoyés à spaCy par lot
+        n_process: Nombre de processus spaCy (1 = pas de multiprocessing)
+        progression: Afficher une barre tqdm
+        cache: CacheLemmes optionnel, seuls les textes absents passent par spaCy
+    
+    Returns:
+        Liste des tokens de chaque texte, dans l'ordre d'entrée
+    """
+    # Les textes vides ne passent pas par spaCy (même règle que pretraitement_texte)
+    valides = [texte for texte in textes if isinstance(texte, str) and texte.strip()]
+    
+    connus = cache.obtenir_lot(valides) if cache is not None else {}
+    # Chaque texte distinct n'est lemmatisé qu'une fois
+    a_traiter = [texte for texte in dict.fromkeys(valides) if texte not in connus]
     
-    return tokens
+    docs = nlp.pipe(a_traiter, batch_size=batch_size, n_process=n_process)
+    if progression:
+        docs = tqdm(docs, total=len(a_traiter), desc="Lemmatisation")
+    nouveaux = {texte: extraire_lemmes(doc) for texte, doc in zip(a_traiter, docs)}
+    
+    if cache is not None and nouveaux:
+        cache.enregistrer_lot(nouveaux.items())
+    connus.update(nouveaux)
+    
+    return [list(connus[texte]) if isinstance(texte, str) and texte.strip() else []
+            for texte in textes]
+
+def charger_existant(chemin):
+    """Index (id, empreinte du texte) -> texte_traite d'un fichier déjà prétraité"""
+    return {
+        (item['id'], empreinte_texte(item['texte'])): item['texte_traite']
+        for item in lire_corpus(chemin)
+        if 'id' in item and 'texte' in item and 'texte_traite' in item
+    }
+
+def separer_delta(bloc, existant, reutilises):
+    """
+    Reprend le texte_traite des publications déjà prétraitées
+    
+    Une publication est réutilisée si le couple (id, empreinte du texte) existe
+    déjà dans l'index ; elle est sinon à retraiter. La clé inclut l'empreinte
+    car certains id apparaissent plusieurs fois avec des textes différents.
+    
+    Args:
+        bloc: Liste de publications
+        existant: Index renvoyé par charger_existant
+        reutilises: Ensemble complété avec les clés réutilisées
+    
+    Returns:
+        Publications nouvelles ou modifiées du bloc
+    """
+    a_traiter = []
+    for item in bloc:
+        if 'texte' not in item:
+            continue
+        cle = (item.get('id'), empreinte_texte(item['texte']))
+        if cle in existant:
+            item['texte_traite'] = existant[cle]
+            reutilises.add(cle)
+        else:
+            a_traiter.append(item)
+    return a_traiter
+
+def pretraiter_flux(publications, taille_bloc=10_000, existant=None, reutilises=None, **options):
+    """
+    Prétraite un flux de publications bloc par bloc (mémoire constante)
+    
+    Args:
+        publications: Itérable de publications (ex: lire_corpus)
+        taille_bloc: Nombre de publications chargées à la fois
+        existant: Index charger_existant pour le mode incrémental
+        reutilises: Ensemble des clés réutilisées (mode incrémental)
+        options: Arguments transmis à pretraitement_lot
+    
+    Yields:
+        Les publications, dans l'ordre, avec leur texte_traite
+    """
+    publications = iter(publications)
+    while True:
+        bloc = list(islice(publications, taille_bloc))
+        if not bloc:
+            return
+        
+        if existant is not None:
+            items = separer_delta(bloc, existant, reutilises)
+        else:
+            items = [item for item in bloc if 'texte' in item]
+        
+        textes_propres = nettoyer_textes([item['texte'] for item in items])
+        tokens_par_texte = pretraitement_lot(textes_propres, **options)
+        for item, tokens in zip(items, tokens_par_texte):
+            item['texte_traite'] = ' '.join(tokens)
+        
+        yield from bloc
 
 def main():
-    from pathlib import Path
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--n-process', type=int, default=1)
+    parser.add_argument('--taille-bloc', type=int, default=10_000,
+                        help='Nombre de publications chargées en mémoire à la fois')
+    parser.add_argument('--sans-cache', action='store_true',
+                        help='Ne pas utiliser le cache de lemmes')
+    parser.add_argument('--taille-cache', type=int, default=200_000,
+                        help="Nombre maximal d'entrées du cache sur disque")
+    parser.add_argument('--incremental', action='store_true',
+                        help='Ne traiter que les publications nouvelles ou modifiées')
+    parser.add_argument('--format', choices=['auto', 'jsonl'], default='auto',
+                        help="jsonl : convertir l'entrée et écrire la sortie en JSON Lines")
+    args = parser.parse_args()
     
     # Chemins des fichiers
     script_dir = Path(__file__).parent
     projet_dir = script_dir.parent
     
-    chemin_entree = projet_dir / '02_Annotation' / 'uvbf_data_annote.json'
-    chemin_sortie = script_dir / 'uvbf_data_pretraite.json'
+    # La sortie suit le format de l'entrée (.json ou .jsonl)
+    chemin_entree = resoudre_corpus(projet_dir / '02_Annotation' / 'uvbf_data_annote.json',
+                                    convertir=args.format == 'jsonl')
+    chemin_sortie = (script_dir / 'uvbf_data_pretraite.json').with_suffix(chemin_entree.suffix)
+    chemin_existant = resoudre_corpus(script_dir / 'uvbf_data_pretraite.json')
     
-    # Charger les données annotées
-    print(f"Chargement depuis : {chemin_entree}")
-    with open(chemin_entree, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    print(f"Lecture en flux depuis : {chemin_entree}")
     
-    # Prétraitement des données
-    for item in tqdm(data, desc="Traitement des données"):
-        if 'texte' in item:
-            texte_propre = nettoyer_texte(item['texte'])
-            tokens = pretraitement_texte(texte_propre)
-            item['texte_traite'] = ' '.join(tokens)
+    # Mode incrémental : seules les publications nouvelles ou modifiées sont traitées
+    existant = None
+    reutilises = set()
+    if args.incremental and chemin_existant.exists():
+        existant = charger_existant(chemin_existant)
+        print(f"✓ Mode incrémental : {len(existant)} publications déjà prétraitées")
+    
+    cache = None
+    if not args.sans_cache:
+        cache = creer_cache(script_dir / 'cache_lemmes.sqlite', taille_max=args.taille_cache)
+    
+    # Prétraitement des données par blocs, écrit au fil de l'eau
+    flux = pretraiter_flux(lire_corpus(chemin_entree),
+                           taille_bloc=args.taille_bloc,
+                           existant=existant,
+                           reutilises=reutilises,
+                           batch_size=args.batch_size,
+                           n_process=args.n_process,
+                           cache=cache)
+    nombre = ecrire_corpus(chemin_sortie, tqdm(flux, desc="Prétraitement", unit=" pub"))
+    
+    # Copie en colonnes pour les statistiques (ignorée sans pyarrow)
+    chemin_parquet = ecrire_parquet(chemin_sortie, lire_corpus(chemin_sortie))
+    
+    if existant is not None:
+        print(f"\n✓ {len(reutilises)} publications réutilisées, "
+              f"{len(existant) - len(reutilises)} obsolètes")
     
-    # Sauvegarder les données prétraitées
-    with open(chemin_sortie, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if cache is not None:
+        stats = cache.statistiques()
+        print(f"\n✓ Cache de lemmes : {stats['succes_memoire'] + stats['succes_disque']} succès, "
+              f"{stats['echecs']} échecs ({stats['taux_succes']:.1%}), "
+              f"{stats['entrees_disque']} entrées, {stats['evictions']} évictions")
+        cache.fermer()
     
-    print(f"\n✓ Prétraitement terminé !")
+    print(f"\n✓ Prétraitement terminé ! ({nombre} publications)")
     print(f"✓ Données sauvegardées dans : {chemin_sortie}")
+    if chemin_parquet:
+        print(f"✓ Copie Parquet : {chemin_parquet}")
 
 if __name__ == "__main__":
     main()
@@ -1,32 +1,45 @@
-import json
 import os
+import sys
+import argparse
+from collections import Counter
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 import joblib
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.corpus import lire_corpus, resoudre_corpus, empreinte_texte
+from outils.matrice_creuse import exporter_matrice_creuse, chemins_export
+from outils.hachage_tfidf import VectoriseurHachageTFIDF
+from outils.artefacts import sauvegarder_artefact
+
 def charger_donnees(chemin):
-    """Charge les données JSON prétraitées"""
-    with open(chemin, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Lit en flux les données prétraitées (.jsonl de préférence, sinon .json)"""
+    return lire_corpus(resoudre_corpus(chemin))
 
 def creer_dataframe(donnees):
-    """Crée un DataFrame à partir des données JSON"""
+    """Crée un DataFrame à partir d'un flux de publications"""
     textes = []
     metadonnees = []
+    total = 0
     
     for item in donnees:
+        total += 1
         if 'texte_traite' in item and item['texte_traite']:
             textes.append(item['texte_traite'])
             metadonnees.append({
                 'id': item.get('id', ''),
                 'plateforme': item.get('plateforme', ''),
                 'auteur': item.get('auteur', ''),
-                'sentiment': item.get('sentiment', '')
+                'sentiment': item.get('sentiment', ''),
+                'empreinte': empreinte_texte(item.get('texte', ''))
             })
     
     df = pd.DataFrame(metadonnees)
     df['texte'] = textes
+    df.attrs['publications_lues'] = total
     return df
 
 def vectoriser_tfidf(df, colonne_texte='texte'):
@@ -41,19 +54,96 @@ def vectoriser_tfidf(df, colonne_texte='texte'):
     matrice_tfidf = vectoriseur.fit_transform(df[colonne_texte])
     return matrice_tfidf, vectoriseur
 
+def difference_index(df, dossier_sortie, colonne_texte='texte'):
+    """
+    Textes à ajouter aux fréquences et textes à en retirer depuis le dernier export
+    
+    uvbf_tfidf_index.csv liste les documents comptés par le vectoriseur de cet
+    export. Les couples (id, texte prétraité) de l'index et de df sont comparés
+    comme des multiensembles : une publication modifiée (même id, autre texte)
+    retire son ancien texte et ajoute le nouveau, une publication supprimée est
+    retirée.
+    
+    Returns:
+        (textes à ajouter, textes à retirer, documents de l'index), ou None sans index
+    """
+    chemin_index = chemins_export(dossier_sortie, 'uvbf_tfidf')[2]
+    if not chemin_index.exists():
+        return None
+    
+    index = pd.read_csv(chemin_index, dtype=str, keep_default_na=False)
+    avant = Counter(zip(index['id'], index['texte']))
+    apres = Counter((str(i), t) for i, t in zip(df['id'], df[colonne_texte]))
+    ajoutes = [texte for (_, texte), n in (apres - avant).items() for _ in range(n)]
+    retires = [texte for (_, texte), n in (avant - apres).items() for _ in range(n)]
+    return ajoutes, retires, len(index)
+
+def vectoriser_hachage(df, colonne_texte='texte', taille_bloc=10_000, vectoriseur=None, dossier_sortie=None):
+    """
+    Vectorisation TF-IDF par hachage, les textes étant traités par blocs
+    
+    En mise à jour, les fréquences documentaires sont celles d'un fit sur df
+    (voir difference_index) à condition que vectoriseur.pkl et
+    uvbf_tfidf_index.csv viennent du même export. Seul le nombre de documents
+    est vérifié : un index absent ou d'une autre taille déclenche un
+    réajustement complet, mais un index remplacé par un autre de même taille
+    ne serait pas détecté.
+    
+    Args:
+        df: DataFrame des textes
+        colonne_texte: Colonne à vectoriser
+        taille_bloc: Nombre de textes par bloc
+        vectoriseur: VectoriseurHachageTFIDF existant à mettre à jour (partial_fit)
+        dossier_sortie: Dossier du dernier export, pour ne compter que les textes ajoutés,
+            modifiés ou supprimés
+    """
+    if vectoriseur is None:
+        vectoriseur = VectoriseurHachageTFIDF(min_df=2, max_df=0.8, ngram_range=(1, 2))
+        vectoriseur.fit(df[colonne_texte], taille_bloc=taille_bloc)
+    else:
+        difference = difference_index(df, dossier_sortie, colonne_texte)
+        if difference is None or difference[2] != vectoriseur.n_documents_:
+            print("  ⚠️  Index du dernier export absent ou d'un autre vectoriseur : réajustement complet")
+            vectoriseur.fit(df[colonne_texte], taille_bloc=taille_bloc)
+        else:
+            ajoutes, retires, _ = difference
+            print(f"  Mise à jour des fréquences : {len(ajoutes)} textes ajoutés, "
+                  f"{len(retires)} retirés (publications modifiées ou supprimées)")
+            for debut in range(0, len(retires), taille_bloc):
+                vectoriseur.retirer(retires[debut:debut + taille_bloc])
+            for debut in range(0, len(ajoutes), taille_bloc):
+                vectoriseur.partial_fit(ajoutes[debut:debut + taille_bloc])
+    
+    matrice_tfidf = vectoriseur.transform_flux(df[colonne_texte], taille_bloc=taille_bloc)
+    return matrice_tfidf, vectoriseur
+
 def sauvegarder_resultats(df, matrice_tfidf, vectoriseur, dossier_sortie):
     """Sauvegarde les résultats de la vectorisation"""
     dossier_sortie.mkdir(parents=True, exist_ok=True)
     
-    # Sauvegarder la matrice et le vectoriseur
-    joblib.dump(matrice_tfidf, dossier_sortie / 'matrice_tfidf.pkl')
+    # Sauvegarder la matrice (artefact memory-map) et le vectoriseur ; les lignes
+    # de la matrice sont alignées sur uvbf_tfidf_index.csv (id + empreinte du texte brut)
+    sauvegarder_artefact(dossier_sortie, 'matrice_tfidf', matrice_tfidf)
     joblib.dump(vectoriseur, dossier_sortie / 'vectoriseur.pkl')
     
+    if isinstance(vectoriseur, VectoriseurHachageTFIDF):
+        # Seules les colonnes hachées utilisées sont exportées, nommées par leurs n-grammes
+        colonnes = np.unique(matrice_tfidf.indices)
+        noms = vectoriseur.termes_colonnes(df['texte'], colonnes)
+        exporter_matrice_creuse(dossier_sortie, 'uvbf_tfidf', matrice_tfidf[:, colonnes],
+                                [noms.get(c, f'#{c}') for c in colonnes], df)
+        vocabulaire = {noms.get(c, f'#{c}'): c for c in colonnes}
+    else:
+        # Export complet creux : matrice CSR, vocabulaire et index des publications
+        exporter_matrice_creuse(dossier_sortie, 'uvbf_tfidf', matrice_tfidf,
+                                vectoriseur.get_feature_names_out(), df)
+        vocabulaire = vectoriseur.vocabulary_
+    
     # Afficher les termes importants
     somme_poids = matrice_tfidf.sum(axis=0)
     termes_importants = [
         (mot, somme_poids[0, idx])
-        for mot, idx in vectoriseur.vocabulary_.items()
+        for mot, idx in vocabulaire.items()
     ]
     termes_importants = sorted(termes_importants, key=lambda x: x[1], reverse=True)[:20]
     
@@ -62,6 +152,15 @@ def sauvegarder_resultats(df, matrice_tfidf, vectoriseur, dossier_sortie):
         print(f"  {terme}: {score:.2f}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Vectorisation TF-IDF du corpus prétraité")
+    parser.add_argument('--mode', choices=['tfidf', 'hachage'], default='tfidf',
+                        help="tfidf : vocabulaire en mémoire ; hachage : features hachées, par blocs")
+    parser.add_argument('--taille-bloc', type=int, default=10_000,
+                        help="Textes par bloc en mode hachage")
+    parser.add_argument('--mise-a-jour', action='store_true',
+                        help="Mode hachage : reprend vectoriseur.pkl et n'ajoute que les nouveaux textes")
+    args = parser.parse_args()
+    
     # Chemins
     script_dir = Path(__file__).parent
     projet_dir = script_dir.parent
@@ -73,14 +172,14 @@ def main():
     print("VECTORISATION TF-IDF")
     print("="*70)
     
-    # Charger les données
-    print(f"\nChargement depuis : {chemin_entree}")
+    # Charger les données en flux
+    print(f"\nLecture depuis : {resoudre_corpus(chemin_entree)}")
     donnees = charger_donnees(chemin_entree)
-    print(f"✓ {len(donnees)} publications chargées")
     
     # Créer le DataFrame
     print("\nCréation du DataFrame...")
     df = creer_dataframe(donnees)
+    print(f"✓ {df.attrs['publications_lues']} publications lues")
     print(f"✓ {len(df)} textes prétraités trouvés")
     
     if len(df) == 0:
@@ -88,8 +187,22 @@ def main():
         return
     
     # Vectoriser
-    print("\nVectorisation TF-IDF en cours...")
-    matrice_tfidf, vectoriseur = vectoriser_tfidf(df)
+    if args.mode == 'hachage':
+        vectoriseur = None
+        chemin_vectoriseur = dossier_sortie / 'vectoriseur.pkl'
+        if args.mise_a_jour and chemin_vectoriseur.exists():
+            vectoriseur = joblib.load(chemin_vectoriseur)
+            if not isinstance(vectoriseur, VectoriseurHachageTFIDF):
+                print("⚠️  vectoriseur.pkl n'est pas un vectoriseur par hachage : réajustement complet")
+                vectoriseur = None
+        
+        print(f"\nVectorisation TF-IDF par hachage (blocs de {args.taille_bloc})...")
+        matrice_tfidf, vectoriseur = vectoriser_hachage(
+            df, taille_bloc=args.taille_bloc, vectoriseur=vectoriseur, dossier_sortie=dossier_sortie
+        )
+    else:
+        print("\nVectorisation TF-IDF en cours...")
+        matrice_tfidf, vectoriseur = vectoriser_tfidf(df)
     
     print(f"\n✓ Matrice TF-IDF créée !")
     print(f"  Dimensions : {matrice_tfidf.shape[0]} documents × {matrice_tfidf.shape[1]} features")
@@ -100,7 +213,8 @@ def main():
     
     print(f"\n✓ Fichiers sauvegardés dans : {dossier_sortie}/")
     print("  - vectoriseur.pkl")
-    print("  - matrice_tfidf.pkl")
+    print("  - matrice_tfidf/ (artefact memory-map)")
+    print("  - uvbf_tfidf.npz, uvbf_tfidf_vocabulaire.json, uvbf_tfidf_index.csv")
     
     print("\n" + "="*70)
     print("✅ VECTORISATION TERMINÉE")
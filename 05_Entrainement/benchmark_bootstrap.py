@@ -0,0 +1,88 @@
+"""
+Benchmark du bootstrap apparié : boucle Python vs matrice d'indices
+
+Les prédictions correctes de --modeles modèles (exactitude autour de 80 %,
+erreurs en partie communes) sont simulées pour plusieurs tailles de test.
+La référence tire les mêmes indices puis calcule chaque exactitude dans une
+boucle Python ; outils/comparaison.py convertit les indices en comptes et
+fait un produit matriciel.
+
+Utilisation :
+    python benchmark_bootstrap.py
+    python benchmark_bootstrap.py --tailles 60 1000 --reechantillons 10000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.comparaison import exactitudes_bootstrap, comparer_modeles
+
+
+def predictions_correctes(n_modeles, n_publications, graine=42):
+    """Matrice booléenne (modèles x publications), erreurs en partie communes"""
+    generateur = np.random.default_rng(graine)
+    difficulte = generateur.random(n_publications)
+    return generateur.random((n_modeles, n_publications)) * 0.5 + difficulte * 0.5 < 0.65
+
+
+def exactitudes_boucle(correct, n_reechantillons, graine=42):
+    """Référence : mêmes tirages, une exactitude par modèle et par rééchantillon"""
+    n = correct.shape[1]
+    generateur = np.random.default_rng(graine)
+    taille_lot = max(1, 2**22 // n)
+    exactitudes = np.empty((n_reechantillons, correct.shape[0]))
+    for debut in range(0, n_reechantillons, taille_lot):
+        indices = generateur.integers(0, n, size=(min(taille_lot, n_reechantillons - debut), n))
+        for i, tirage in enumerate(indices):
+            for m in range(correct.shape[0]):
+                exactitudes[debut + i, m] = correct[m, tirage].mean()
+    return exactitudes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tailles', type=int, nargs='+', default=[60, 1000, 10000],
+                        help="Nombres de publications de test")
+    parser.add_argument('--modeles', type=int, default=8, help="Nombre de modèles comparés")
+    parser.add_argument('--reechantillons', type=int, default=10000, help="Rééchantillons bootstrap")
+    args = parser.parse_args()
+    
+    print("="*70)
+    print("BENCHMARK BOOTSTRAP APPARIÉ")
+    print("="*70)
+    print(f"{args.modeles} modèles, {args.reechantillons} rééchantillons")
+    print(f"\n{'Test':>8} {'boucle':>10} {'vectorisé':>10} {'+ paires':>10} {'gain':>7}")
+    
+    identiques = True
+    for taille in args.tailles:
+        correct = predictions_correctes(args.modeles, taille)
+        
+        debut = time.perf_counter()
+        reference = exactitudes_boucle(correct, args.reechantillons)
+        duree_boucle = time.perf_counter() - debut
+        
+        debut = time.perf_counter()
+        exactitudes = exactitudes_bootstrap(correct, args.reechantillons)
+        duree = time.perf_counter() - debut
+        
+        debut = time.perf_counter()
+        comparer_modeles(correct, [f'modele_{m}' for m in range(args.modeles)], args.reechantillons)
+        duree_complete = time.perf_counter() - debut
+        
+        print(f"{taille:>8} {duree_boucle:>8.2f} s {duree:>8.3f} s {duree_complete:>8.3f} s "
+              f"{duree_boucle / duree:>6.0f}x")
+        identiques &= np.allclose(reference, exactitudes, rtol=0, atol=1e-12)
+    
+    print("\n" + ("✓ Exactitudes identiques à la boucle" if identiques else "❌ Exactitudes différentes"))
+    print("="*70)
+    return 0 if identiques else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark du chemin de régularisation : grille de C démarrée à froid vs à chaud
+
+Pour chaque grille (celle de --recherche grille, puis la grille fine de
+--recherche chemin), ajuste la suite des C sur les 5 plis partagés sans puis
+avec démarrage à chaud, et compare itérations lbfgs, temps et C retenu.
+Les données sont les artefacts X_train / y_train produits par entrainement.py.
+
+Utilisation :
+    python benchmark_chemin.py
+"""
+
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.artefacts import charger_artefact
+from plis import GestionnairePlis
+from chemin_regularisation import chemin_regularisation, VALEURS_C_FINES
+
+warnings.filterwarnings('ignore')
+
+GRILLES = [
+    ('Grille C [0.1, 1, 10, 100]', [0.1, 1, 10, 100]),
+    (f'Grille fine ({len(VALEURS_C_FINES)} valeurs de 0.01 à 100)', VALEURS_C_FINES),
+]
+
+
+def main():
+    dossier_resultats = Path(__file__).parent / 'resultats'
+    X_train = charger_artefact(dossier_resultats, 'X_train')
+    y_train = np.asarray(charger_artefact(dossier_resultats, 'y_train'))
+    plis = GestionnairePlis(X_train, y_train, cv=5)
+    
+    print("="*70)
+    print("BENCHMARK CHEMIN DE RÉGULARISATION")
+    print("="*70)
+    print(f"Base : {X_train.shape[0]} publications d'entraînement, {X_train.shape[1]} features, "
+          f"{len(plis)} plis")
+    
+    identiques = True
+    for libelle, valeurs_C in GRILLES:
+        chemins = {}
+        for warm_start in (False, True):
+            debut = time.perf_counter()
+            chemins[warm_start] = chemin_regularisation(plis, valeurs_C, warm_start=warm_start, n_jobs=1)
+            chemins[warm_start]['temps'] = time.perf_counter() - debut
+        froid, chaud = chemins[False], chemins[True]
+        
+        print(f"\n{libelle}")
+        print(f"  {'C':>9}  {'itér. à froid':>13}  {'itér. à chaud':>13}  {'CV à froid':>10}  {'CV à chaud':>10}")
+        for j, C in enumerate(froid['valeurs_C']):
+            print(f"  {C:>9.4g}  {froid['iterations'][:, j].sum():>13}  {chaud['iterations'][:, j].sum():>13}  "
+                  f"{froid['scores'][:, j].mean():>10.2%}  {chaud['scores'][:, j].mean():>10.2%}")
+        print(f"  {'total':>9}  {froid['iterations'].sum():>13}  {chaud['iterations'].sum():>13}")
+        print(f"  Temps : {froid['temps']:.2f} s à froid, {chaud['temps']:.2f} s à chaud")
+        
+        C_froid = froid['valeurs_C'][froid['scores'].mean(axis=0).argmax()]
+        C_chaud = chaud['valeurs_C'][chaud['scores'].mean(axis=0).argmax()]
+        if C_froid == C_chaud:
+            print(f"  ✓ Même C retenu : {C_froid:.4g}")
+        else:
+            identiques = False
+            print(f"  ❌ C retenu différent : {C_froid:.4g} à froid, {C_chaud:.4g} à chaud")
+    
+    print("="*70)
+    return 0 if identiques else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Benchmark de l'export compact du modèle : pickle scikit-learn vs .npz
+
+Pour chaque modèle candidat (ajusté sur l'artefact X_train) : taille du
+fichier, temps de chargement dans un processus neuf (imports compris),
+latence de prédiction pour une publication et pour tout X_test, et
+vérification que les prédictions de l'export compact sont identiques et ses
+probabilités égales à celles du pickle (à la précision float32 près).
+
+Utilisation :
+    python benchmark_export.py
+    python benchmark_export.py --repetitions 200
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.artefacts import charger_artefact
+from outils.modele_compact import exporter_modele_compact, charger_modele_compact
+from entrainement import creer_svm_lineaire
+
+warnings.filterwarnings('ignore')
+
+PROJET_DIR = Path(__file__).resolve().parent.parent
+
+MODELES = {
+    'Naive Bayes': lambda: MultinomialNB(),
+    'Régression Logistique': lambda: LogisticRegression(max_iter=1000, random_state=42),
+    'SVM Linéaire': lambda: creer_svm_lineaire('liblinear'),
+    'SGD log_loss': lambda: SGDClassifier(loss='log_loss', random_state=42),
+    'SGD modified_huber': lambda: SGDClassifier(loss='modified_huber', random_state=42),
+    'Random Forest (100)': lambda: RandomForestClassifier(n_estimators=100, random_state=42),
+    'Random Forest (300)': lambda: RandomForestClassifier(n_estimators=300, random_state=42),
+}
+
+# Écart toléré sur predict_proba (poids stockés en float32)
+TOLERANCE_PROBABILITES = 1e-5
+
+# Chargement dans un processus neuf : imports et lecture du fichier
+CHARGEMENT = {
+    'pickle': "import joblib; modele = joblib.load(sys.argv[1])",
+    'compact': ("from outils.modele_compact import charger_modele_compact; "
+                "modele = charger_modele_compact(sys.argv[1])"),
+}
+
+
+def temps_chargement(format_export, chemin, repetitions=3):
+    """Meilleur temps de chargement à froid (s) et import de scikit-learn"""
+    code = (f"import sys, time; sys.path.insert(0, {str(PROJET_DIR)!r}); debut = time.perf_counter(); "
+            f"{CHARGEMENT[format_export]}; "
+            "print(time.perf_counter() - debut, 'sklearn' in sys.modules)")
+    mesures = []
+    for _ in range(repetitions):
+        sortie = subprocess.run([sys.executable, '-c', code, str(chemin)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        mesures.append(float(sortie[0]))
+    return min(mesures), sortie[1] == 'True'
+
+
+def latence(modele, X, repetitions):
+    """Latence médiane de modele.predict(X), en millisecondes"""
+    mesures = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        modele.predict(X)
+        mesures.append(time.perf_counter() - debut)
+    return np.median(mesures) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repetitions', type=int, default=50,
+                        help="Répétitions pour les latences de prédiction")
+    args = parser.parse_args()
+    
+    dossier_resultats = Path(__file__).parent / 'resultats'
+    X_train = charger_artefact(dossier_resultats, 'X_train')
+    y_train = np.asarray(charger_artefact(dossier_resultats, 'y_train'))
+    X_test = charger_artefact(dossier_resultats, 'X_test')
+    vectoriseur = joblib.load(PROJET_DIR / '04_Vectorisation' / 'vectoriseur.pkl')
+    encodeur = LabelEncoder().fit(['negatif', 'neutre', 'positif'])
+    
+    print("="*78)
+    print("BENCHMARK EXPORT COMPACT")
+    print("="*78)
+    print(f"Base : {X_train.shape[0]} publications d'entraînement, {X_test.shape[0]} de test, "
+          f"{X_train.shape[1]} features")
+    
+    identiques = True
+    with tempfile.TemporaryDirectory() as dossier:
+        for nom, creer in MODELES.items():
+            modele = creer().fit(X_train, y_train)
+            chemins = {'pickle': Path(dossier) / 'modele.pkl', 'compact': Path(dossier) / 'modele.npz'}
+            joblib.dump(modele, chemins['pickle'])
+            exporter_modele_compact(modele, encodeur, vectoriseur, chemins['compact'])
+            modeles = {'pickle': modele, 'compact': charger_modele_compact(chemins['compact'])}
+            
+            print(f"\n{nom} ({len(modeles['compact'].colonnes)} colonnes gardées sur {X_train.shape[1]})")
+            print(f"  {'':<8} {'taille':>10} {'chargement':>11} {'sklearn':>8} "
+                  f"{'1 publication':>14} {'X_test':>10}")
+            for format_export, chemin in chemins.items():
+                duree, avec_sklearn = temps_chargement(format_export, chemin)
+                print(f"  {format_export:<8} {chemin.stat().st_size / 1024:>7.1f} Ko {duree * 1000:>8.0f} ms "
+                      f"{'oui' if avec_sklearn else 'non':>8} "
+                      f"{latence(modeles[format_export], X_test[:1], args.repetitions):>11.3f} ms "
+                      f"{latence(modeles[format_export], X_test, args.repetitions):>7.3f} ms")
+            
+            if np.array_equal(modeles['pickle'].predict(X_test), modeles['compact'].predict(X_test)):
+                print("  ✓ Prédictions identiques")
+            else:
+                identiques = False
+                print("  ❌ Prédictions différentes")
+            
+            if hasattr(modele, 'predict_proba'):
+                ecart = np.abs(modeles['pickle'].predict_proba(X_test)
+                               - modeles['compact'].predict_proba(X_test)).max()
+                if ecart <= TOLERANCE_PROBABILITES:
+                    print(f"  ✓ Probabilités égales (écart maximal {ecart:.1e})")
+                else:
+                    identiques = False
+                    print(f"  ❌ Probabilités différentes (écart maximal {ecart:.1e})")
+    
+    print("="*78)
+    return 0 if identiques else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark de la Random Forest : arbres complets vs ForetBornee
+
+Rééchantillonner les 236 publications d'entraînement ne fait pas grossir les
+arbres (les lignes dupliquées tombent dans les mêmes feuilles). Le corpus est
+donc synthétique, creux et bruité comme un TF-IDF : chaque document tire
+une douzaine de colonnes parmi --features selon une loi de Zipf, et 20 % des
+étiquettes sont aléatoires. C'est le pire cas pour la taille des arbres.
+
+Chaque configuration tourne dans un processus neuf pour mesurer son propre
+pic mémoire.
+
+Utilisation :
+    python benchmark_foret.py --tailles 10000 100000 --arbres 20
+"""
+
+import sys
+import time
+import argparse
+import warnings
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.foret import ForetBornee, resume_rapport
+
+warnings.filterwarnings('ignore')
+
+# (libellé, paramètres de ForetBornee en plus de n_estimators)
+CONFIGURATIONS = [
+    ('Arbres complets (actuel)', {}),
+    ('Profondeur 30, 5 par feuille', {'max_depth': 30, 'min_samples_leaf': 5}),
+    ('+ 50 % des publications par arbre', {'max_depth': 30, 'min_samples_leaf': 5, 'max_samples': 0.5}),
+    ('Arbres complets, plafond 256 Mo', {'memoire_max_mo': 256, 'taille_lot': 5}),
+]
+
+
+def corpus_synthetique(n_documents, n_features, graine=42):
+    """Matrice creuse normalisée (L2) et 3 classes, 20 % d'étiquettes bruitées"""
+    generateur = np.random.default_rng(graine)
+    longueurs = generateur.poisson(12, size=n_documents) + 1
+    colonnes = np.minimum(generateur.zipf(1.3, size=longueurs.sum()) - 1, n_features - 1)
+    lignes = np.repeat(np.arange(n_documents), longueurs)
+    X = sparse.csr_matrix((generateur.random(len(colonnes)), (lignes, colonnes)),
+                          shape=(n_documents, n_features))
+    X.sum_duplicates()
+    X = normalize(X)
+    
+    poids = generateur.normal(size=(n_features, 3))
+    y = np.asarray(X @ poids).argmax(axis=1)
+    bruit = generateur.random(n_documents) < 0.2
+    y[bruit] = generateur.integers(0, 3, size=bruit.sum())
+    return X, y
+
+
+def mesurer(n_documents, n_features, n_arbres, parametres):
+    """Entraîne une forêt (exécuté dans un processus neuf)"""
+    warnings.filterwarnings('ignore')
+    X, y = corpus_synthetique(n_documents, n_features)
+    debut = time.time()
+    foret = ForetBornee(n_estimators=n_arbres, random_state=42, n_jobs=-1, **parametres).fit(X, y)
+    return time.time() - debut, foret.rapport_
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tailles', type=int, nargs='+', default=[10_000, 100_000],
+                        help="Nombres de documents synthétiques")
+    parser.add_argument('--features', type=int, default=5000,
+                        help="Nombre de colonnes (max_features du TfidfVectorizer)")
+    parser.add_argument('--arbres', type=int, default=20, help="Nombre d'arbres visé")
+    args = parser.parse_args()
+    
+    print("="*78)
+    print("BENCHMARK RANDOM FOREST À MÉMOIRE BORNÉE")
+    print("="*78)
+    
+    for taille in args.tailles:
+        print(f"\n{taille:,} documents".replace(',', ' ') + f", {args.features} features")
+        for libelle, parametres in CONFIGURATIONS:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                duree, rapport = pool.submit(mesurer, taille, args.features, args.arbres, parametres).result()
+            print(f"  {libelle:<36} {duree:7.1f} s")
+            print(f"    {resume_rapport(rapport)}")
+    
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
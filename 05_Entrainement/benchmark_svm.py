@@ -0,0 +1,169 @@
+"""
+Benchmark du SVM linéaire : SVC libsvm (probability=True) vs liblinear / SGD
+
+Mesure le temps d'entraînement et l'exactitude de chaque implémentation
+quand le corpus passe de 1k à 1M publications.
+
+Par défaut le corpus est synthétique (CorpusSynthetique) : vocabulaire de
+--termes termes à fréquences de Zipf-Mandelbrot, longueurs des publications
+tirées de celles de l'artefact X_train, et quelques termes plus fréquents
+dans chaque classe. Les fréquences documentaires suivent donc une longue
+traîne qui s'étend avec le corpus, comme pour un vrai grand corpus ; la
+pondération TF-IDF est ajustée sur chaque ensemble d'entraînement.
+
+--corpus reechantillonne rééchantillonne (avec remise) les lignes de X_train
+(~240 publications annotées) : vocabulaire, parcimonie et convergence ne
+changent pas avec la taille, les accélérations mesurées ne valent donc pas
+pour un grand corpus.
+
+Le SVC libsvm est ignoré au-delà de --max-libsvm publications (coût au moins
+quadratique, plus 5 plis internes pour probability=True).
+
+Utilisation :
+    python benchmark_svm.py --tailles 1000 10000 100000 1000000 --max-libsvm 20000
+    python benchmark_svm.py --corpus reechantillonne
+"""
+
+import sys
+import time
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.artefacts import charger_artefact
+from entrainement import creer_svm_lineaire
+
+warnings.filterwarnings('ignore')
+
+# (libellé, mode, calibration)
+VARIANTES = [
+    ('SVC linéaire libsvm (probability=True)', 'libsvm', False),
+    ('LinearSVC liblinear', 'liblinear', False),
+    ('LinearSVC liblinear + calibration', 'liblinear', True),
+    ('SGD hinge', 'sgd', False),
+    ('SGD hinge + calibration', 'sgd', True),
+]
+
+
+class CorpusSynthetique:
+    """Publications synthétiques (comptes de termes) à vocabulaire de Zipf"""
+    
+    def __init__(self, n_termes, longueurs, proportions, part_marqueurs=0.02, facteur=4.0, graine=42):
+        """
+        Args:
+            n_termes: Taille du vocabulaire
+            longueurs: Nombres de termes des publications réelles, rééchantillonnés
+            proportions: Part de chaque classe
+            part_marqueurs: Part du vocabulaire favorisée dans chaque classe
+            facteur: Multiplicateur de fréquence des termes favorisés
+            graine: Graine aléatoire
+        """
+        self.generateur = np.random.default_rng(graine)
+        self.n_termes = n_termes
+        self.longueurs = np.maximum(np.asarray(longueurs), 1)
+        self.proportions = np.asarray(proportions) / np.sum(proportions)
+        
+        # Zipf-Mandelbrot : fréquence du terme de rang k proportionnelle à 1 / (k + 2,7)^1,07
+        base = 1 / (np.arange(1, n_termes + 1) + 2.7) ** 1.07
+        self.distributions = []
+        for _ in self.proportions:
+            poids = base.copy()
+            marqueurs = self.generateur.choice(n_termes, size=max(int(n_termes * part_marqueurs), 1),
+                                               replace=False)
+            poids[marqueurs] *= facteur
+            self.distributions.append(poids / poids.sum())
+    
+    def generer(self, n):
+        """Matrice de comptes (n x n_termes, CSR) et labels"""
+        y = self.generateur.choice(len(self.proportions), size=n, p=self.proportions)
+        tailles = self.generateur.choice(self.longueurs, size=n)
+        lignes = np.repeat(np.arange(n), tailles)
+        colonnes = np.empty(len(lignes), dtype=np.int64)
+        classes_termes = np.repeat(y, tailles)
+        for classe, distribution in enumerate(self.distributions):
+            masque = classes_termes == classe
+            colonnes[masque] = self.generateur.choice(self.n_termes, size=masque.sum(), p=distribution)
+        
+        comptes = sparse.csr_matrix((np.ones(len(lignes)), (lignes, colonnes)), shape=(n, self.n_termes))
+        comptes.sum_duplicates()
+        return comptes, y
+
+
+def decrire(X):
+    """Termes par publication et part du vocabulaire vue dans au moins 2 publications"""
+    frequences = np.bincount(X.indices, minlength=X.shape[1])
+    return (f"{X.getnnz(axis=1).mean():.1f} termes distincts/publication, "
+            f"{np.count_nonzero(frequences)} termes vus, {np.count_nonzero(frequences >= 2)} dans ≥ 2 publications")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tailles', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="Nombres de publications d'entraînement")
+    parser.add_argument('--max-libsvm', type=int, default=20_000,
+                        help="Taille maximale pour l'ancien SVC libsvm")
+    parser.add_argument('--corpus', choices=['synthetique', 'reechantillonne'], default='synthetique',
+                        help="Corpus synthétique de Zipf, ou lignes de X_train rééchantillonnées")
+    parser.add_argument('--termes', type=int, default=2**18,
+                        help="Vocabulaire du corpus synthétique (2**18 : espace du vectoriseur par hachage)")
+    parser.add_argument('--taille-test', type=int, default=20_000,
+                        help="Publications de test du corpus synthétique")
+    args = parser.parse_args()
+    
+    dossier_resultats = Path(__file__).parent / 'resultats'
+    X_train = charger_artefact(dossier_resultats, 'X_train')
+    y_train = np.asarray(charger_artefact(dossier_resultats, 'y_train'))
+    X_test = charger_artefact(dossier_resultats, 'X_test')
+    y_test = np.asarray(charger_artefact(dossier_resultats, 'y_test'))
+    
+    print("="*78)
+    print("BENCHMARK SVM LINÉAIRE")
+    print("="*78)
+    print(f"Base : {X_train.shape[0]} publications d'entraînement, {X_test.shape[0]} de test, "
+          f"{X_train.shape[1]} features")
+    print(f"  {decrire(X_train)}")
+    
+    generateur = np.random.default_rng(42)
+    if args.corpus == 'synthetique':
+        corpus = CorpusSynthetique(args.termes, X_train.getnnz(axis=1), np.bincount(y_train))
+        comptes_test, y_test = corpus.generer(args.taille_test)
+        print(f"Corpus synthétique : {args.termes} termes (Zipf-Mandelbrot), "
+              f"{args.taille_test} publications de test")
+    else:
+        print("⚠️  Corpus rééchantillonné : mêmes ~240 publications répétées, vocabulaire et "
+              "parcimonie fixes ; les temps ne sont pas représentatifs d'un grand corpus")
+    
+    for taille in args.tailles:
+        if args.corpus == 'synthetique':
+            comptes, y = corpus.generer(taille)
+            tfidf = TfidfTransformer().fit(comptes)
+            X, X_evaluation = tfidf.transform(comptes), tfidf.transform(comptes_test)
+        else:
+            lignes = generateur.integers(0, X_train.shape[0], size=taille)
+            X, y, X_evaluation = X_train[lignes], y_train[lignes], X_test
+        
+        print(f"\n{taille:,} publications".replace(',', ' '))
+        print(f"  {decrire(X)}")
+        for libelle, mode, calibration in VARIANTES:
+            if mode == 'libsvm' and taille > args.max_libsvm:
+                print(f"  {libelle:<42} ignoré (> --max-libsvm {args.max_libsvm})")
+                continue
+            
+            modele = creer_svm_lineaire(mode, calibration)
+            debut = time.perf_counter()
+            modele.fit(X, y)
+            duree = time.perf_counter() - debut
+            exactitude = modele.score(X_evaluation, y_test)
+            print(f"  {libelle:<42} {duree:9.2f} s   exactitude {exactitude:.2%}")
+    
+    print("="*78)
+
+
+if __name__ == "__main__":
+    main()
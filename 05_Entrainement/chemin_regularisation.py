@@ -0,0 +1,74 @@
+"""
+Chemin de régularisation de la régression logistique avec démarrage à chaud
+
+Sur chaque pli, la suite des valeurs de C est ajustée dans l'ordre croissant
+par un même estimateur (warm_start=True) : chaque ajustement part des
+coefficients du C précédent au lieu de zéro. Les modèles fortement
+régularisés convergent en quelques itérations et servent de point de départ
+aux suivants ; une grille fine coûte alors à peu près le prix de quelques
+démarrages à froid.
+
+Les itérations lbfgs (n_iter_) de chaque C sont relevées pour comparer avec
+la grille démarrée à froid (warm_start=False, même code).
+    
+    chemin = chemin_regularisation(plis, VALEURS_C_FINES)
+    meilleur_C = chemin['valeurs_C'][chemin['scores'].mean(axis=0).argmax()]
+"""
+
+import time
+import warnings
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+
+# 0.01 à 100, quatre valeurs par décade
+VALEURS_C_FINES = np.logspace(-2, 2, 17)
+
+
+def _chemin_pli(modele, valeurs_C, warm_start, X_train, y_train, X_test, y_test):
+    """Ajuste la suite des C sur un pli (exécuté dans un worker)"""
+    warnings.filterwarnings('ignore')
+    
+    debut = time.time()
+    modele = clone(modele).set_params(warm_start=warm_start)
+    scores = []
+    iterations = []
+    for C in valeurs_C:
+        modele.set_params(C=C).fit(X_train, y_train)
+        scores.append(modele.score(X_test, y_test))
+        iterations.append(int(np.max(modele.n_iter_)))
+    return scores, iterations, time.time() - debut
+
+
+def chemin_regularisation(plis, valeurs_C, modele=None, warm_start=True, n_jobs=-1):
+    """
+    Scores de validation croisée le long du chemin de régularisation
+    
+    Args:
+        plis: GestionnairePlis partagé (mêmes plis que l'entraînement)
+        valeurs_C: Valeurs de C (parcourues dans l'ordre croissant)
+        modele: Régression logistique de base (défaut : max_iter=1000, random_state=42)
+        warm_start: Démarrage à chaud ; False ajuste chaque C à partir de zéro
+        n_jobs: Nombre de processus (un pli par tâche)
+    
+    Returns:
+        Dictionnaire {'valeurs_C', 'scores' (plis x C), 'iterations' (plis x C),
+        'temps_calcul'}
+    """
+    if modele is None:
+        modele = LogisticRegression(max_iter=1000, random_state=42)
+    valeurs_C = np.sort(np.asarray(valeurs_C, dtype=float))
+    
+    sorties = Parallel(n_jobs=n_jobs)(
+        delayed(_chemin_pli)(modele, valeurs_C, warm_start, *plis.donnees_pli(i))
+        for i in range(len(plis))
+    )
+    
+    return {
+        'valeurs_C': valeurs_C,
+        'scores': np.array([scores for scores, _, _ in sorties]),
+        'iterations': np.array([iterations for _, iterations, _ in sorties]),
+        'temps_calcul': sum(duree for _, _, duree in sorties)
+    }
@@ -2,28 +2,100 @@
 Entraînement des Modèles de Classification de Sentiments
 """
 
+import sys
+import time
+import argparse
 import joblib
 import numpy as np
 import pandas as pd
-import json
 from pathlib import Path
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+from scipy import sparse
+from sklearn.model_selection import train_test_split
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.ensemble import RandomForestClassifier, VotingClassifier
-from sklearn.metrics import classification_report, accuracy_score
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.svm import SVC, LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.preprocessing import LabelEncoder
 import matplotlib.pyplot as plt
-from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.corpus import lire_corpus, resoudre_corpus, empreinte_texte
+from outils.colonnes import charger_colonnes
+from outils.artefacts import sauvegarder_artefact, charger_artefact, artefact_existe
+from outils.recherche import RechercheHalving
+from outils.modele_compact import exporter_modele_compact
+from outils.foret import ForetBornee, resume_rapport
+from outils.evaluation import matrices_confusion, metriques
+from outils.comparaison import comparer_modeles, choisir_modele, SEUIL_SIGNIFICATIVITE
+from planificateur import PlanificateurEntrainement
+from plis import GestionnairePlis
+from chemin_regularisation import chemin_regularisation, VALEURS_C_FINES
+
+# Champs des publications utilisés pour l'entraînement et les statistiques
+COLONNES_UTILES = ['id', 'plateforme', 'texte', 'texte_traite', 'sentiment']
+
+# Implémentations possibles du SVM linéaire
+MODES_SVM = ['liblinear', 'sgd', 'libsvm']
+
+
+def creer_svm_lineaire(mode='liblinear', calibration=False):
+    """
+    Crée le modèle 'SVM Linéaire'
+    
+    Args:
+        mode: 'liblinear' (LinearSVC), 'sgd' (SGDClassifier, perte hinge) ou
+              'libsvm' (ancien SVC(kernel='linear', probability=True), coût
+              au moins quadratique en nombre de publications)
+        calibration: Ajouter des probabilités (CalibratedClassifierCV sigmoïde,
+                     3 plis) ; sans calibration, le modèle n'a que predict
+    """
+    if mode == 'libsvm':
+        return SVC(kernel='linear', random_state=42, probability=True)
+    if mode == 'sgd':
+        modele = SGDClassifier(loss='hinge', alpha=1e-4, max_iter=1000, tol=1e-3, random_state=42)
+    else:
+        modele = LinearSVC(C=1.0, random_state=42)
+    
+    if calibration:
+        modele = CalibratedClassifierCV(modele, method='sigmoid', cv=3)
+    return modele
+
 
 class EntraineurSentiment:
     """Classe pour entraîner les modèles"""
     
-    def __init__(self):
+    def __init__(self, n_jobs=-1, svm='liblinear', calibration_svm=False,
+                 recherche='halving', facteur_halving=3, historique_recherche=True,
+                 export='pickle', budget_foret=None, n_reechantillons=10000):
+        """
+        Args:
+            n_jobs: Nombre de processus pour l'entraînement et la validation croisée
+            svm: Implémentation du SVM linéaire (voir creer_svm_lineaire)
+            calibration_svm: Calibrer les probabilités du SVM linéaire
+            recherche: 'halving' (tous les modèles, divisions successives),
+                       'grille' (grille C de la régression logistique) ou
+                       'chemin' (chemin de régularisation démarré à chaud)
+            facteur_halving: Facteur d'élimination de la recherche par divisions successives
+            historique_recherche: Reprendre et enrichir resultats/historique_recherche.json
+            export: 'pickle' (estimateur scikit-learn) ou 'compact' (outils/modele_compact.py)
+            budget_foret: Paramètres de ForetBornee (max_depth, min_samples_leaf,
+                          max_samples, memoire_max_mo, n_jobs) de la Random Forest
+            n_reechantillons: Rééchantillons bootstrap du test pour comparer les modèles
+        """
+        self.n_jobs = n_jobs
+        self.svm = svm
+        self.calibration_svm = calibration_svm
+        self.recherche = recherche
+        self.facteur_halving = facteur_halving
+        self.historique_recherche = historique_recherche
+        self.export = export
+        self.budget_foret = budget_foret or {}
+        self.n_reechantillons = n_reechantillons
+        self.vectoriseur = None
+        self.plis = None
         self.script_dir = Path(__file__).parent
         self.projet_dir = self.script_dir.parent
         self.dossier_resultats = self.script_dir / 'resultats'
@@ -38,30 +110,122 @@ class EntraineurSentiment:
         """Charge les données annotées et la matrice TF-IDF"""
         print("Chargement des données...")
         
-        # Charger les données annotées
-        chemin_donnees = self.projet_dir / '02_Annotation' / 'uvbf_data_annote.json'
-        with open(chemin_donnees, 'r', encoding='utf-8') as f:
-            donnees = json.load(f)
-        
-        # Filtrer les données annotées
-        donnees_annotees = [item for item in donnees if 'sentiment' in item]
+        # Lire en flux les données annotées, sans garder les champs inutiles
+        chemin_donnees = resoudre_corpus(self.projet_dir / '02_Annotation' / 'uvbf_data_annote.json')
+        donnees_annotees = [
+            {cle: item[cle] for cle in COLONNES_UTILES if cle in item}
+            for item in lire_corpus(chemin_donnees)
+            if 'sentiment' in item
+        ]
         print(f" {len(donnees_annotees)} publications annotées")
         
-        # Charger le vectoriseur et la matrice
+        # Charger le vectoriseur
         chemin_vectoriseur = self.projet_dir / '04_Vectorisation' / 'vectoriseur.pkl'
-        chemin_matrice = self.projet_dir / '04_Vectorisation' / 'matrice_tfidf.pkl'
+        self.vectoriseur = vectoriseur = joblib.load(chemin_vectoriseur)
         
-        vectoriseur = joblib.load(chemin_vectoriseur)
-        
-        # Recréer la matrice pour les données annotées
+        # Reprendre les lignes de la matrice TF-IDF déjà calculée
         df = pd.DataFrame(donnees_annotees)
-        X = vectoriseur.transform(df['texte_traite'] if 'texte_traite' in df.columns else df['texte'])
+        X = self.matrice_alignee(df, vectoriseur)
         
         # Encoder les labels
         y = self.encodeur.fit_transform(df['sentiment'])
         
         return X, y, df
     
+    def matrice_alignee(self, df, vectoriseur):
+        """
+        Sélectionne les lignes de l'artefact matrice_tfidf correspondant aux publications
+        
+        Les lignes de la matrice sont repérées par (id, empreinte du texte brut)
+        grâce à uvbf_tfidf_index.csv. Seules les publications absentes de la
+        matrice sont vectorisées avec vectoriseur.transform, à partir de leur
+        texte_traite (voir textes_traites) comme à l'étape 4.
+        
+        Args:
+            df: DataFrame des publications annotées
+            vectoriseur: Vectoriseur ajusté par l'étape 4
+        
+        Returns:
+            Matrice creuse alignée sur les lignes de df
+        """
+        dossier = self.projet_dir / '04_Vectorisation'
+        chemin_index = dossier / 'uvbf_tfidf_index.csv'
+        
+        positions = {}
+        if artefact_existe(dossier, 'matrice_tfidf') and chemin_index.exists():
+            matrice = charger_artefact(dossier, 'matrice_tfidf')
+            index = pd.read_csv(chemin_index, dtype=str, keep_default_na=False)
+            
+            # Index sans empreinte (ancien export) ou matrice d'un autre vectoriseur : inutilisable
+            largeur = vectoriseur.transform(['']).shape[1]
+            if 'empreinte' in index.columns and matrice.shape == (len(index), largeur):
+                for ligne, cle in enumerate(zip(index['id'], index['empreinte'])):
+                    positions.setdefault(cle, ligne)
+        
+        lignes = np.array([
+            positions.get((str(id_pub), empreinte_texte(texte)), -1)
+            for id_pub, texte in zip(df['id'], df['texte'])
+        ], dtype=np.int64)
+        manquants = np.flatnonzero(lignes < 0)
+        presents = np.flatnonzero(lignes >= 0)
+        
+        print(f" {len(presents)} lignes reprises de matrice_tfidf, "
+              f"{len(manquants)} publications vectorisées")
+        
+        # transform refuse une liste vide
+        if len(df) == 0:
+            return sparse.csr_matrix((0, vectoriseur.transform(['']).shape[1]))
+        # Aucune ligne reprise (pas d'artefact ou autre vectoriseur) : tout est vectorisé
+        if len(presents) == 0:
+            return vectoriseur.transform(self.textes_traites(df))
+        if len(manquants) == 0:
+            return matrice[lignes]
+        
+        X_manquants = vectoriseur.transform(self.textes_traites(df.iloc[manquants]))
+        X = sparse.vstack([matrice[lignes[presents]], X_manquants], format='csr')
+        ordre = np.empty(len(df), dtype=int)
+        ordre[np.concatenate([presents, manquants])] = np.arange(len(df))
+        return X[ordre]
+    
+    def textes_traites(self, df):
+        """
+        Texte prétraité (lemmes) des publications, tel que l'étape 4 le vectorise
+        
+        Le corpus annoté n'a pas de texte_traite : il est repris de
+        03_Pretraitement/uvbf_data_pretraite.json par (id, empreinte du texte
+        brut), comme charger_existant. Les publications absentes du fichier
+        prétraité passent par nettoyer_textes et pretraitement_lot.
+        
+        Returns:
+            Liste des textes prétraités, dans l'ordre de df
+        """
+        textes = (df['texte_traite'].tolist() if 'texte_traite' in df.columns
+                  else [None] * len(df))
+        cles = [(str(id_pub), empreinte_texte(texte)) for id_pub, texte in zip(df['id'], df['texte'])]
+        a_chercher = {cle for cle, texte in zip(cles, textes) if not isinstance(texte, str)}
+        
+        existant = {}
+        chemin = resoudre_corpus(self.projet_dir / '03_Pretraitement' / 'uvbf_data_pretraite.json')
+        if a_chercher and chemin.exists():
+            for item in lire_corpus(chemin):
+                if 'id' in item and 'texte' in item and 'texte_traite' in item:
+                    cle = (str(item['id']), empreinte_texte(item['texte']))
+                    if cle in a_chercher:
+                        existant[cle] = item['texte_traite']
+        textes = [texte if isinstance(texte, str) else existant.get(cle)
+                  for cle, texte in zip(cles, textes)]
+        
+        a_traiter = [i for i, texte in enumerate(textes) if texte is None]
+        if a_traiter:
+            print(f" {len(a_traiter)} publications absentes du corpus prétraité, lemmatisées")
+            sys.path.insert(0, str(self.script_dir.parent / '03_Pretraitement'))
+            from pretraitement import nettoyer_textes, pretraitement_lot
+            
+            nettoyes = nettoyer_textes([df['texte'].iloc[i] for i in a_traiter])
+            for i, tokens in zip(a_traiter, pretraitement_lot(nettoyes)):
+                textes[i] = ' '.join(tokens)
+        return textes
+    
     def diviser_donnees(self, X, y):
         """Divise les données en train/test"""
         X_train, X_test, y_train, y_test = train_test_split(
@@ -72,14 +236,24 @@ class EntraineurSentiment:
         print(f"  Train : {X_train.shape[0]} échantillons")
         print(f"  Test  : {X_test.shape[0]} échantillons")
         
-        # Sauvegarder
-        joblib.dump(X_train, self.dossier_resultats / 'X_train.pkl')
-        joblib.dump(X_test, self.dossier_resultats / 'X_test.pkl')
-        joblib.dump(y_train, self.dossier_resultats / 'y_train.pkl')
-        joblib.dump(y_test, self.dossier_resultats / 'y_test.pkl')
+        # Sauvegarder (artefacts memory-map relus par l'évaluation)
+        sauvegarder_artefact(self.dossier_resultats, 'X_train', X_train)
+        sauvegarder_artefact(self.dossier_resultats, 'X_test', X_test)
+        sauvegarder_artefact(self.dossier_resultats, 'y_train', y_train)
+        sauvegarder_artefact(self.dossier_resultats, 'y_test', y_test)
         
         return X_train, X_test, y_train, y_test
     
+    def obtenir_plis(self, X_train, y_train):
+        """Plis de validation croisée partagés entre entraînement et optimisation"""
+        if self.plis is None or self.plis.X is not X_train:
+            self.plis = GestionnairePlis(X_train, y_train, cv=5)
+        return self.plis
+    
+    def creer_foret(self, **parametres):
+        """Random Forest à mémoire bornée, avec les budgets de la ligne de commande"""
+        return ForetBornee(random_state=42, **{**self.budget_foret, **parametres})
+    
     def entrainer_modeles(self, X_train, y_train):
         """Entraîne plusieurs modèles"""
         print("\n" + "="*70)
@@ -89,89 +263,277 @@ class EntraineurSentiment:
         modeles = {
             'Naive Bayes': MultinomialNB(),
             'Régression Logistique': LogisticRegression(max_iter=1000, random_state=42),
-            'SVM Linéaire': SVC(kernel='linear', random_state=42, probability=True),
-            'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42)
+            'SVM Linéaire': creer_svm_lineaire(self.svm, self.calibration_svm),
+            'Random Forest': self.creer_foret(n_estimators=100)
         }
         
+        # Ajustements complets et plis de validation croisée de tous les modèles en parallèle
+        debut = time.time()
+        planificateur = PlanificateurEntrainement(self.obtenir_plis(X_train, y_train), n_jobs=self.n_jobs)
+        sorties = planificateur.executer(modeles)
+        duree = time.time() - debut
+        
         resultats = {}
         
-        for nom, modele in modeles.items():
-            print(f"\n {nom}")
-            modele.fit(X_train, y_train)
+        for nom, sortie in sorties.items():
+            cv_scores = sortie['cv_scores']
             
-            score_train = modele.score(X_train, y_train)
-            cv_scores = cross_val_score(modele, X_train, y_train, cv=5)
-            
-            print(f"  Train : {score_train:.2%}")
+            print(f"\n {nom}")
+            print(f"  Train : {sortie['score_train']:.2%}")
             print(f"  CV    : {cv_scores.mean():.2%} (+/- {cv_scores.std():.2%})")
+            print(f"  Temps : {sortie['temps_mur']:.2f} s (mur), {sortie['temps_calcul']:.2f} s de calcul")
+            if hasattr(sortie['modele'], 'rapport_'):
+                print(f"  Arbres : {resume_rapport(sortie['modele'].rapport_)}")
             
             resultats[nom] = {
-                'modele': modele,
-                'score_train': score_train,
+                'modele': sortie['modele'],
+                'score_train': sortie['score_train'],
                 'score_cv': cv_scores.mean()
             }
         
+        temps_calcul = sum(sortie['temps_calcul'] for sortie in sorties.values())
+        print(f"\n✓ {len(modeles)} modèles entraînés en {duree:.2f} s "
+              f"({temps_calcul:.2f} s de calcul, n_jobs={self.n_jobs})")
+        
         return resultats
     
+    def espaces_recherche(self):
+        """Estimateur de base et grille de paramètres de chaque modèle"""
+        grille_svm = {'alpha': [1e-5, 1e-4, 1e-3]} if self.svm == 'sgd' else {'C': [0.01, 0.1, 1, 10]}
+        if self.calibration_svm and self.svm != 'libsvm':
+            grille_svm = {f'estimator__{nom}': valeurs for nom, valeurs in grille_svm.items()}
+        
+        return {
+            'Naive Bayes': (MultinomialNB(), {'alpha': [0.01, 0.03, 0.1, 0.3, 1.0, 3.0]}),
+            'Régression Logistique': (LogisticRegression(max_iter=1000, random_state=42),
+                                      {'C': [0.01, 0.1, 1, 10, 100]}),
+            'SVM Linéaire': (creer_svm_lineaire(self.svm, self.calibration_svm), grille_svm),
+            'Random Forest': (self.creer_foret(),
+                              {'n_estimators': [100, 300], 'max_features': ['sqrt', 0.1],
+                               'min_samples_leaf': [1, 2]})
+        }
+    
     def optimiser_modele(self, X_train, y_train):
         """Optimise les hyperparamètres"""
         print("\n" + "="*70)
         print("OPTIMISATION DES HYPERPARAMÈTRES")
         print("="*70)
         
-        param_grid = {
-            'C': [0.1, 1, 10, 100],
-            'penalty': ['l2'],
-            'solver': ['lbfgs']
-        }
+        if self.recherche == 'grille':
+            return self._optimiser_grille(X_train, y_train)
+        if self.recherche == 'chemin':
+            return self._optimiser_chemin(X_train, y_train)
+        return self._optimiser_halving(X_train, y_train)
+    
+    def _optimiser_halving(self, X_train, y_train):
+        """Recherche par divisions successives sur tous les modèles"""
+        historique = (self.dossier_resultats / 'historique_recherche.json'
+                      if self.historique_recherche else None)
+        recherche = RechercheHalving(self.espaces_recherche(), facteur=self.facteur_halving,
+                                     cv=5, n_jobs=self.n_jobs, historique=historique)
+        
+        # Le dernier tour (plis complets) passe par les plis partagés : les modèles
+        # déjà validés sont repris du cache et les prédictions hors-pli conservées
+        planificateur = PlanificateurEntrainement(self.obtenir_plis(X_train, y_train), n_jobs=self.n_jobs)
+        
+        def evaluer_plis_partages(nom, estimateurs):
+            sorties = planificateur.executer(dict(enumerate(estimateurs)), ajuster_complet=False)
+            return ([sorties[i]['cv_scores'].mean() for i in range(len(estimateurs))],
+                    sum(sortie['taches'] for sortie in sorties.values()))
+        
+        debut = time.time()
+        sorties = recherche.executer(X_train, y_train, plis=self.plis.plis,
+                                     evaluateur=evaluer_plis_partages)
+        # Candidats retenus repris de l'historique : compléter leurs prédictions hors-pli
+        planificateur.executer({nom: sortie['modele'] for nom, sortie in sorties.items()},
+                               ajuster_complet=False)
+        duree = time.time() - debut
         
-        print("\nOptimisation de la Régression Logistique...")
-        grid = GridSearchCV(
-            LogisticRegression(max_iter=1000, random_state=42),
-            param_grid, cv=5, n_jobs=-1, verbose=0
-        )
+        resultats = {}
+        for nom, sortie in sorties.items():
+            print(f"\n {nom} : {sortie['parametres']}")
+            print(f"  CV    : {sortie['score_cv']:.2%} ({sortie['evaluations']} ajustements, "
+                  f"{sortie['reprises']} essais repris de l'historique)")
+            if sortie['amorces']:
+                print(f"  Amorçage : {sortie['amorces']} candidats survivants de l'exécution précédente")
+            if hasattr(sortie['modele'], 'rapport_'):
+                print(f"  Arbres : {resume_rapport(sortie['modele'].rapport_)}")
+            
+            resultats[f'{nom} (optimisé)'] = {
+                'modele': sortie['modele'],
+                'score_train': sortie['modele'].score(X_train, y_train),
+                'score_cv': sortie['score_cv']
+            }
         
-        grid.fit(X_train, y_train)
+        print(f"\n✓ Recherche terminée en {duree:.2f} s")
+        if historique:
+            print(f"✓ Historique des essais : {historique}")
         
-        print(f"✓ Meilleurs paramètres : {grid.best_params_}")
-        print(f"✓ Meilleur score CV : {grid.best_score_:.2%}")
+        return resultats
+    
+    def _optimiser_grille(self, X_train, y_train):
+        """Grille C de la régression logistique, sur les plis partagés"""
+        # penalty='l2' et solver='lbfgs' sont les valeurs par défaut
+        param_grid = {'C': [0.1, 1, 10, 100]}
+        
+        print("\nOptimisation de la Régression Logistique...")
+        candidats = {
+            C: LogisticRegression(max_iter=1000, random_state=42, C=C)
+            for C in param_grid['C']
+        }
         
-        return {'Régression Logistique Optimisée': {
-            'modele': grid.best_estimator_,
-            'score_train': grid.best_estimator_.score(X_train, y_train),
-            'score_cv': grid.best_score_
+        # Mêmes plis que l'entraînement : C=1 (modèle par défaut) est repris du cache
+        planificateur = PlanificateurEntrainement(self.obtenir_plis(X_train, y_train), n_jobs=self.n_jobs)
+        sorties = planificateur.executer(candidats, ajuster_complet=False)
+        scores = {C: sortie['cv_scores'].mean() for C, sortie in sorties.items()}
+        ajustements = sum(sortie['taches'] for sortie in sorties.values())
+        print(f"  {ajustements} ajustements lancés, "
+              f"{len(candidats) * len(self.plis) - ajustements} plis repris du cache")
+        
+        # Premier meilleur candidat, comme GridSearchCV, puis réajustement sur tout l'ensemble
+        meilleur_C = max(scores, key=scores.get)
+        final = planificateur.executer({meilleur_C: candidats[meilleur_C]})[meilleur_C]
+        
+        print(f"✓ Meilleurs paramètres : {{'C': {meilleur_C}}}")
+        print(f"✓ Meilleur score CV : {scores[meilleur_C]:.2%}")
+        
+        return {'Régression Logistique (optimisé)': {
+            'modele': final['modele'],
+            'score_train': final['score_train'],
+            'score_cv': scores[meilleur_C]
         }}
     
+    def _optimiser_chemin(self, X_train, y_train, valeurs_C=VALEURS_C_FINES):
+        """Grille fine de C de la régression logistique, parcourue à chaud sur chaque pli"""
+        print(f"\nChemin de régularisation ({len(valeurs_C)} valeurs de C, démarrage à chaud)...")
+        plis = self.obtenir_plis(X_train, y_train)
+        
+        debut = time.time()
+        chemin = chemin_regularisation(plis, valeurs_C, n_jobs=self.n_jobs)
+        duree = time.time() - debut
+        
+        scores = chemin['scores'].mean(axis=0)
+        print(f"\n  {'C':>9}  {'CV':>7}  {'itérations (5 plis)':>20}")
+        for C, score, iterations in zip(chemin['valeurs_C'], scores, chemin['iterations'].sum(axis=0)):
+            print(f"  {C:>9.4g}  {score:>7.2%}  {iterations:>20}")
+        print(f"  {chemin['iterations'].sum()} itérations lbfgs, {duree:.2f} s "
+              f"({chemin['temps_calcul']:.2f} s de calcul)")
+        
+        # Premier meilleur C (ordre croissant, comme la grille), réajusté à froid
+        # sur tout l'ensemble : même modèle que la grille démarrée à froid
+        meilleur_C = float(chemin['valeurs_C'][scores.argmax()])
+        planificateur = PlanificateurEntrainement(plis, n_jobs=self.n_jobs)
+        final = planificateur.executer(
+            {meilleur_C: LogisticRegression(max_iter=1000, random_state=42, C=meilleur_C)}
+        )[meilleur_C]
+        
+        print(f"✓ Meilleurs paramètres : {{'C': {meilleur_C:.4g}}}")
+        print(f"✓ Meilleur score CV : {scores.max():.2%}")
+        
+        return {'Régression Logistique (optimisé)': {
+            'modele': final['modele'],
+            'score_train': final['score_train'],
+            'score_cv': scores.max()
+        }}
+    
+    def sauvegarder_predictions_hors_pli(self, resultats):
+        """
+        Sauvegarde les prédictions et probabilités hors-pli de chaque modèle
+        
+        Elles couvrent tout l'ensemble d'entraînement sans nouvel ajustement
+        (stacking, calibration). Les modèles sans predict_proba (SVM linéaire
+        non calibré) ont leurs scores decision_function à la place des
+        probabilités.
+        """
+        classes = list(self.encodeur.classes_)
+        predictions = {}
+        sorties = {'probabilites_hors_pli': {}, 'decisions_hors_pli': {}}
+        for nom, info in resultats.items():
+            predictions[nom], proba = self.plis.predictions_hors_pli(info['modele'])
+            if proba is not None:
+                sorties['probabilites_hors_pli'][nom] = proba
+            else:
+                decisions = self.plis.decisions_hors_pli(info['modele'])
+                if decisions is not None:
+                    sorties['decisions_hors_pli'][nom] = decisions
+        
+        sauvegarder_artefact(self.dossier_resultats, 'predictions_hors_pli',
+                             np.column_stack(list(predictions.values())),
+                             {'modeles': list(predictions), 'classes': classes})
+        for artefact, matrices in sorties.items():
+            if matrices:
+                sauvegarder_artefact(self.dossier_resultats, artefact,
+                                     np.stack(list(matrices.values()), axis=1),
+                                     {'modeles': list(matrices), 'classes': classes})
+        
+        print(f"\n✓ Prédictions hors-pli sauvegardées dans {self.dossier_resultats}/ :")
+        print(f"  - predictions_hors_pli : {', '.join(predictions)}")
+        for artefact, matrices in sorties.items():
+            if matrices:
+                print(f"  - {artefact} : {', '.join(matrices)}")
+    
     def evaluer_modeles(self, resultats, X_test, y_test):
-        """Évalue tous les modèles sur le test"""
+        """
+        Évalue tous les modèles sur le test
+        
+        Le modèle retenu est choisi sur le bootstrap apparié du test
+        (outils/comparaison.py) plutôt que sur la seule exactitude de test.
+        """
         print("\n" + "="*70)
         print("ÉVALUATION SUR L'ENSEMBLE DE TEST")
         print("="*70)
         
         comparaison = []
         
+        # Une prédiction par modèle, puis toutes les matrices de confusion en un comptage
+        self.predictions_test = {nom: info['modele'].predict(X_test) for nom, info in resultats.items()}
+        matrices = matrices_confusion(y_test, self.predictions_test, len(self.encodeur.classes_))
+        
         for nom, info in resultats.items():
-            modele = info['modele']
-            y_pred = modele.predict(X_test)
-            score_test = accuracy_score(y_test, y_pred)
+            m = metriques(matrices[nom])
+            score_test = m['exactitude']
             
-            print(f"\n{nom} : {score_test:.2%}")
+            print(f"\n{nom} : {score_test:.2%} (F1 macro {m['macro'][2]:.2%})")
             
             comparaison.append({
                 'Modèle': nom,
                 'Score Train': info['score_train'],
                 'Score CV': info['score_cv'],
-                'Score Test': score_test
+                'Score Test': score_test,
+                'F1 Macro': m['macro'][2]
             })
-            
-            if score_test > self.meilleur_score:
-                self.meilleur_score = score_test
-                self.meilleur_modele = modele
-                self.meilleur_nom = nom
         
-        # Sauvegarder la comparaison
         df_comp = pd.DataFrame(comparaison)
+        
+        # Bootstrap apparié : mêmes rééchantillons du test pour tous les modèles
+        debut = time.time()
+        correct = np.stack([self.predictions_test[nom] == np.asarray(y_test) for nom in df_comp['Modèle']])
+        intervalles, paires = comparer_modeles(correct, df_comp['Modèle'], self.n_reechantillons)
+        print(f"\n✓ Bootstrap : {self.n_reechantillons} rééchantillons x {len(df_comp)} modèles "
+              f"en {time.time() - debut:.2f} s")
+        
+        df_comp['IC Bas'] = intervalles['IC Bas']
+        df_comp['IC Haut'] = intervalles['IC Haut']
+        for _, ligne in df_comp.iterrows():
+            print(f"  {ligne['Modèle']:<34} {ligne['Score Test']:.2%}  IC 95 % "
+                  f"[{ligne['IC Bas']:.2%} ; {ligne['IC Haut']:.2%}]")
+        
+        self.meilleur_nom, ex_aequo = choisir_modele(
+            paires,
+            dict(zip(df_comp['Modèle'], df_comp['Score Test'])),
+            dict(zip(df_comp['Modèle'], df_comp['Score CV']))
+        )
+        self.meilleur_modele = resultats[self.meilleur_nom]['modele']
+        self.meilleur_score = float(df_comp.loc[df_comp['Modèle'] == self.meilleur_nom, 'Score Test'].iloc[0])
+        df_comp['Retenu'] = df_comp['Modèle'] == self.meilleur_nom
+        
+        print(f"\n✓ Non distingués du meilleur score de test (p >= {SEUIL_SIGNIFICATIVITE}) : "
+              f"{len(ex_aequo)} modèle(s), départagés par le score CV")
+        
+        # Sauvegarder la comparaison
         df_comp.to_csv(self.dossier_resultats / 'comparaison_modeles.csv', index=False)
+        paires.to_csv(self.dossier_resultats / 'significativite_modeles.csv', index=False)
+        print(f"✓ Significativité des paires : {self.dossier_resultats}/significativite_modeles.csv")
         
         # Graphique
         self._visualiser_comparaison(df_comp)
@@ -179,6 +541,7 @@ class EntraineurSentiment:
         print("\n" + "="*70)
         print(f"🏆 MEILLEUR MODÈLE : {self.meilleur_nom}")
         print(f"   Exactitude : {self.meilleur_score:.2%}")
+        print(f"   Score CV : {resultats[self.meilleur_nom]['score_cv']:.2%}")
         print("="*70)
         
         return df_comp
@@ -195,7 +558,8 @@ class EntraineurSentiment:
         
         ax.bar(x - width, df['Score Train'], width, label='Train', alpha=0.8)
         ax.bar(x, df['Score CV'], width, label='CV', alpha=0.8)
-        ax.bar(x + width, df['Score Test'], width, label='Test', alpha=0.8)
+        ax.bar(x + width, df['Score Test'], width, label='Test', alpha=0.8,
+               yerr=[df['Score Test'] - df['IC Bas'], df['IC Haut'] - df['Score Test']], capsize=3)
         
         ax.set_xlabel('Modèles')
         ax.set_ylabel('Exactitude')
@@ -213,26 +577,44 @@ class EntraineurSentiment:
         print(f"\n✓ Graphique sauvegardé : {self.dossier_resultats}/comparaison_modeles.png")
     
     def sauvegarder_modele(self):
-        """Sauvegarde le meilleur modèle"""
-        joblib.dump(self.meilleur_modele, self.script_dir / 'modele_sentiment.pkl')
-        joblib.dump(self.encodeur, self.script_dir / 'encodeur_labels.pkl')
-        
-        # Copier aussi vers le dossier d'évaluation
+        """Sauvegarde le meilleur modèle (pickle ou export compact)"""
         eval_dir = self.projet_dir / '06_Evaluation'
         eval_dir.mkdir(exist_ok=True)
-        joblib.dump(self.meilleur_modele, eval_dir / 'modele_sentiment.pkl')
+        
+        fichier_modele = 'modele_sentiment.pkl'
+        if self.export == 'compact':
+            try:
+                # Poids float32 élagués ou arbres aplatis, relus sans scikit-learn
+                for dossier in (self.script_dir, eval_dir):
+                    exporter_modele_compact(self.meilleur_modele, self.encodeur, self.vectoriseur,
+                                            dossier / 'modele_sentiment.npz')
+                fichier_modele = 'modele_sentiment.npz'
+            except ValueError as erreur:
+                print(f"\n⚠️  {erreur} : sauvegarde en pickle")
+        
+        if fichier_modele == 'modele_sentiment.pkl':
+            joblib.dump(self.meilleur_modele, self.script_dir / 'modele_sentiment.pkl')
+            # Copier aussi vers le dossier d'évaluation
+            joblib.dump(self.meilleur_modele, eval_dir / 'modele_sentiment.pkl')
+        joblib.dump(self.encodeur, self.script_dir / 'encodeur_labels.pkl')
         joblib.dump(self.encodeur, eval_dir / 'encodeur_sentiment.pkl')
         
         print(f"\n✓ Modèle sauvegardé :")
-        print(f"  - {self.script_dir}/modele_sentiment.pkl")
+        print(f"  - {self.script_dir}/{fichier_modele}")
         print(f"  - {self.script_dir}/encodeur_labels.pkl")
     
-    def calculer_statistiques_sentiment(self, df):
+    def calculer_statistiques_sentiment(self, df=None):
         """Calcule les statistiques de sentiment"""
         print("\n" + "="*70)
         print("STATISTIQUES DES SENTIMENTS")
         print("="*70)
         
+        if df is None:
+            # Seules les colonnes utiles sont lues (Parquet si disponible)
+            df = charger_colonnes(self.projet_dir / '02_Annotation' / 'uvbf_data_annote.json',
+                                  ['sentiment', 'plateforme'])
+            df = df[df['sentiment'].notna()]
+        
         stats = df['sentiment'].value_counts(normalize=True) * 100
         
         print("\nRépartition des sentiments :")
@@ -249,17 +631,58 @@ class EntraineurSentiment:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Entraînement des modèles de sentiment")
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help="Processus pour l'entraînement et la validation croisée (-1 : tous les cœurs)")
+    parser.add_argument('--svm', choices=MODES_SVM, default='liblinear',
+                        help="SVM linéaire : liblinear (LinearSVC), sgd ou libsvm (ancien SVC)")
+    parser.add_argument('--calibration-svm', action='store_true',
+                        help="Probabilités calibrées pour le SVM linéaire (liblinear/sgd)")
+    parser.add_argument('--recherche', choices=['halving', 'grille', 'chemin'], default='halving',
+                        help="halving : tous les modèles par divisions successives ; grille : C de la "
+                             "régression logistique ; chemin : grille fine de C démarrée à chaud")
+    parser.add_argument('--facteur-halving', type=int, default=3,
+                        help="On garde 1/facteur des candidats à chaque tour")
+    parser.add_argument('--sans-historique', action='store_true',
+                        help="Ne pas reprendre ni enregistrer resultats/historique_recherche.json")
+    parser.add_argument('--export', choices=['pickle', 'compact'], default='pickle',
+                        help="compact : poids float32 élagués ou arbres aplatis (modele_sentiment.npz)")
+    parser.add_argument('--foret-profondeur', type=int, default=None,
+                        help="Profondeur maximale des arbres de la Random Forest")
+    parser.add_argument('--foret-min-feuille', type=int, default=1,
+                        help="Nombre minimal de publications par feuille")
+    parser.add_argument('--foret-echantillons', type=float, default=None,
+                        help="Part des publications tirées pour chaque arbre (ex : 0.5)")
+    parser.add_argument('--foret-memoire-mo', type=float, default=None,
+                        help="Plafond mémoire (Mo) de l'entrée et des arbres de la forêt")
+    parser.add_argument('--foret-n-jobs', type=int, default=1,
+                        help="Threads de construction des arbres (les modèles tournent déjà en parallèle)")
+    parser.add_argument('--reechantillons', type=int, default=10000,
+                        help="Rééchantillons bootstrap du test pour comparer les modèles")
+    args = parser.parse_args()
+    
     print("\n" + "="*70)
     print("ENTRAÎNEMENT - CLASSIFICATION DE SENTIMENTS UVBF")
     print("="*70)
     
-    entraineur = EntraineurSentiment()
+    entraineur = EntraineurSentiment(n_jobs=args.n_jobs, svm=args.svm,
+                                     calibration_svm=args.calibration_svm,
+                                     recherche=args.recherche,
+                                     facteur_halving=args.facteur_halving,
+                                     historique_recherche=not args.sans_historique,
+                                     export=args.export,
+                                     budget_foret={'max_depth': args.foret_profondeur,
+                                                   'min_samples_leaf': args.foret_min_feuille,
+                                                   'max_samples': args.foret_echantillons,
+                                                   'memoire_max_mo': args.foret_memoire_mo,
+                                                   'n_jobs': args.foret_n_jobs},
+                                     n_reechantillons=args.reechantillons)
     
     # Charger
     X, y, df = entraineur.charger_donnees()
     
     # Statistiques
-    entraineur.calculer_statistiques_sentiment(df)
+    entraineur.calculer_statistiques_sentiment()
     
     # Diviser
     X_train, X_test, y_train, y_test = entraineur.diviser_donnees(X, y)
@@ -271,6 +694,9 @@ def main():
     resultats_opt = entraineur.optimiser_modele(X_train, y_train)
     resultats.update(resultats_opt)
     
+    # Prédictions hors-pli (stacking, calibration)
+    entraineur.sauvegarder_predictions_hors_pli(resultats)
+    
     # Évaluer
     entraineur.evaluer_modeles(resultats, X_test, y_test)
     
@@ -282,4 +708,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,330 @@
+"""
+Entraînement incrémental du modèle de sentiment
+
+Au lieu de relancer entrainement.py après chaque lot d'annotations, le modèle
+(MultinomialNB ou SGDClassifier) est mis à jour avec partial_fit sur les
+seules publications nouvelles ou réannotées depuis le dernier point de
+contrôle. Chaque point de contrôle garde la liste des publications apprises,
+repérées par (id, empreinte du texte brut) comme au prétraitement, avec leur
+sentiment : une publication est à apprendre si sa clé est inconnue ou si son
+sentiment a changé. Pour une publication réannotée, l'ancien sentiment est
+retiré exactement des comptes de MultinomialNB ; SGDClassifier ne peut pas
+oublier un exemple, le nouveau sentiment est seulement appris par-dessus
+(--reinitialiser pour un modèle exact).
+
+Le vectoriseur de l'étape 4 (vectoriseur.pkl) n'est jamais réajusté : il est
+seulement utilisé en transform, et son empreinte est enregistrée dans chaque
+point de contrôle. Les termes inconnus du vectoriseur sont ignorés jusqu'à
+la prochaine vectorisation complète, qui ouvre une nouvelle chaîne
+(--reinitialiser).
+
+Chaque mise à jour écrit un point de contrôle versionné
+(points_controle/v0001/, v0002/, ...) et modele_incremental.pkl (avec
+encodeur_incremental.pkl). modele_sentiment.pkl, choisi par entrainement.py
+et relu par 06_Evaluation, n'est remplacé qu'avec --remplacer-modele.
+
+Utilisation :
+    python entrainement_incremental.py                    # nouvelles annotations seulement
+    python entrainement_incremental.py --modele nb        # MultinomialNB au lieu de SGD
+    python entrainement_incremental.py --reinitialiser    # nouvelle chaîne, toutes les annotations
+    python entrainement_incremental.py --remplacer-modele # écrire aussi modele_sentiment.pkl
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.corpus import lire_corpus, resoudre_corpus, empreinte_texte
+from outils.modele_compact import exporter_modele_compact
+from entrainement import EntraineurSentiment, COLONNES_UTILES
+
+MODELES_INCREMENTAUX = {
+    'sgd': lambda: SGDClassifier(loss='log_loss', alpha=1e-4, random_state=42),
+    'nb': lambda: MultinomialNB()
+}
+
+FICHIER_POINT_CONTROLE = 'point_controle.json'
+# Publications apprises : « id<TAB>empreinte<TAB>sentiment » par ligne
+FICHIER_APPRISES = 'publications_apprises.tsv'
+
+
+def empreinte_fichier(chemin):
+    """Empreinte SHA-256 du contenu d'un fichier"""
+    empreinte = hashlib.sha256()
+    with open(chemin, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 20), b''):
+            empreinte.update(bloc)
+    return empreinte.hexdigest()
+
+
+class EntraineurIncremental(EntraineurSentiment):
+    """Met à jour le modèle de sentiment avec les nouvelles annotations"""
+    
+    def __init__(self, modele='sgd', passes=5, export='pickle', remplacer_modele=False):
+        """
+        Args:
+            modele: Estimateur incrémental ('sgd' ou 'nb')
+            passes: Nombre de passages de partial_fit sur chaque lot (SGD)
+            export: Format du modèle sauvegardé ('pickle' ou 'compact')
+            remplacer_modele: Écrire aussi modele_sentiment (relu par 06_Evaluation)
+        """
+        super().__init__(n_jobs=1, export=export)
+        self.type_modele = modele
+        self.passes = passes if modele == 'sgd' else 1
+        self.remplacer_modele = remplacer_modele
+        self.dossier_points = self.script_dir / 'points_controle'
+        self.chemin_vectoriseur = self.projet_dir / '04_Vectorisation' / 'vectoriseur.pkl'
+    
+    def dernier_point_controle(self):
+        """(dossier, métadonnées) du point de contrôle le plus récent, ou (None, None)"""
+        versions = sorted(self.dossier_points.glob('v[0-9]*'))
+        versions = [dossier for dossier in versions if (dossier / FICHIER_POINT_CONTROLE).exists()]
+        if not versions:
+            return None, None
+        with open(versions[-1] / FICHIER_POINT_CONTROLE, 'r', encoding='utf-8') as f:
+            return versions[-1], json.load(f)
+    
+    @staticmethod
+    def charger_apprises(dossier):
+        """Publications apprises d'un point de contrôle : {(id, empreinte): sentiment}"""
+        apprises = {}
+        with open(dossier / FICHIER_APPRISES, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                id_pub, empreinte, sentiment = ligne.rstrip('\n').split('\t')
+                apprises[(id_pub, empreinte)] = sentiment
+        return apprises
+    
+    def charger_nouvelles_annotations(self, apprises=None):
+        """
+        Publications annotées absentes des publications apprises, ou réannotées
+        
+        Args:
+            apprises: {(id, empreinte): sentiment} du dernier point de contrôle (None : toutes)
+        
+        Returns:
+            DataFrame des publications (colonnes cle et ancien_sentiment en plus,
+            ancien_sentiment vide pour une publication nouvelle), trié par date
+            d'annotation
+        """
+        apprises = apprises or {}
+        chemin_donnees = resoudre_corpus(self.projet_dir / '02_Annotation' / 'uvbf_data_annote.json')
+        colonnes = COLONNES_UTILES + ['date_annotation']
+        # Une clé annotée deux fois dans le fichier : seule la dernière annotation compte
+        dernieres = {}
+        for item in lire_corpus(chemin_donnees):
+            if 'sentiment' not in item:
+                continue
+            cle = (str(item.get('id')), empreinte_texte(item.get('texte', '')))
+            if cle not in dernieres or (item.get('date_annotation') or '') >= (dernieres[cle].get('date_annotation') or ''):
+                dernieres[cle] = item
+        
+        nouvelles = [
+            {**{c: item[c] for c in colonnes if c in item}, 'cle': cle, 'ancien_sentiment': apprises.get(cle, '')}
+            for cle, item in dernieres.items()
+            if apprises.get(cle) != item['sentiment']
+        ]
+        df = pd.DataFrame(nouvelles)
+        if len(df) == 0:
+            return df
+        df['date_annotation'] = df.get('date_annotation', pd.Series('', index=df.index)).fillna('')
+        return df.sort_values('date_annotation', kind='stable').reset_index(drop=True)
+    
+    @staticmethod
+    def retirer_exemples(modele, X, y):
+        """
+        Retire des exemples déjà appris des comptes d'un MultinomialNB
+        
+        Returns:
+            True si le modèle a été corrigé, False s'il ne sait pas oublier (SGD)
+        """
+        if not isinstance(modele, MultinomialNB):
+            return False
+        for classe in np.unique(y):
+            lignes = X[y == classe]
+            modele.feature_count_[classe] -= np.asarray(lignes.sum(axis=0)).ravel()
+            modele.class_count_[classe] -= lignes.shape[0]
+        np.maximum(modele.feature_count_, 0, out=modele.feature_count_)
+        modele._update_feature_log_prob(modele._check_alpha())
+        modele._update_class_log_prior()
+        return True
+    
+    def mettre_a_jour(self, reinitialiser=False):
+        """
+        Apprend les publications nouvelles ou réannotées depuis le dernier point de contrôle
+        
+        Args:
+            reinitialiser: Ignorer les points de contrôle et repartir de zéro
+        
+        Returns:
+            Métadonnées du nouveau point de contrôle (None si rien à apprendre)
+        """
+        debut = time.time()
+        dossier, point = self.dernier_point_controle()
+        version = (point['version'] + 1) if point else 1
+        if reinitialiser:
+            dossier, point = None, None
+        empreinte_vectoriseur = empreinte_fichier(self.chemin_vectoriseur)
+        
+        if point is not None:
+            if point['empreinte_vectoriseur'] != empreinte_vectoriseur:
+                print("❌ vectoriseur.pkl a changé depuis le dernier point de contrôle "
+                      f"({dossier.name}) : relancez avec --reinitialiser")
+                return None
+            if point['modele'] != self.type_modele:
+                print(f"❌ Le point de contrôle {dossier.name} est un modèle '{point['modele']}' : "
+                      f"relancez avec --modele {point['modele']} ou --reinitialiser")
+                return None
+            if not (dossier / FICHIER_APPRISES).exists():
+                print(f"❌ Le point de contrôle {dossier.name} ne liste pas ses publications apprises : "
+                      "relancez avec --reinitialiser")
+                return None
+            modele = joblib.load(dossier / 'modele.pkl')
+            self.encodeur = joblib.load(dossier / 'encodeur.pkl')
+            apprises = self.charger_apprises(dossier)
+            print(f"✓ Point de contrôle {dossier.name} : {len(apprises)} publications apprises, "
+                  f"dernière annotation {point['date_derniere_annotation']}")
+        else:
+            modele = MODELES_INCREMENTAUX[self.type_modele]()
+            apprises = {}
+            print(f"✓ Nouvelle chaîne de points de contrôle ({type(modele).__name__})")
+        
+        df = self.charger_nouvelles_annotations(apprises)
+        if len(df) == 0:
+            print("✓ Aucune nouvelle annotation : modèle inchangé")
+            return None
+        reannotees = df['ancien_sentiment'] != ''
+        print(f" {len(df)} publications à apprendre, dont {int(reannotees.sum())} réannotées")
+        
+        if point is None:
+            self.encodeur = LabelEncoder().fit(df['sentiment'])
+        inconnus = sorted(set(df['sentiment']) - set(self.encodeur.classes_))
+        if inconnus:
+            print(f"❌ Sentiments absents du point de contrôle : {inconnus} ; relancez avec --reinitialiser")
+            return None
+        
+        # Le vectoriseur n'est utilisé qu'en transform (lignes de l'étape 4 reprises si possible)
+        self.vectoriseur = vectoriseur = joblib.load(self.chemin_vectoriseur)
+        X = self.matrice_alignee(df, vectoriseur)
+        y = self.encodeur.transform(df['sentiment'])
+        
+        # Validation progressive : le lot est prédit avant d'être appris
+        exactitude_avant = float(modele.score(X, y)) if point is not None else None
+        
+        # Publications réannotées : retirer l'ancien sentiment avant d'apprendre le nouveau
+        if reannotees.any():
+            anciens = self.encodeur.transform(df.loc[reannotees, 'ancien_sentiment'])
+            if not self.retirer_exemples(modele, X[np.flatnonzero(reannotees)], anciens):
+                print(f"⚠️  {type(modele).__name__} ne peut pas oublier l'ancien sentiment de "
+                      f"{int(reannotees.sum())} publications réannotées : --reinitialiser pour un modèle exact")
+        
+        generateur = np.random.default_rng(42)
+        classes = np.arange(len(self.encodeur.classes_))
+        for _ in range(self.passes):
+            ordre = generateur.permutation(len(y)) if self.passes > 1 else np.arange(len(y))
+            modele.partial_fit(X[ordre], y[ordre], classes=classes)
+        duree = time.time() - debut
+        
+        nouveau = {
+            'version': version,
+            'date': datetime.now().isoformat(),
+            'modele': self.type_modele,
+            'classes': list(self.encodeur.classes_),
+            'publications': len(apprises) + int((~reannotees).sum()),
+            'nouvelles_publications': int((~reannotees).sum()),
+            'publications_reannotees': int(reannotees.sum()),
+            'date_derniere_annotation': df['date_annotation'].iloc[-1],
+            'exactitude_avant_mise_a_jour': exactitude_avant,
+            'exactitude_apres_mise_a_jour': float(modele.score(X, y)),
+            'empreinte_vectoriseur': empreinte_vectoriseur,
+            'precedent': dossier.name if dossier else None,
+            'duree_secondes': round(duree, 3)
+        }
+        apprises.update(zip(df['cle'], df['sentiment']))
+        self.sauvegarder_point_controle(modele, nouveau, apprises)
+        
+        self.meilleur_modele = modele
+        self.sauvegarder_modele_incremental()
+        if self.remplacer_modele:
+            self.sauvegarder_modele()
+        
+        if exactitude_avant is not None:
+            print(f"  Exactitude sur le lot avant mise à jour : {exactitude_avant:.2%}")
+        print(f"  Exactitude sur le lot après mise à jour : {nouveau['exactitude_apres_mise_a_jour']:.2%}")
+        print(f"✓ Modèle mis à jour en {duree:.2f} s ({nouveau['publications']} publications apprises)")
+        return nouveau
+    
+    def sauvegarder_point_controle(self, modele, metadonnees, apprises):
+        """Écrit points_controle/vNNNN/ (modèle, encodeur, publications apprises, point_controle.json)"""
+        dossier = self.dossier_points / f"v{metadonnees['version']:04d}"
+        temporaire = self.dossier_points / f".{dossier.name}.tmp"
+        temporaire.mkdir(parents=True, exist_ok=True)
+        
+        joblib.dump(modele, temporaire / 'modele.pkl')
+        joblib.dump(self.encodeur, temporaire / 'encodeur.pkl')
+        with open(temporaire / FICHIER_APPRISES, 'w', encoding='utf-8') as f:
+            f.writelines(f"{id_pub}\t{empreinte}\t{sentiment}\n"
+                         for (id_pub, empreinte), sentiment in apprises.items())
+        with open(temporaire / FICHIER_POINT_CONTROLE, 'w', encoding='utf-8') as f:
+            json.dump(metadonnees, f, ensure_ascii=False, indent=2)
+        
+        # Un point de contrôle n'apparaît qu'une fois complet
+        temporaire.replace(dossier)
+        print(f"\n✓ Point de contrôle : {dossier}")
+    
+    def sauvegarder_modele_incremental(self):
+        """Écrit modele_incremental (pickle ou export compact) et encodeur_incremental.pkl"""
+        chemin = self.script_dir / 'modele_incremental.pkl'
+        if self.export == 'compact':
+            try:
+                exporter_modele_compact(self.meilleur_modele, self.encodeur, self.vectoriseur,
+                                        self.script_dir / 'modele_incremental.npz')
+                chemin = self.script_dir / 'modele_incremental.npz'
+            except ValueError as erreur:
+                print(f"\n⚠️  {erreur} : sauvegarde en pickle")
+        if chemin.suffix == '.pkl':
+            joblib.dump(self.meilleur_modele, chemin)
+        joblib.dump(self.encodeur, self.script_dir / 'encodeur_incremental.pkl')
+        
+        print(f"\n✓ Modèle incrémental sauvegardé : {chemin}")
+        if not self.remplacer_modele:
+            print("  (modele_sentiment inchangé : --remplacer-modele pour l'évaluer avec 06_Evaluation)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mise à jour incrémentale du modèle de sentiment")
+    parser.add_argument('--modele', choices=sorted(MODELES_INCREMENTAUX), default='sgd',
+                        help="sgd : SGDClassifier (log_loss) ; nb : MultinomialNB")
+    parser.add_argument('--passes', type=int, default=5,
+                        help="Passages de partial_fit sur chaque lot (SGD)")
+    parser.add_argument('--reinitialiser', action='store_true',
+                        help="Ignorer les points de contrôle et apprendre toutes les annotations")
+    parser.add_argument('--export', choices=['pickle', 'compact'], default='pickle',
+                        help="Format du modèle sauvegardé (voir entrainement.py)")
+    parser.add_argument('--remplacer-modele', action='store_true',
+                        help="Remplacer aussi modele_sentiment (modèle choisi par entrainement.py)")
+    args = parser.parse_args()
+    
+    print("\n" + "="*70)
+    print("ENTRAÎNEMENT INCRÉMENTAL - CLASSIFICATION DE SENTIMENTS UVBF")
+    print("="*70)
+    
+    entraineur = EntraineurIncremental(modele=args.modele, passes=args.passes, export=args.export,
+                                       remplacer_modele=args.remplacer_modele)
+    entraineur.mettre_a_jour(reinitialiser=args.reinitialiser)
+
+
+if __name__ == "__main__":
+    main()
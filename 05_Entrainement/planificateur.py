@@ -0,0 +1,116 @@
+"""
+Entraînement parallèle des modèles et de leurs plis de validation croisée
+
+Chaque modèle donne 1 + k tâches indépendantes : l'ajustement sur tout
+l'ensemble d'entraînement et un ajustement par pli. Toutes les tâches de tous
+les modèles sont réparties sur un pool de processus (joblib/loky) de
+n_jobs workers, au lieu d'enchaîner modèle.fit puis cross_val_score(cv=5).
+
+Les plis viennent d'un GestionnairePlis (mêmes indices que cross_val_score)
+et chaque tâche ajuste un clone du modèle avec son random_state : les scores
+sont identiques à l'exécution en série, quel que soit le nombre de workers.
+Les tâches déjà présentes dans le cache du gestionnaire ne sont pas relancées.
+"""
+
+import time
+import warnings
+
+from joblib import Parallel, delayed
+from sklearn.base import clone
+
+from plis import cle_modele
+
+
+def _executer_tache(nom, pli, modele, X_train, y_train, X_test=None, y_test=None):
+    """
+    Ajuste un clone du modèle (exécuté dans un worker)
+    
+    Returns:
+        (nom, pli, résultat, début, fin) ; pour l'ajustement complet (pli None),
+        le résultat contient le modèle ajusté et son score d'entraînement
+    """
+    # Les workers n'héritent pas du filtre de warnings d'entrainement.py
+    warnings.filterwarnings('ignore')
+    
+    debut = time.time()
+    modele = clone(modele).fit(X_train, y_train)
+    if pli is None:
+        resultat = {'modele': modele, 'score': modele.score(X_train, y_train)}
+    else:
+        resultat = {
+            'score': modele.score(X_test, y_test),
+            'predictions': modele.predict(X_test),
+            'probabilites': modele.predict_proba(X_test) if hasattr(modele, 'predict_proba') else None,
+            # Scores bruts des modèles sans predict_proba (LinearSVC, SGD hinge)
+            'decisions': (modele.decision_function(X_test)
+                          if not hasattr(modele, 'predict_proba') and hasattr(modele, 'decision_function')
+                          else None),
+            'classes': modele.classes_
+        }
+    return nom, pli, resultat, debut, time.time()
+
+
+class PlanificateurEntrainement:
+    """Répartit ajustements et plis de validation croisée sur un pool de processus"""
+    
+    def __init__(self, plis, n_jobs=-1):
+        """
+        Args:
+            plis: GestionnairePlis partagé (plis, découpes et cache des résultats)
+            n_jobs: Nombre de processus workers (-1 : tous les cœurs, 1 : en série)
+        """
+        self.plis = plis
+        self.n_jobs = n_jobs
+    
+    def executer(self, modeles, ajuster_complet=True):
+        """
+        Entraîne et valide tous les modèles
+        
+        Args:
+            modeles: Dictionnaire {nom: estimateur non ajusté}
+            ajuster_complet: Ajuster aussi chaque modèle sur tout l'ensemble d'entraînement
+        
+        Returns:
+            Dictionnaire {nom: {'modele', 'score_train', 'cv_scores', 'temps_mur',
+            'temps_calcul', 'taches'}} ; 'taches' compte les ajustements réellement lancés
+        """
+        plis = self.plis
+        taches = []
+        for nom, modele in modeles.items():
+            cle = cle_modele(modele)
+            if ajuster_complet and cle not in plis.modeles_complets:
+                taches.append((nom, None, modele, (plis.X, plis.y)))
+            taches.extend((nom, i, modele, plis.donnees_pli(i))
+                          for i in range(len(plis)) if (cle, i) not in plis.resultats)
+        
+        sorties = Parallel(n_jobs=self.n_jobs)(
+            delayed(_executer_tache)(nom, pli, modele, *donnees)
+            for nom, pli, modele, donnees in taches
+        ) if taches else []
+        
+        durees = {nom: {'debuts': [], 'fins': [], 'temps_calcul': 0.0} for nom in modeles}
+        for nom, pli, resultat, debut, fin in sorties:
+            cle = cle_modele(modeles[nom])
+            if pli is None:
+                plis.modeles_complets[cle] = (resultat['modele'], resultat['score'])
+            else:
+                plis.resultats[(cle, pli)] = resultat
+            durees[nom]['debuts'].append(debut)
+            durees[nom]['fins'].append(fin)
+            durees[nom]['temps_calcul'] += fin - debut
+        
+        resultats = {}
+        for nom, modele in modeles.items():
+            duree = durees[nom]
+            modele_complet, score_train = plis.modeles_complets.get(cle_modele(modele), (None, None))
+            resultats[nom] = {
+                'modele': modele_complet,
+                'score_train': score_train,
+                'cv_scores': plis.scores(modele),
+                # Temps mur : du début de la première tâche du modèle à la fin de la dernière
+                'temps_mur': max(duree['fins']) - min(duree['debuts']) if duree['fins'] else 0.0,
+                'temps_calcul': duree['temps_calcul'],
+                'taches': len(duree['fins'])
+            }
+        
+        return resultats
@@ -0,0 +1,103 @@
+"""
+Plis de validation croisée partagés entre entraînement et optimisation
+
+Les plis sont calculés une seule fois (mêmes indices que cross_val_score) et
+les matrices CSR découpées pour chaque pli sont gardées en mémoire. Les
+résultats de chaque ajustement sur un pli (score, prédictions, probabilités)
+sont mis en cache par modèle et paramètres : un candidat de la recherche
+d'hyperparamètres identique à un modèle déjà validé n'est pas réajusté.
+
+Les prédictions hors-pli (out-of-fold) de chaque modèle couvrent tout
+l'ensemble d'entraînement ; elles servent au stacking ou à la calibration
+sans nouvel ajustement.
+"""
+
+from collections.abc import Hashable
+
+import numpy as np
+from sklearn.model_selection import check_cv
+
+
+def cle_modele(modele):
+    """Clé de cache d'un estimateur : sa classe et ses paramètres"""
+    parametres = modele.get_params(deep=False)
+    return (type(modele).__name__,
+            tuple(sorted((nom, valeur if isinstance(valeur, Hashable) else repr(valeur))
+                         for nom, valeur in parametres.items())))
+
+
+class GestionnairePlis:
+    """Plis de validation croisée, matrices découpées et résultats par pli"""
+    
+    def __init__(self, X, y, cv=5):
+        """
+        Args:
+            X: Matrice d'entraînement
+            y: Labels encodés
+            cv: Nombre de plis ou objet de validation croisée scikit-learn
+        """
+        self.X = X
+        self.y = np.asarray(y)
+        self.plis = list(check_cv(cv, self.y, classifier=True).split(X, self.y))
+        self.classes = np.unique(self.y)
+        
+        self._decoupes = {}
+        self.resultats = {}         # (clé modèle, pli) -> {'score', 'predictions', 'probabilites', 'decisions', 'classes'}
+        self.modeles_complets = {}  # clé modèle -> (modèle ajusté sur tout X, score d'entraînement)
+    
+    def __len__(self):
+        return len(self.plis)
+    
+    def donnees_pli(self, i):
+        """(X_train, y_train, X_test, y_test) du pli i, découpés une seule fois"""
+        if i not in self._decoupes:
+            train, test = self.plis[i]
+            self._decoupes[i] = (self.X[train], self.y[train], self.X[test], self.y[test])
+        return self._decoupes[i]
+    
+    def scores(self, modele):
+        """Scores de validation croisée d'un modèle (None si un pli manque)"""
+        cle = cle_modele(modele)
+        if not all((cle, i) in self.resultats for i in range(len(self))):
+            return None
+        return np.array([self.resultats[(cle, i)]['score'] for i in range(len(self))])
+    
+    def predictions_hors_pli(self, modele):
+        """
+        Prédictions et probabilités hors-pli alignées sur les lignes de X
+        
+        Returns:
+            (predictions, probabilites) ; probabilites vaut None si le modèle
+            n'a pas de predict_proba
+        """
+        cle = cle_modele(modele)
+        predictions = np.empty(len(self.y), dtype=self.y.dtype)
+        for i, (_, test) in enumerate(self.plis):
+            predictions[test] = self.resultats[(cle, i)]['predictions']
+        
+        return predictions, self._sorties_hors_pli(cle, 'probabilites')
+    
+    def decisions_hors_pli(self, modele):
+        """
+        Scores decision_function hors-pli (lignes de X x classes)
+        
+        Returns:
+            Matrice des scores, ou None si le modèle a predict_proba ou n'a
+            pas de decision_function
+        """
+        return self._sorties_hors_pli(cle_modele(modele), 'decisions')
+    
+    def _sorties_hors_pli(self, cle, champ):
+        """Sorties par classe ('probabilites' ou 'decisions') des plis, None si un pli n'en a pas"""
+        sorties = np.zeros((len(self.y), len(self.classes)))
+        for i, (_, test) in enumerate(self.plis):
+            resultat = self.resultats[(cle, i)]
+            valeurs = resultat.get(champ)
+            if valeurs is None:
+                return None
+            if valeurs.ndim == 1:
+                # decision_function binaire : un seul score, celui de la seconde classe
+                valeurs = np.column_stack([-valeurs, valeurs])
+            colonnes = np.searchsorted(self.classes, resultat['classes'])
+            sorties[np.ix_(test, colonnes)] = valeurs
+        return sorties
@@ -2,14 +2,19 @@
 Évaluation du Modèle de Classification de Sentiments
 """
 
+import sys
 import joblib
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.artefacts import charger_artefact
+from outils.modele_compact import charger_modele_compact
+from outils.evaluation import matrice_confusion, metriques, rapport_texte, rapport_dataframe
+
 
 def charger_modele_et_donnees():
     """Charge le modèle et les données de test"""
@@ -18,62 +23,68 @@ def charger_modele_et_donnees():
     
     print("Chargement du modèle et des données...")
     
-    # Charger le modèle et l'encodeur
-    modele = joblib.load(script_dir / 'modele_sentiment.pkl')
+    # Charger le modèle (le plus récent du pickle et de l'export compact) et l'encodeur
+    exports = [chemin for chemin in (script_dir / 'modele_sentiment.pkl', script_dir / 'modele_sentiment.npz')
+               if chemin.exists()]
+    chemin_modele = max(exports, key=lambda chemin: chemin.stat().st_mtime)
+    if chemin_modele.suffix == '.npz':
+        modele = charger_modele_compact(chemin_modele)
+    else:
+        modele = joblib.load(chemin_modele)
     encodeur = joblib.load(script_dir / 'encodeur_sentiment.pkl')
     
-    # Charger les données de test
-    X_test = joblib.load(projet_dir / '05_Entrainement' / 'resultats' / 'X_test.pkl')
-    y_test = joblib.load(projet_dir / '05_Entrainement' / 'resultats' / 'y_test.pkl')
+    # Ouvrir les données de test sans copie, après vérification des empreintes
+    dossier_resultats = projet_dir / '05_Entrainement' / 'resultats'
+    X_test = charger_artefact(dossier_resultats, 'X_test')
+    y_test = charger_artefact(dossier_resultats, 'y_test')
     
-    print(f"✓ Modèle chargé")
+    print(f"✓ Modèle chargé : {chemin_modele.name}")
     print(f"✓ Classes : {list(encodeur.classes_)}")
     
     return modele, encodeur, X_test, y_test
 
 
 def evaluer_modele(modele, encodeur, X_test, y_test):
-    """Évalue le modèle"""
+    """
+    Évalue le modèle
+    
+    Les prédictions sont calculées une fois ; la matrice de confusion qui en
+    découle sert au rapport affiché, à la figure et au CSV.
+    
+    Returns:
+        Matrice de confusion et noms des classes
+    """
     print("\n" + "="*70)
     print("ÉVALUATION DU MODÈLE")
     print("="*70)
     
-    # Prédictions
+    # Prédictions et matrice de confusion (classes encodées)
+    classes = encodeur.classes_
     y_pred = modele.predict(X_test)
-    
-    # Convertir en labels textuels
-    y_test_labels = encodeur.inverse_transform(y_test)
-    y_pred_labels = encodeur.inverse_transform(y_pred)
+    matrice = matrice_confusion(y_test, y_pred, len(classes))
     
     # Exactitude
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"\n✓ Exactitude globale : {accuracy:.2%}")
+    print(f"\n✓ Exactitude globale : {metriques(matrice)['exactitude']:.2%}")
     
     # Rapport de classification
     print("\n" + "-"*70)
     print("MÉTRIQUES DÉTAILLÉES PAR CLASSE")
     print("-"*70)
-    print(classification_report(
-        y_test_labels, y_pred_labels,
-        target_names=encodeur.classes_,
-        zero_division=0
-    ))
+    print(rapport_texte(matrice, classes))
     
-    return y_test_labels, y_pred_labels, encodeur.classes_
+    return matrice, classes
 
 
-def creer_matrice_confusion(y_test, y_pred, classes):
-    """Crée et sauvegarde la matrice de confusion"""
+def creer_matrice_confusion(matrice, classes):
+    """Sauvegarde la matrice de confusion et les métriques qui en découlent"""
     script_dir = Path(__file__).parent
     dossier_resultats = script_dir / 'resultats_evaluation'
     dossier_resultats.mkdir(exist_ok=True)
     
     print("\nGénération de la matrice de confusion...")
     
-    cm = confusion_matrix(y_test, y_pred, labels=classes)
-    
     plt.figure(figsize=(10, 8))
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
+    sns.heatmap(matrice, annot=True, fmt='d', cmap='Blues',
                 xticklabels=classes, yticklabels=classes)
     plt.title('Matrice de Confusion - Analyse de Sentiment UVBF', fontsize=14, fontweight='bold')
     plt.ylabel('Vérité Terrain', fontsize=12)
@@ -87,9 +98,7 @@ def creer_matrice_confusion(y_test, y_pred, classes):
     print(f"✓ Matrice sauvegardée : {chemin}")
     
     # Sauvegarder aussi les métriques
-    rapport_dict = classification_report(y_test, y_pred, target_names=classes, output_dict=True, zero_division=0)
-    df_rapport = pd.DataFrame(rapport_dict).transpose()
-    df_rapport.to_csv(dossier_resultats / 'rapport_metriques.csv')
+    rapport_dataframe(matrice, classes).to_csv(dossier_resultats / 'rapport_metriques.csv')
     
     print(f"✓ Métriques sauvegardées : {dossier_resultats}/rapport_metriques.csv")
 
@@ -103,10 +112,10 @@ def main():
     modele, encodeur, X_test, y_test = charger_modele_et_donnees()
     
     # Évaluer
-    y_test_labels, y_pred_labels, classes = evaluer_modele(modele, encodeur, X_test, y_test)
+    matrice, classes = evaluer_modele(modele, encodeur, X_test, y_test)
     
     # Matrice de confusion
-    creer_matrice_confusion(y_test_labels, y_pred_labels, classes)
+    creer_matrice_confusion(matrice, classes)
     
     print("\n" + "="*70)
     print("✅ ÉVALUATION TERMINÉE")
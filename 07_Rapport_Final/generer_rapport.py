@@ -2,12 +2,17 @@
 Génération du Rapport Final du Projet
 """
 
+import sys
 import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.colonnes import charger_colonnes
+
 
 class GenerateurRapport:
     """Générateur de rapport final"""
@@ -27,20 +32,19 @@ class GenerateurRapport:
         """Analyse les données et annotations"""
         print("\n📊 Analyse des données...")
         
-        # Données annotées
+        # Données annotées : seule la colonne sentiment est lue
         chemin = self.projet_dir / '02_Annotation' / 'uvbf_data_annote.json'
-        with open(chemin, 'r', encoding='utf-8') as f:
-            donnees = json.load(f)
-        
-        donnees_annotees = [d for d in donnees if 'sentiment' in d]
-        df = pd.DataFrame(donnees_annotees)
+        df = charger_colonnes(chemin, ['sentiment'])
+        total = len(df)
+        sentiments = df['sentiment'].dropna()
+        annotees = len(sentiments)
         
         # Statistiques
-        stats = df['sentiment'].value_counts(normalize=True) * 100
+        stats = sentiments.value_counts(normalize=True) * 100
         
         self.rapport['sections']['donnees'] = {
-            'total': len(donnees),
-            'annotees': len(donnees_annotees),
+            'total': total,
+            'annotees': annotees,
             'sentiments': {
                 'positif': float(stats.get('positif', 0)),
                 'negatif': float(stats.get('negatif', 0) + stats.get('négatif', 0)),
@@ -48,7 +52,7 @@ class GenerateurRapport:
             }
         }
         
-        print(f"  ✓ {len(donnees_annotees)} publications annotées")
+        print(f"  ✓ {annotees} publications annotées")
         print(f"  ✓ Positif: {stats.get('positif', 0):.1f}%")
         print(f"  ✓ Négatif: {stats.get('negatif', 0) + stats.get('négatif', 0):.1f}%")
     
@@ -59,7 +63,11 @@ class GenerateurRapport:
         chemin = self.projet_dir / '05_Entrainement' / 'resultats' / 'comparaison_modeles.csv'
         if chemin.exists():
             df = pd.read_csv(chemin)
-            meilleur = df.loc[df['Score Test'].idxmax()]
+            # Modèle retenu par l'étape 5 (bootstrap), sinon meilleur score de test
+            if 'Retenu' in df.columns and df['Retenu'].any():
+                meilleur = df.loc[df['Retenu'].idxmax()]
+            else:
+                meilleur = df.loc[df['Score Test'].idxmax()]
             
             self.rapport['sections']['performance'] = {
                 'meilleur_modele': str(meilleur['Modèle']),
@@ -0,0 +1,126 @@
+"""
+Benchmark de l'inférence BERT sur CPU : fp32 vs int8 dynamique, par nombre de threads
+
+Sur les publications annotées :
+- débit (textes/s, jetons/s) de generer_embeddings_bert pour chaque nombre de threads ;
+- latence d'une publication seule (médiane et 95e centile) ;
+- taille des poids du modèle ;
+- parité : régression logistique entraînée sur les embeddings fp32 puis int8
+  (même division que preparer_donnees), exactitude de test, accord des
+  prédictions et similarité cosinus des embeddings.
+
+Utilisation :
+    python ameliorations/benchmark_cpu_bert.py
+    python ameliorations/benchmark_cpu_bert.py --threads 1 2 4 --tolerance 0.02
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import torch
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sentiment_bert import ClassificateurBERT, BERT_AVAILABLE, configurer_threads
+
+
+def taille_poids_mo(modele):
+    """Taille du state_dict sérialisé, en Mo"""
+    tampon = io.BytesIO()
+    torch.save(modele.state_dict(), tampon)
+    return tampon.tell() / 2**20
+
+
+def latences_ms(classificateur, textes):
+    """Latence d'inférence de chaque texte seul (tokenisation comprise), en millisecondes"""
+    mesures = []
+    for texte in textes:
+        debut = time.perf_counter()
+        encode = classificateur.tokenizer(texte, truncation=True, max_length=classificateur.longueur_max,
+                                          return_tensors='pt')
+        with torch.inference_mode():
+            classificateur.modele_bert(**encode)
+        mesures.append((time.perf_counter() - debut) * 1000)
+    return np.median(mesures), np.percentile(mesures, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, nargs='+', default=sorted({1, os.cpu_count()}),
+                        help="Nombres de threads intra-opération à mesurer")
+    parser.add_argument('--latence', type=int, default=50, help="Publications mesurées une par une")
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help="Perte d'exactitude de test tolérée pour int8")
+    args = parser.parse_args()
+    
+    if not BERT_AVAILABLE:
+        print("❌ Bibliothèque transformers non installée")
+        print("Installation : pip install transformers torch")
+        return 1
+    
+    chemin_donnees = Path(__file__).resolve().parent.parent / '02_Annotation' / 'uvbf_data_annote.json'
+    variantes = {'fp32': ClassificateurBERT(chemin_donnees, cache=False)}
+    variantes['int8'] = ClassificateurBERT(chemin_donnees, cache=False, int8=True)
+    
+    df = variantes['fp32'].charger_donnees()
+    textes = variantes['fp32'].extraire_textes(df)
+    y = variantes['fp32'].encodeur.fit_transform(df['sentiment'])
+    indices_train, indices_test = train_test_split(
+        np.arange(len(textes)), test_size=0.2, random_state=42, stratify=y
+    )
+    
+    mesures = {}
+    embeddings = {}
+    for nom, classificateur in variantes.items():
+        for threads in args.threads:
+            configurer_threads(threads)
+            embeddings[nom] = classificateur.generer_embeddings_bert(textes)
+            stats = classificateur.statistiques_lots
+            mesures[nom, threads] = (len(textes) / stats['temps'], stats['jetons'] / stats['temps'],
+                                     *latences_ms(classificateur, textes[:args.latence]))
+    
+    print("\n" + "="*78)
+    print("BENCHMARK BERT CPU")
+    print("="*78)
+    print(f"{len(textes)} textes, {os.cpu_count()} cœurs")
+    for nom, classificateur in variantes.items():
+        print(f"Poids {nom} : {taille_poids_mo(classificateur.modele_bert):.0f} Mo")
+    
+    print(f"\n{'':<6} {'threads':>7} {'textes/s':>9} {'jetons/s':>9} {'latence méd.':>13} {'p95':>9}")
+    for (nom, threads), (textes_s, jetons_s, mediane, p95) in mesures.items():
+        print(f"{nom:<6} {threads:>7} {textes_s:>9.1f} {jetons_s:>9.0f} {mediane:>10.1f} ms {p95:>6.1f} ms")
+    
+    # Parité du classifieur en aval
+    print("\nRégression logistique sur les embeddings :")
+    predictions = {}
+    for nom, X in embeddings.items():
+        modele = LogisticRegression(max_iter=1000, random_state=42)
+        modele.fit(X[indices_train], y[indices_train])
+        predictions[nom] = modele.predict(X[indices_test])
+        print(f"  {nom} : exactitude de test {np.mean(predictions[nom] == y[indices_test]):.2%}")
+    
+    normes = np.linalg.norm(embeddings['fp32'], axis=1) * np.linalg.norm(embeddings['int8'], axis=1)
+    cosinus = np.sum(embeddings['fp32'] * embeddings['int8'], axis=1) / normes
+    print(f"  Accord des prédictions : {np.mean(predictions['fp32'] == predictions['int8']):.2%}")
+    print(f"  Similarité cosinus fp32/int8 : moyenne {cosinus.mean():.4f}, minimum {cosinus.min():.4f}")
+    
+    perte = np.mean(predictions['fp32'] == y[indices_test]) - np.mean(predictions['int8'] == y[indices_test])
+    parite = perte <= args.tolerance
+    if parite:
+        print(f"\n✓ Parité : int8 perd {max(perte, 0):.2%} d'exactitude (tolérance {args.tolerance:.0%})")
+    else:
+        print(f"\n❌ int8 perd {perte:.2%} d'exactitude (tolérance {args.tolerance:.0%})")
+    print("="*78)
+    return 0 if parite else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
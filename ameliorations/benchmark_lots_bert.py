@@ -0,0 +1,80 @@
+"""
+Benchmark des lots BERT : lots fixes de 16 vs lots bornés par un budget de jetons
+
+Sur les publications annotées : nombre de lots, part de padding, temps,
+jetons utiles par seconde, et écart maximal entre les embeddings des deux
+découpages (chaque embedding doit revenir à l'indice de son texte).
+
+Utilisation :
+    python ameliorations/benchmark_lots_bert.py
+    python ameliorations/benchmark_lots_bert.py --budgets 4096 8192 16384
+    python ameliorations/benchmark_lots_bert.py --sans-modele   # padding seulement
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.lots_jetons import BUDGET_JETONS, planifier_lots, lots_fixes, statistiques_lots
+from sentiment_bert import ClassificateurBERT, BERT_AVAILABLE, charger_donnees_annotees, extraire_textes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budgets', type=int, nargs='+', default=[BUDGET_JETONS],
+                        help="Budgets de jetons par lot")
+    parser.add_argument('--sans-modele', action='store_true',
+                        help="Ne mesurer que le padding (tokenizer seul, pas d'inférence)")
+    args = parser.parse_args()
+    
+    if not BERT_AVAILABLE:
+        print("❌ Bibliothèque transformers non installée")
+        print("Installation : pip install transformers torch")
+        return 1
+    
+    chemin_donnees = Path(__file__).resolve().parent.parent / '02_Annotation' / 'uvbf_data_annote.json'
+    if args.sans_modele:
+        # Padding seulement : le tokenizer suffit, les poids de CamemBERT ne sont pas chargés
+        from transformers import CamembertTokenizer
+        classificateur = None
+        tokenizer = CamembertTokenizer.from_pretrained('camembert-base')
+    else:
+        classificateur = ClassificateurBERT(chemin_donnees, cache=False)
+        tokenizer = classificateur.tokenizer
+    textes = extraire_textes(charger_donnees_annotees(chemin_donnees))
+    longueurs = [len(ids) for ids in tokenizer(textes, truncation=True, max_length=512)['input_ids']]
+    
+    print("="*78)
+    print("BENCHMARK LOTS BERT")
+    print("="*78)
+    print(f"{len(textes)} textes, {sum(longueurs)} jetons (médiane {np.median(longueurs):.0f}, "
+          f"max {max(longueurs)})")
+    print(f"\n{'Découpage':<24} {'lots':>5} {'padding':>8} {'temps':>8} {'jetons/s':>9} {'écart max':>10}")
+    
+    decoupages = [('Fixes de 16 (avant)', None)] + [(f'Budget {budget}', budget) for budget in args.budgets]
+    reference = None
+    for libelle, budget in decoupages:
+        lots = lots_fixes(len(textes), 16) if budget is None else planifier_lots(longueurs, budget)
+        stats = statistiques_lots(longueurs, lots)
+        if args.sans_modele:
+            print(f"{libelle:<24} {stats['lots']:>5} {stats['part_padding']:>8.1%}")
+            continue
+        
+        embeddings = classificateur.generer_embeddings_bert(textes, budget_jetons=budget)
+        stats = classificateur.statistiques_lots
+        if reference is None:
+            reference = embeddings
+        print(f"{libelle:<24} {stats['lots']:>5} {stats['part_padding']:>8.1%} {stats['temps']:>6.1f} s "
+              f"{stats['jetons'] / stats['temps']:>9.0f} {np.abs(embeddings - reference).max():>10.2e}")
+    
+    print("="*78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
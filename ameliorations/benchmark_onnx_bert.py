@@ -0,0 +1,106 @@
+"""
+Benchmark des backends BERT : PyTorch vs ONNX Runtime (CPU)
+
+Chaque backend tourne dans un processus neuf (spawn) : démarrage (imports,
+tokenizer et modèle), pic mémoire, embeddings/s sur les publications
+annotées, et présence de torch dans le processus. L'export ONNX est fait
+avant les mesures (une seule fois, graphe gardé dans resultats_bert/onnx/).
+Les embeddings des deux backends sont comparés.
+
+Utilisation :
+    python ameliorations/benchmark_onnx_bert.py
+    python ameliorations/benchmark_onnx_bert.py --int8 --threads 4
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import importlib.util
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.foret import pic_memoire_mo
+
+CHEMIN_DONNEES = Path(__file__).resolve().parent.parent / '02_Annotation' / 'uvbf_data_annote.json'
+
+
+def mesurer(backend, int8, threads, sortie):
+    """Démarre un backend et encode le corpus (exécuté dans un processus neuf)"""
+    debut = time.perf_counter()
+    from sentiment_bert import ClassificateurBERT
+    classificateur = ClassificateurBERT(CHEMIN_DONNEES, cache=False, int8=int8, threads=threads,
+                                        backend=backend)
+    demarrage = time.perf_counter() - debut
+    memoire_demarrage = pic_memoire_mo()
+    
+    textes = classificateur.extraire_textes(classificateur.charger_donnees())
+    embeddings = classificateur.generer_embeddings_bert(textes)
+    np.save(sortie, embeddings)
+    return {
+        'demarrage': demarrage,
+        'memoire_demarrage': memoire_demarrage,
+        'pic_memoire': pic_memoire_mo(),
+        'debit': len(textes) / classificateur.statistiques_lots['temps'],
+        'torch': 'torch' in sys.modules
+    }
+
+
+def format_memoire(mo, largeur):
+    """Mémoire en Mo alignée sur la largeur, 'n/d' si indisponible (Windows)"""
+    if mo is None:
+        return f"{'n/d':>{largeur}}   "
+    return f"{mo:>{largeur}.0f} Mo"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--int8', action='store_true', help="Quantification int8 des deux backends")
+    parser.add_argument('--threads', type=int, default=None, help="Threads intra-opération")
+    args = parser.parse_args()
+    
+    for module in ('transformers', 'torch', 'onnxruntime'):
+        if importlib.util.find_spec(module) is None:
+            print(f"❌ Bibliothèque {module} non installée")
+            print("Installation : pip install transformers torch onnxruntime")
+            return 1
+    
+    contexte = multiprocessing.get_context('spawn')
+    resultats = {}
+    with tempfile.TemporaryDirectory() as dossier:
+        # Export ONNX hors mesures (processus jeté)
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexte) as pool:
+            pool.submit(mesurer, 'onnx', args.int8, args.threads, Path(dossier) / 'export.npy').result()
+        
+        embeddings = {}
+        for backend in ('torch', 'onnx'):
+            sortie = Path(dossier) / f'{backend}.npy'
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexte) as pool:
+                resultats[backend] = pool.submit(mesurer, backend, args.int8, args.threads, sortie).result()
+            embeddings[backend] = np.load(sortie)
+    
+    print("\n" + "="*78)
+    print(f"BENCHMARK BACKENDS BERT{' (int8)' if args.int8 else ''}")
+    print("="*78)
+    print(f"{'':<8} {'démarrage':>10} {'mémoire dém.':>13} {'pic mémoire':>12} {'embeddings/s':>13} {'torch':>6}")
+    for backend, mesure in resultats.items():
+        print(f"{backend:<8} {mesure['demarrage']:>8.1f} s {format_memoire(mesure['memoire_demarrage'], 9)} "
+              f"{format_memoire(mesure['pic_memoire'], 8)} {mesure['debit']:>13.1f} "
+              f"{'oui' if mesure['torch'] else 'non':>6}")
+    
+    ecart = np.abs(embeddings['torch'] - embeddings['onnx']).max()
+    normes = np.linalg.norm(embeddings['torch'], axis=1) * np.linalg.norm(embeddings['onnx'], axis=1)
+    cosinus = (np.sum(embeddings['torch'] * embeddings['onnx'], axis=1) / normes).min()
+    print(f"\nÉcart maximal des embeddings : {ecart:.2e}, similarité cosinus minimale : {cosinus:.5f}")
+    print("="*78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark des embeddings BERT : troncature x pooling
+
+Pour chaque longueur maximale, une seule passe du modèle sur les publications
+annotées donne les trois poolings (cls, moyenne, max). Pour chaque réglage :
+embeddings/s, part des textes tronqués, et régression logistique en aval
+(même division que preparer_donnees : score CV 5 plis et exactitude de test).
+
+Les réglages sont comparés comme les modèles de 05_Entrainement
+(outils/comparaison.py, choisir_modele) : parmi ceux que le bootstrap apparié
+du test ne distingue pas de la meilleure exactitude, le meilleur score CV est
+retenu, et le plus rapide de ces ex aequo est recommandé. L'exactitude de
+test n'est affichée qu'une fois, dans le tableau.
+
+Utilisation :
+    python ameliorations/benchmark_pooling_bert.py
+    python ameliorations/benchmark_pooling_bert.py --longueurs 32 64 128 512 --backend onnx
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split, cross_val_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.comparaison import comparer_modeles, choisir_modele, SEUIL_SIGNIFICATIVITE
+from sentiment_bert import ClassificateurBERT, BERT_AVAILABLE, POOLINGS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--longueurs', type=int, nargs='+', default=[32, 64, 128, 512],
+                        help="Longueurs maximales (jetons) à mesurer")
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch')
+    args = parser.parse_args()
+    
+    if not BERT_AVAILABLE:
+        print("❌ Bibliothèque transformers non installée")
+        print("Installation : pip install transformers torch")
+        return 1
+    
+    chemin_donnees = Path(__file__).resolve().parent.parent / '02_Annotation' / 'uvbf_data_annote.json'
+    classificateur = ClassificateurBERT(chemin_donnees, cache=False, backend=args.backend)
+    df = classificateur.charger_donnees()
+    textes = classificateur.extraire_textes(df)
+    y = classificateur.encodeur.fit_transform(df['sentiment'])
+    indices_train, indices_test = train_test_split(
+        np.arange(len(textes)), test_size=0.2, random_state=42, stratify=y
+    )
+    longueurs = np.array([len(ids) for ids in classificateur.tokenizer(textes)['input_ids']])
+    
+    reglages = []
+    correct = []
+    for longueur_max in args.longueurs:
+        embeddings = classificateur.generer_embeddings_bert(textes, poolings=POOLINGS, longueur_max=longueur_max)
+        debit = len(textes) / classificateur.statistiques_lots['temps']
+        for pooling, X in embeddings.items():
+            modele = LogisticRegression(max_iter=1000, random_state=42)
+            score_cv = cross_val_score(modele, X[indices_train], y[indices_train], cv=5).mean()
+            predictions = modele.fit(X[indices_train], y[indices_train]).predict(X[indices_test])
+            correct.append(predictions == y[indices_test])
+            reglages.append({
+                'nom': f"{pooling}/{longueur_max}",
+                'longueur_max': longueur_max,
+                'pooling': pooling,
+                'debit': debit,
+                'tronques': np.mean(longueurs > longueur_max),
+                'score_cv': score_cv,
+                'score_test': correct[-1].mean()
+            })
+    
+    intervalles, paires = comparer_modeles(np.stack(correct), [r['nom'] for r in reglages])
+    retenu, ex_aequo = choisir_modele(
+        paires,
+        {r['nom']: r['score_test'] for r in reglages},
+        {r['nom']: r['score_cv'] for r in reglages}
+    )
+    
+    print("\n" + "="*78)
+    print(f"BENCHMARK POOLING ET TRONCATURE ({args.backend})")
+    print("="*78)
+    print(f"{len(textes)} textes, longueur médiane {np.median(longueurs):.0f} jetons, "
+          f"99e centile {np.percentile(longueurs, 99):.0f}, max {longueurs.max()}")
+    print(f"\n{'Réglage':<14} {'emb./s':>8} {'tronqués':>9} {'CV':>7} {'test':>7} {'IC 95 %':>16} {'ex aequo':>9}")
+    for reglage, (_, intervalle) in zip(reglages, intervalles.iterrows()):
+        print(f"{reglage['nom']:<14} {reglage['debit']:>8.1f} {reglage['tronques']:>9.1%} "
+              f"{reglage['score_cv']:>7.2%} {reglage['score_test']:>7.2%} "
+              f"[{intervalle['IC Bas']:.0%} ; {intervalle['IC Haut']:.0%}] "
+              f"{'oui' if reglage['nom'] in ex_aequo else 'non':>9}")
+    
+    # Le plus rapide des réglages que le bootstrap ne distingue pas du meilleur score de test
+    recommande = max((r for r in reglages if r['nom'] in ex_aequo), key=lambda r: (r['debit'], r['score_cv']))
+    print(f"\n✓ Non distingués du meilleur score de test (p >= {SEUIL_SIGNIFICATIVITE}) : "
+          f"{len(ex_aequo)} réglage(s) ; meilleur score CV : {retenu}")
+    print(f"✓ Réglage recommandé : --pooling {recommande['pooling']} "
+          f"--longueur-max {recommande['longueur_max']} ({recommande['debit']:.1f} embeddings/s, "
+          f"CV {recommande['score_cv']:.2%})")
+    print("="*78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Cache persistant des embeddings BERT
+
+Un texte est identifié par son empreinte SHA-256. Chaque couple (modèle,
+pooling) a son propre dossier, la dimension des embeddings en dépendant :
+changer de modèle ou de pooling utilise un autre cache sans invalider le
+premier.
+
+Chaque dossier contient :
+- embeddings.f32 : lignes float32 brutes, en ajout seul, lues par memory-map
+- index.tsv : « empreinte<TAB>numéro de ligne » pour chaque embedding, en ajout seul
+- meta.json : modèle, pooling et dimension
+
+Les embeddings sont écrits avant leurs lignes d'index : après une
+interruption, les lignes non indexées ou incomplètes sont tronquées à
+l'ouverture. compacter() réécrit le cache en ne gardant que les textes
+demandés (les textes supprimés du corpus ne sont jamais relus sinon).
+"""
+
+import json
+import shutil
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDINGS = 'embeddings.f32'
+INDEX = 'index.tsv'
+META = 'meta.json'
+
+
+def empreinte(texte):
+    return hashlib.sha256(texte.encode('utf-8')).hexdigest()
+
+
+class CacheEmbeddings:
+    """Embeddings float32 en ajout seul (memory-map) + index empreinte -> ligne"""
+    
+    def __init__(self, dossier, modele, pooling, dimension):
+        """
+        Ouvre (ou crée) le cache d'un modèle et d'un pooling
+        
+        Args:
+            dossier: Dossier racine des caches
+            modele: Nom du modèle BERT (ex: camembert-base)
+            pooling: Stratégie de pooling des embeddings (ex: cls)
+            dimension: Taille d'un embedding
+        
+        Raises:
+            ValueError: Si le cache existant n'a pas la même dimension
+        """
+        self.modele = modele
+        self.pooling = pooling
+        self.dimension = dimension
+        identifiant = hashlib.sha256(f"{modele}\0{pooling}".encode('utf-8')).hexdigest()[:16]
+        self.dossier = Path(dossier) / identifiant
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        
+        self.succes = 0
+        self.echecs = 0
+        self._ouvrir()
+    
+    def _ouvrir(self):
+        """Relit meta.json et l'index, tronque les lignes non indexées"""
+        meta = {'modele': self.modele, 'pooling': self.pooling, 'dimension': self.dimension}
+        chemin_meta = self.dossier / META
+        if chemin_meta.exists():
+            with open(chemin_meta, 'r', encoding='utf-8') as f:
+                existant = json.load(f)
+            if existant['dimension'] != self.dimension:
+                raise ValueError(f"Cache {self.dossier} : dimension {existant['dimension']} "
+                                 f"au lieu de {self.dimension}")
+        else:
+            with open(chemin_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+        
+        self.index = {}
+        chemin_index = self.dossier / INDEX
+        incomplete = False
+        if chemin_index.exists():
+            with open(chemin_index, 'r', encoding='utf-8') as f:
+                for ligne in f:
+                    morceaux = ligne.rstrip('\n').split('\t')
+                    # Dernière ligne incomplète après une interruption
+                    if ligne.endswith('\n') and len(morceaux) == 2 and morceaux[1].isdigit():
+                        self.index[morceaux[0]] = int(morceaux[1])
+                    else:
+                        incomplete = True
+        if incomplete:
+            # Sinon le prochain ajout serait collé à la ligne incomplète
+            with open(chemin_index, 'w', encoding='utf-8') as f:
+                f.writelines(f"{cle}\t{ligne}\n" for cle, ligne in self.index.items())
+        
+        self.n_lignes = max(self.index.values()) + 1 if self.index else 0
+        chemin_embeddings = self.dossier / EMBEDDINGS
+        taille = self.n_lignes * self.dimension * 4
+        if not chemin_embeddings.exists() or chemin_embeddings.stat().st_size < taille:
+            # Embeddings perdus : repartir d'un cache vide
+            self.index = {}
+            self.n_lignes = 0
+            taille = 0
+            chemin_index.write_text('', encoding='utf-8')
+        with open(chemin_embeddings, 'ab') as f:
+            f.truncate(taille)
+    
+    def _matrice(self):
+        """Embeddings du cache en memory-map (lecture seule)"""
+        return np.memmap(self.dossier / EMBEDDINGS, dtype=np.float32, mode='r',
+                         shape=(self.n_lignes, self.dimension))
+    
+    def obtenir_lot(self, textes):
+        """
+        Cherche une liste de textes dans le cache
+        
+        Returns:
+            Matrice (textes x dimension) remplie pour les textes trouvés, et
+            liste des indices des textes absents
+        """
+        lignes = np.array([self.index.get(empreinte(texte), -1) for texte in textes], dtype=np.int64)
+        trouves = lignes >= 0
+        embeddings = np.zeros((len(textes), self.dimension), dtype=np.float32)
+        if trouves.any():
+            embeddings[trouves] = self._matrice()[lignes[trouves]]
+        
+        self.succes += int(trouves.sum())
+        self.echecs += int((~trouves).sum())
+        return embeddings, np.flatnonzero(~trouves).tolist()
+    
+    def enregistrer_lot(self, textes, embeddings):
+        """Ajoute les embeddings des textes absents du cache"""
+        nouveaux = {}
+        for texte, embedding in zip(textes, embeddings):
+            cle = empreinte(texte)
+            if cle not in self.index and cle not in nouveaux:
+                nouveaux[cle] = embedding
+        if not nouveaux:
+            return
+        
+        lignes = np.ascontiguousarray(np.stack(list(nouveaux.values())), dtype=np.float32)
+        with open(self.dossier / EMBEDDINGS, 'ab') as f:
+            f.write(lignes.tobytes())
+        with open(self.dossier / INDEX, 'a', encoding='utf-8') as f:
+            for decalage, cle in enumerate(nouveaux):
+                f.write(f"{cle}\t{self.n_lignes + decalage}\n")
+                self.index[cle] = self.n_lignes + decalage
+        self.n_lignes += len(nouveaux)
+    
+    def compacter(self, textes=None):
+        """
+        Réécrit le cache sans lignes orphelines
+        
+        Args:
+            textes: Textes à garder (None : tous les textes indexés)
+        
+        Returns:
+            Nombre d'embeddings gardés et d'octets libérés
+        """
+        if textes is None:
+            cles = list(self.index)
+        else:
+            cles = [cle for cle in dict.fromkeys(empreinte(texte) for texte in textes) if cle in self.index]
+        avant = (self.dossier / EMBEDDINGS).stat().st_size
+        
+        # Nouveau dossier complet, puis remplacement de l'ancien
+        temporaire = self.dossier.with_name(self.dossier.name + '.tmp')
+        shutil.rmtree(temporaire, ignore_errors=True)
+        temporaire.mkdir()
+        shutil.copy(self.dossier / META, temporaire / META)
+        if cles:
+            self._matrice()[[self.index[cle] for cle in cles]].tofile(temporaire / EMBEDDINGS)
+        else:
+            (temporaire / EMBEDDINGS).touch()
+        with open(temporaire / INDEX, 'w', encoding='utf-8') as f:
+            f.writelines(f"{cle}\t{ligne}\n" for ligne, cle in enumerate(cles))
+        
+        shutil.rmtree(self.dossier)
+        temporaire.rename(self.dossier)
+        self._ouvrir()
+        return len(cles), avant - (self.dossier / EMBEDDINGS).stat().st_size
+    
+    def statistiques(self):
+        """Compteurs de succès/échecs et taille du cache"""
+        total = self.succes + self.echecs
+        return {
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'taux_succes': self.succes / total if total else 0.0,
+            'entrees': len(self.index),
+            'octets': self.n_lignes * self.dimension * 4
+        }
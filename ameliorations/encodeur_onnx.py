@@ -0,0 +1,129 @@
+"""
+Encodeur CamemBERT exécuté par ONNX Runtime (CPU)
+
+Le modèle PyTorch est exporté une fois en ONNX (axes lot et séquence
+dynamiques) dans resultats_bert/onnx/ ; les exécutions suivantes ouvrent
+directement le graphe, sans importer torch. Avec int8, le graphe exporté est
+quantifié (poids int8 des produits matriciels, activations quantifiées à la
+volée) par onnxruntime.quantization, lui aussi une seule fois.
+    
+    encodeur = EncodeurOnnx('camembert-base', 'ameliorations/resultats_bert/onnx')
+    etats = encodeur(input_ids, attention_mask)   # (lot, séquence, 768)
+"""
+
+import re
+import time
+import inspect
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import onnxruntime
+    ONNX_DISPONIBLE = True
+except ImportError:
+    ONNX_DISPONIBLE = False
+
+OPSET = 14
+SORTIE = 'last_hidden_state'
+
+
+def exporter_onnx(modele_bert, chemin):
+    """
+    Exporte l'encodeur PyTorch en ONNX (nécessite torch, une seule fois)
+    
+    Args:
+        modele_bert: Nom du modèle BERT (ex: camembert-base)
+        chemin: Fichier .onnx à écrire
+    """
+    import torch
+    from transformers import CamembertModel
+    
+    class EtatsCaches(torch.nn.Module):
+        """Encodeur sans couche de pooling, qui ne renvoie que last_hidden_state"""
+        
+        def __init__(self, modele):
+            super().__init__()
+            self.modele = modele
+        
+        def forward(self, input_ids, attention_mask):
+            return self.modele(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+    
+    # Sans add_pooling_layer=False, le graphe aurait une deuxième sortie (pooler_output)
+    modele = EtatsCaches(CamembertModel.from_pretrained(modele_bert, add_pooling_layer=False)).eval()
+    exemple = torch.ones((1, 8), dtype=torch.long)
+    # Les versions récentes de torch exportent par dynamo par défaut : il ignore l'opset demandé et
+    # son graphe ne reproduit pas l'encodeur. On garde l'export TorchScript (un seul fichier).
+    options = {}
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        options['dynamo'] = False
+    
+    temporaire = Path(chemin).with_suffix('.tmp')
+    with torch.inference_mode():
+        torch.onnx.export(
+            modele, (exemple, exemple), str(temporaire),
+            input_names=['input_ids', 'attention_mask'],
+            output_names=[SORTIE],
+            dynamic_axes={nom: {0: 'lot', 1: 'sequence'}
+                          for nom in ('input_ids', 'attention_mask', SORTIE)},
+            opset_version=OPSET,
+            **options
+        )
+    temporaire.rename(chemin)
+
+
+class EncodeurOnnx:
+    """Session ONNX Runtime de l'encodeur, graphe exporté au premier usage"""
+    
+    def __init__(self, modele_bert, dossier, int8=False, threads=None, threads_inter=None):
+        """
+        Args:
+            modele_bert: Nom du modèle BERT (ex: camembert-base)
+            dossier: Dossier des graphes exportés
+            int8: Utiliser le graphe quantifié int8
+            threads: Threads intra-opération (None : défaut d'ONNX Runtime)
+            threads_inter: Threads inter-opérations
+        """
+        if not ONNX_DISPONIBLE:
+            raise ImportError("Bibliothèque onnxruntime requise. Installez avec: pip install onnxruntime")
+        
+        dossier = Path(dossier)
+        dossier.mkdir(parents=True, exist_ok=True)
+        base = re.sub(r'[^\w.-]', '_', modele_bert)
+        # Les anciens graphes (sans suffixe) renvoyaient aussi pooler_output : on les supprime
+        for ancien in (dossier / f"{base}.opset{OPSET}.onnx", dossier / f"{base}.opset{OPSET}.int8.onnx"):
+            ancien.unlink(missing_ok=True)
+        chemin = dossier / f"{base}.opset{OPSET}.etats.onnx"
+        if not chemin.exists():
+            print(f"Export ONNX de {modele_bert} (une seule fois)...")
+            debut = time.time()
+            exporter_onnx(modele_bert, chemin)
+            print(f"✓ Graphe exporté en {time.time() - debut:.1f} s : {chemin}")
+        
+        if int8:
+            chemin_int8 = chemin.with_name(chemin.stem + '.int8.onnx')
+            if not chemin_int8.exists():
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                temporaire = chemin_int8.with_suffix('.tmp')
+                quantize_dynamic(str(chemin), str(temporaire), weight_type=QuantType.QInt8)
+                temporaire.rename(chemin_int8)
+                print(f"✓ Graphe int8 : {chemin_int8}")
+            chemin = chemin_int8
+        
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        if threads_inter:
+            options.inter_op_num_threads = threads_inter
+        self.chemin = chemin
+        self.session = onnxruntime.InferenceSession(str(chemin), options, providers=['CPUExecutionProvider'])
+        self.dimension = self.session.get_outputs()[0].shape[2]
+    
+    def __call__(self, input_ids, attention_mask):
+        """États cachés de la dernière couche (lot x séquence x dimension), en float32"""
+        (etats,) = self.session.run([SORTIE], {
+            'input_ids': np.asarray(input_ids, dtype=np.int64),
+            'attention_mask': np.asarray(attention_mask, dtype=np.int64)
+        })
+        return etats
@@ -3,27 +3,39 @@ Module d'amélioration avec BERT pour la classification de sentiments
 Utilise des embeddings pré-entraînés pour améliorer les performances
 """
 
+import sys
 import json
+import time
+import argparse
 import numpy as np
 import pandas as pd
 import joblib
 from pathlib import Path
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
 from sklearn.preprocessing import LabelEncoder
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
-import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.corpus import lire_corpus, resoudre_corpus
+from outils.recherche import RechercheHalving
+from outils.comparaison import comparer_modeles, choisir_modele, SEUIL_SIGNIFICATIVITE
+from outils.foret import ForetBornee, resume_rapport
+from outils.evaluation import matrices_confusion, metriques, rapport_texte
+from outils.lots_jetons import BUDGET_JETONS, planifier_lots, lots_fixes, statistiques_lots
+from cache_embeddings import CacheEmbeddings
+from encodeur_onnx import EncodeurOnnx
 
 # Note: Installation requise
 # pip install transformers torch
 
+# torch n'est importé que par le backend PyTorch (import de plusieurs secondes)
 try:
-    from transformers import CamembertTokenizer, CamembertModel
+    from transformers import CamembertTokenizer
     BERT_AVAILABLE = True
 except ImportError:
     print("⚠️  Bibliothèque transformers non installée")
@@ -31,107 +43,268 @@ except ImportError:
     BERT_AVAILABLE = False
 
 
+def configurer_threads(intra=None, inter=None):
+    """
+    Threads de torch pour l'inférence CPU
+    
+    Args:
+        intra: Threads d'une opération (produits matriciels), None : défaut de torch
+        inter: Threads entre opérations indépendantes, à fixer avant tout calcul
+    """
+    import torch
+    
+    if inter:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError:
+            print("⚠️  Threads inter-opérations déjà fixés pour ce processus")
+    if intra:
+        torch.set_num_threads(intra)
+
+
+POOLINGS = ('cls', 'moyenne', 'max')
+
+
+def pooler(etats, masque, pooling):
+    """
+    Un embedding par texte à partir des états cachés d'un lot
+    
+    Args:
+        etats: États de la dernière couche (lot x séquence x dimension)
+        masque: attention_mask (lot x séquence), 0 sur le padding
+        pooling: 'cls' (premier jeton), 'moyenne' ou 'max' (sur les jetons non masqués)
+    """
+    if pooling == 'cls':
+        return etats[:, 0, :]
+    masque = np.asarray(masque, dtype=bool)[:, :, None]
+    if pooling == 'moyenne':
+        return (etats * masque).sum(axis=1) / np.maximum(masque.sum(axis=1), 1)
+    if pooling == 'max':
+        return np.where(masque, etats, -np.inf).max(axis=1)
+    raise ValueError(f"Pooling inconnu : {pooling} (choix : {', '.join(POOLINGS)})")
+
+
+def charger_donnees_annotees(chemin_donnees):
+    """Charge les données annotées (sans modèle ni tokenizer)"""
+    print("\nChargement des données...")
+    
+    # Lire en flux et ne garder que les données annotées
+    donnees_annotees = [item for item in lire_corpus(resoudre_corpus(chemin_donnees))
+                        if 'sentiment' in item]
+    
+    if len(donnees_annotees) < 50:
+        raise ValueError(
+            f"Pas assez de données annotées ({len(donnees_annotees)}). "
+            "Minimum requis : 50."
+        )
+    
+    df = pd.DataFrame(donnees_annotees)
+    print(f"✓ {len(df)} publications annotées chargées")
+    
+    return df
+
+
+def extraire_textes(df):
+    """Textes prétraités s'ils existent pour toutes les publications, sinon textes bruts"""
+    if 'texte_traite' in df.columns and df['texte_traite'].notna().all():
+        return df['texte_traite'].tolist()
+    return df['texte'].tolist()
+
+
 class ClassificateurBERT:
     """Classe pour la classification de sentiments avec embeddings BERT"""
     
-    def __init__(self, chemin_donnees_annotees, modele_bert='camembert-base'):
+    def __init__(self, chemin_donnees_annotees, modele_bert='camembert-base', cache=True,
+                 int8=False, threads=None, threads_inter=None, backend='torch', pooling='cls',
+                 longueur_max=512):
         """
         Initialise le classificateur BERT
         
         Args:
             chemin_donnees_annotees: Chemin vers les données annotées
             modele_bert: Nom du modèle BERT à utiliser (CamemBERT pour le français)
+            cache: Reprendre les embeddings déjà calculés (resultats_bert/cache_embeddings/)
+            int8: Quantification dynamique int8 des couches linéaires (inférence CPU)
+            threads: Threads intra-opération (None : défaut de torch ou d'ONNX Runtime)
+            threads_inter: Threads inter-opérations
+            backend: 'torch' (CamembertModel) ou 'onnx' (graphe exporté une fois,
+                     exécuté par onnxruntime sur CPU, sans importer torch)
+            pooling: Embedding d'un texte : 'cls', 'moyenne' ou 'max' (voir pooler)
+            longueur_max: Jetons gardés par texte (troncature)
         """
         if not BERT_AVAILABLE:
             raise ImportError("Bibliothèque transformers requise. Installez avec: pip install transformers torch")
         
+        if pooling not in POOLINGS:
+            raise ValueError(f"Pooling inconnu : {pooling} (choix : {', '.join(POOLINGS)})")
+        
         self.chemin_donnees = chemin_donnees_annotees
         self.modele_bert_nom = modele_bert
+        self.pooling = pooling
+        self.longueur_max = longueur_max
         self.encodeur = LabelEncoder()
+        self.statistiques_lots = None
+        self.scores_cv = {}
+        
+        # Dossier de sortie
+        self.dossier_sortie = Path('ameliorations/resultats_bert')
+        self.dossier_sortie.mkdir(parents=True, exist_ok=True)
         
         # Charger le modèle BERT et le tokenizer
         print(f"Chargement du modèle {modele_bert}...")
+        self.backend = backend
         self.tokenizer = CamembertTokenizer.from_pretrained(modele_bert)
+        if backend == 'onnx':
+            self.int8 = int8
+            self.modele_bert = EncodeurOnnx(modele_bert, self.dossier_sortie / 'onnx', int8=int8,
+                                            threads=threads, threads_inter=threads_inter)
+            self.dimension = self.modele_bert.dimension
+            self.device = 'cpu'
+            print(f"✓ Modèle chargé : ONNX Runtime{' (int8)' if self.int8 else ''}, {self.modele_bert.chemin.name}")
+        else:
+            self._charger_torch(modele_bert, int8, threads, threads_inter)
+        
+        # Cache des embeddings par texte, pour ce modèle et ce pooling
+        self.cache = None
+        if cache:
+            # fp32 : mêmes embeddings avec torch et ONNX ; int8 : quantifications différentes
+            variante = modele_bert
+            if self.int8:
+                variante += '+int8' if backend == 'torch' else '+onnx-int8'
+            # La troncature change l'embedding des textes longs : elle fait partie de la clé
+            self.cache = CacheEmbeddings(self.dossier_sortie / 'cache_embeddings', variante,
+                                         f"{pooling}/{longueur_max}", self.dimension)
+    
+    def _charger_torch(self, modele_bert, int8, threads, threads_inter):
+        """Charge CamembertModel (backend PyTorch)"""
+        import torch
+        from transformers import CamembertModel
+        
+        configurer_threads(threads, threads_inter)
         self.modele_bert = CamembertModel.from_pretrained(modele_bert)
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.modele_bert.to(self.device)
         self.modele_bert.eval()
+        self.dimension = self.modele_bert.config.hidden_size
+        
+        # Poids int8 et activations quantifiées à la volée, couches linéaires seulement
+        self.int8 = int8 and self.device.type == 'cpu'
+        if int8 and not self.int8:
+            print("⚠️  Quantification int8 ignorée : réservée à l'inférence CPU")
+        if self.int8:
+            self.modele_bert = torch.ao.quantization.quantize_dynamic(
+                self.modele_bert, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.modele_bert.to(self.device)
         
-        print(f"✓ Modèle chargé sur : {self.device}")
-        
-        # Dossier de sortie
-        self.dossier_sortie = Path('ameliorations/resultats_bert')
-        self.dossier_sortie.mkdir(parents=True, exist_ok=True)
+        print(f"✓ Modèle chargé sur : {self.device}{' (int8)' if self.int8 else ''}, "
+              f"{torch.get_num_threads()} threads")
     
     def charger_donnees(self):
         """Charge les données annotées"""
-        print("\nChargement des données...")
-        
-        with open(self.chemin_donnees, 'r', encoding='utf-8') as f:
-            donnees = json.load(f)
-        
-        # Filtrer les données annotées
-        donnees_annotees = [item for item in donnees if 'sentiment' in item]
-        
-        if len(donnees_annotees) < 50:
-            raise ValueError(
-                f"Pas assez de données annotées ({len(donnees_annotees)}). "
-                "Minimum requis : 50."
-            )
-        
-        df = pd.DataFrame(donnees_annotees)
-        print(f"✓ {len(df)} publications annotées chargées")
-        
-        return df
+        return charger_donnees_annotees(self.chemin_donnees)
     
-    def generer_embeddings_bert(self, textes, batch_size=16):
+    def generer_embeddings_bert(self, textes, budget_jetons=BUDGET_JETONS, taille_max=128, batch_size=16,
+                                poolings=None, longueur_max=None):
         """
         Génère les embeddings BERT pour une liste de textes
         
+        Avec le cache, seuls les textes jamais vus passent par le modèle.
+        
         Args:
             textes: Liste de textes
-            batch_size: Taille des batchs pour le traitement
+            budget_jetons: Jetons par lot (None : lots fixes de batch_size textes
+                           dans l'ordre d'entrée, comme avant)
+            taille_max: Nombre maximal de textes par lot
+            batch_size: Taille des lots fixes
+            poolings: Plusieurs poolings calculés dans la même passe (sans cache)
+            longueur_max: Autre troncature que celle du classificateur (sans cache)
         
         Returns:
-            Matrice d'embeddings (numpy array)
+            Matrice d'embeddings (numpy array), ou dictionnaire {pooling: matrice}
+            si poolings est donné
         """
         print(f"\nGénération des embeddings BERT pour {len(textes)} textes...")
+        textes = list(textes)
         
-        embeddings = []
+        if poolings is not None or longueur_max is not None:
+            embeddings = self._encoder_textes(textes, budget_jetons, taille_max, batch_size,
+                                              poolings or (self.pooling,), longueur_max or self.longueur_max)
+            return embeddings if poolings is not None else embeddings[self.pooling]
         
-        # Traiter par batches
-        for i in range(0, len(textes), batch_size):
-            batch_textes = textes[i:i+batch_size]
-            
-            # Tokeniser
-            encoded = self.tokenizer(
-                batch_textes,
-                padding=True,
-                truncation=True,
-                max_length=512,
-                return_tensors='pt'
+        if self.cache is None:
+            embeddings = self._encoder_textes(textes, budget_jetons, taille_max, batch_size)[self.pooling]
+        else:
+            embeddings, manquants = self.cache.obtenir_lot(textes)
+            nouveaux = list(dict.fromkeys(textes[i] for i in manquants))
+            print(f"  Cache : {len(textes) - len(manquants)}/{len(textes)} textes trouvés "
+                  f"({1 - len(manquants) / len(textes):.1%}), {len(nouveaux)} à encoder")
+            if nouveaux:
+                calcules = self._encoder_textes(nouveaux, budget_jetons, taille_max, batch_size)[self.pooling]
+                self.cache.enregistrer_lot(nouveaux, calcules)
+                position = {texte: i for i, texte in enumerate(nouveaux)}
+                embeddings[manquants] = calcules[[position[textes[i]] for i in manquants]]
+        
+        print(f"✓ Embeddings générés : {embeddings.shape}")
+        return embeddings
+    
+    def _encoder_textes(self, textes, budget_jetons, taille_max, batch_size, poolings=None,
+                        longueur_max=None):
+        """
+        Passe les textes dans le modèle, par lots (voir generer_embeddings_bert)
+        
+        Returns:
+            Dictionnaire {pooling: matrice d'embeddings}, tous tirés de la même passe
+        """
+        poolings = poolings or (self.pooling,)
+        
+        # Tokeniser une fois, sans padding, pour connaître les longueurs
+        encodage = self.tokenizer(list(textes), truncation=True, max_length=longueur_max or self.longueur_max)
+        longueurs = [len(ids) for ids in encodage['input_ids']]
+        
+        if budget_jetons is None:
+            lots = lots_fixes(len(textes), batch_size)
+        else:
+            lots = planifier_lots(longueurs, budget_jetons, taille_max)
+        
+        embeddings = {pooling: np.empty((len(textes), self.dimension), dtype=np.float32)
+                      for pooling in poolings}
+        debut = time.time()
+        
+        for numero, lot in enumerate(lots, 1):
+            # Padding jusqu'au plus long texte du lot
+            batch = self.tokenizer.pad(
+                {cle: [encodage[cle][i] for i in lot] for cle in ('input_ids', 'attention_mask')},
+                return_tensors='np' if self.backend == 'onnx' else 'pt'
             )
+            etats = self._passe_avant(batch['input_ids'], batch['attention_mask'])
+            for pooling in poolings:
+                embeddings[pooling][lot] = pooler(etats, batch['attention_mask'], pooling)
             
-            # Déplacer sur le device
-            input_ids = encoded['input_ids'].to(self.device)
-            attention_mask = encoded['attention_mask'].to(self.device)
-            
-            # Générer les embeddings
-            with torch.no_grad():
-                outputs = self.modele_bert(input_ids=input_ids, attention_mask=attention_mask)
-                # Utiliser le [CLS] token (premier token) comme représentation
-                cls_embeddings = outputs.last_hidden_state[:, 0, :].cpu().numpy()
-                embeddings.append(cls_embeddings)
-            
-            if (i // batch_size + 1) % 10 == 0:
-                print(f"  Progression : {i+batch_size}/{len(textes)}")
+            if numero % 10 == 0:
+                print(f"  Progression : {numero}/{len(lots)} lots")
         
-        # Concaténer tous les embeddings
-        embeddings = np.vstack(embeddings)
-        print(f"✓ Embeddings générés : {embeddings.shape}")
+        duree = time.time() - debut
+        self.statistiques_lots = dict(statistiques_lots(longueurs, lots), temps=duree)
+        print(f"  {len(lots)} lots, {self.statistiques_lots['part_padding']:.1%} de padding, "
+              f"{self.statistiques_lots['jetons'] / duree:.0f} jetons/s")
         
         return embeddings
     
+    def extraire_textes(self, df):
+        """Textes prétraités s'ils existent pour toutes les publications, sinon textes bruts"""
+        return extraire_textes(df)
+    
+    def _passe_avant(self, input_ids, attention_mask):
+        """États cachés de la dernière couche d'un lot, en numpy"""
+        if self.backend == 'onnx':
+            return self.modele_bert(input_ids, attention_mask)
+        
+        import torch
+        with torch.inference_mode():
+            outputs = self.modele_bert(input_ids=input_ids.to(self.device),
+                                       attention_mask=attention_mask.to(self.device))
+            return outputs.last_hidden_state.cpu().numpy()
+    
     def preparer_donnees(self, df):
         """
         Prépare les données avec embeddings BERT
@@ -144,19 +317,10 @@ class ClassificateurBERT:
         """
         print("\nPréparation des données...")
         
-        # Extraire les textes
-        if 'texte_traite' in df.columns and df['texte_traite'].notna().all():
-            textes = df['texte_traite'].tolist()
-        else:
-            textes = df['texte'].tolist()
+        textes = self.extraire_textes(df)
         
-        # Générer les embeddings
         embeddings = self.generer_embeddings_bert(textes)
         
-        # Sauvegarder les embeddings
-        np.save(self.dossier_sortie / 'bert_embeddings.npy', embeddings)
-        print(f"✓ Embeddings sauvegardés dans {self.dossier_sortie}/bert_embeddings.npy")
-        
         # Encoder les labels
         y = self.encodeur.fit_transform(df['sentiment'])
         
@@ -188,16 +352,22 @@ class ClassificateurBERT:
         modeles = {
             'Régression Logistique': LogisticRegression(max_iter=1000, random_state=42),
             'SVM RBF': SVC(kernel='rbf', random_state=42, probability=True),
-            'Random Forest': RandomForestClassifier(n_estimators=200, random_state=42)
+            # Arbres construits en parallèle (threads), rapport de taille et de temps
+            'Random Forest': ForetBornee(n_estimators=200, random_state=42, n_jobs=-1)
         }
         
         resultats = {}
         
         for nom, modele in modeles.items():
             print(f"\n📊 Entraînement : {nom}")
+            # Score CV : départage les modèles que le bootstrap du test ne distingue pas
+            self.scores_cv[nom] = cross_val_score(modele, X_train, y_train, cv=5).mean()
             modele.fit(X_train, y_train)
             score = modele.score(X_train, y_train)
             print(f"  Score d'entraînement : {score:.4f}")
+            print(f"  Score CV : {self.scores_cv[nom]:.4f}")
+            if hasattr(modele, 'rapport_'):
+                print(f"  Arbres : {resume_rapport(modele.rapport_)}")
             
             resultats[nom] = modele
         
@@ -205,6 +375,47 @@ class ClassificateurBERT:
         
         return resultats
     
+    def optimiser_modeles(self, X_train, y_train, facteur=3):
+        """
+        Recherche d'hyperparamètres par divisions successives sur les classifieurs BERT
+        
+        L'historique des essais (resultats_bert/historique_recherche.json) est
+        repris : les embeddings étant eux aussi réutilisés, une nouvelle
+        exécution ne réajuste que les candidats inconnus.
+        
+        Returns:
+            Dictionnaire des modèles optimisés, réajustés sur X_train
+        """
+        print("\n" + "="*60)
+        print("RECHERCHE D'HYPERPARAMÈTRES (DIVISIONS SUCCESSIVES)")
+        print("="*60)
+        
+        espaces = {
+            'Régression Logistique': (LogisticRegression(max_iter=1000, random_state=42),
+                                      {'C': [0.01, 0.1, 1, 10, 100]}),
+            'SVM RBF': (SVC(kernel='rbf', random_state=42, probability=True),
+                        {'C': [0.1, 1, 10, 100], 'gamma': ['scale', 0.01, 0.001]}),
+            'Random Forest': (ForetBornee(random_state=42),
+                              {'n_estimators': [200, 500], 'max_features': ['sqrt', 0.1],
+                               'min_samples_leaf': [1, 2]})
+        }
+        recherche = RechercheHalving(espaces, facteur=facteur, cv=5,
+                                     historique=self.dossier_sortie / 'historique_recherche.json')
+        
+        modeles = {}
+        for nom, sortie in recherche.executer(X_train, y_train).items():
+            print(f"\n📊 {nom} : {sortie['parametres']}")
+            print(f"  Score CV : {sortie['score_cv']:.4f} ({sortie['evaluations']} ajustements, "
+                  f"{sortie['reprises']} essais repris)")
+            if sortie['amorces']:
+                print(f"  Amorçage : {sortie['amorces']} candidats survivants de l'exécution précédente")
+            modeles[f'{nom} (optimisé)'] = sortie['modele']
+            self.scores_cv[f'{nom} (optimisé)'] = sortie['score_cv']
+        
+        print("\n" + "="*60)
+        
+        return modeles
+    
     def evaluer_modeles(self, modeles, X_test, y_test):
         """
         Évalue les modèles sur l'ensemble de test
@@ -214,6 +425,10 @@ class ClassificateurBERT:
             X_test: Embeddings de test
             y_test: Labels de test
         
+        Le modèle retenu est choisi comme dans 05_Entrainement : parmi les
+        modèles que le bootstrap apparié du test ne distingue pas du meilleur
+        score de test, celui qui a le meilleur score CV.
+        
         Returns:
             DataFrame avec les résultats, meilleur modèle
         """
@@ -222,47 +437,64 @@ class ClassificateurBERT:
         print("="*60)
         
         resultats = []
-        meilleur_score = 0
-        meilleur_modele = None
-        meilleur_nom = None
         
-        for nom, modele in modeles.items():
-            y_pred = modele.predict(X_test)
-            score = accuracy_score(y_test, y_pred)
+        # Une prédiction par modèle, puis toutes les matrices de confusion en un comptage
+        predictions = {nom: modele.predict(X_test) for nom, modele in modeles.items()}
+        matrices = matrices_confusion(y_test, predictions, len(self.encodeur.classes_))
+        
+        for nom in modeles:
+            score = metriques(matrices[nom])['exactitude']
             
             print(f"\n{nom} :")
             print(f"  Exactitude : {score:.4f}")
-            print(classification_report(
-                y_test, y_pred,
-                target_names=self.encodeur.classes_,
-                zero_division=0
-            ))
+            print(rapport_texte(matrices[nom], self.encodeur.classes_))
             
             resultats.append({
                 'Modèle': f'BERT + {nom}',
+                'Score CV': self.scores_cv[nom],
                 'Exactitude': score
             })
             
             # Matrice de confusion
-            cm = confusion_matrix(y_test, y_pred)
-            self._sauvegarder_matrice_confusion(cm, nom, y_test, y_pred)
-            
-            if score > meilleur_score:
-                meilleur_score = score
-                meilleur_modele = modele
-                meilleur_nom = nom
+            self._sauvegarder_matrice_confusion(matrices[nom], nom)
+        
+        df_resultats = pd.DataFrame(resultats)
+        
+        # Bootstrap apparié : mêmes rééchantillons du test pour tous les modèles
+        correct = np.stack([predictions[nom] == np.asarray(y_test) for nom in modeles])
+        intervalles, paires = comparer_modeles(correct, df_resultats['Modèle'])
+        df_resultats['IC Bas'] = intervalles['IC Bas']
+        df_resultats['IC Haut'] = intervalles['IC Haut']
+        print()
+        for _, ligne in df_resultats.iterrows():
+            print(f"  {ligne['Modèle']:<40} {ligne['Exactitude']:.2%}  IC 95 % "
+                  f"[{ligne['IC Bas']:.2%} ; {ligne['IC Haut']:.2%}]")
+        
+        retenu, ex_aequo = choisir_modele(
+            paires,
+            dict(zip(df_resultats['Modèle'], df_resultats['Exactitude'])),
+            dict(zip(df_resultats['Modèle'], df_resultats['Score CV']))
+        )
+        df_resultats['Retenu'] = df_resultats['Modèle'] == retenu
+        meilleur_nom = retenu.removeprefix('BERT + ')
+        meilleur_modele = modeles[meilleur_nom]
+        meilleur_score = float(df_resultats.loc[df_resultats['Retenu'], 'Exactitude'].iloc[0])
+        print(f"\n✓ Non distingués du meilleur score de test (p >= {SEUIL_SIGNIFICATIVITE}) : "
+              f"{len(ex_aequo)} modèle(s), départagés par le score CV")
         
         print("\n" + "="*60)
         print(f"🏆 MEILLEUR MODÈLE : BERT + {meilleur_nom}")
         print(f"   Exactitude : {meilleur_score:.4f}")
+        print(f"   Score CV : {self.scores_cv[meilleur_nom]:.4f}")
         print("="*60)
         
-        df_resultats = pd.DataFrame(resultats)
         df_resultats.to_csv(self.dossier_sortie / 'resultats_bert.csv', index=False)
+        paires.to_csv(self.dossier_sortie / 'significativite_bert.csv', index=False)
+        print(f"✓ Significativité des paires : {self.dossier_sortie}/significativite_bert.csv")
         
         return df_resultats, meilleur_modele, meilleur_nom, meilleur_score
     
-    def _sauvegarder_matrice_confusion(self, cm, nom_modele, y_test, y_pred):
+    def _sauvegarder_matrice_confusion(self, cm, nom_modele):
         """Sauvegarde la matrice de confusion"""
         plt.figure(figsize=(8, 6))
         sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
@@ -286,6 +518,10 @@ class ClassificateurBERT:
         # Métadonnées
         metadata = {
             'modele_bert': self.modele_bert_nom,
+            'int8': self.int8,
+            'backend': self.backend,
+            'pooling': self.pooling,
+            'longueur_max': self.longueur_max,
             'classificateur': nom_modele,
             'exactitude': float(score),
             'classes': self.encodeur.classes_.tolist(),
@@ -359,6 +595,25 @@ class ClassificateurBERT:
 
 def main():
     """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Classification de sentiments avec embeddings BERT")
+    parser.add_argument('--sans-cache', action='store_true',
+                        help="Recalculer tous les embeddings sans lire ni écrire le cache")
+    parser.add_argument('--compacter-cache', action='store_true',
+                        help="Ne garder dans le cache que les textes du corpus actuel")
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch',
+                        help="onnx : graphe exporté une fois, exécuté par onnxruntime sur CPU")
+    parser.add_argument('--pooling', choices=POOLINGS, default='cls',
+                        help="Embedding d'un texte : jeton CLS, moyenne ou max des jetons")
+    parser.add_argument('--longueur-max', type=int, default=512,
+                        help="Jetons gardés par texte (défaut : 512, fenêtre complète)")
+    parser.add_argument('--int8', action='store_true',
+                        help="Quantification dynamique int8 des couches linéaires (CPU)")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="Threads intra-opération (défaut : celui de torch ou d'ONNX Runtime)")
+    parser.add_argument('--threads-inter', type=int, default=None,
+                        help="Threads inter-opérations")
+    args = parser.parse_args()
+    
     if not BERT_AVAILABLE:
         print("❌ Bibliothèque transformers non installée")
         print("Installation : pip install transformers torch")
@@ -380,7 +635,10 @@ def main():
     
     try:
         # Créer le classificateur
-        classificateur = ClassificateurBERT(chemin_donnees)
+        classificateur = ClassificateurBERT(chemin_donnees, cache=not args.sans_cache, int8=args.int8,
+                                            threads=args.threads, threads_inter=args.threads_inter,
+                                            backend=args.backend, pooling=args.pooling,
+                                            longueur_max=args.longueur_max)
         
         # Charger les données
         df = classificateur.charger_donnees()
@@ -388,9 +646,20 @@ def main():
         # Préparer les données avec BERT
         X_train, X_test, y_train, y_test, embeddings = classificateur.preparer_donnees(df)
         
+        if classificateur.cache is not None:
+            stats = classificateur.cache.statistiques()
+            print(f"✓ Cache d'embeddings : taux de succès {stats['taux_succes']:.1%}, "
+                  f"{stats['entrees']} entrées ({stats['octets'] / 2**20:.1f} Mo)")
+            if args.compacter_cache:
+                gardes, liberes = classificateur.cache.compacter(classificateur.extraire_textes(df))
+                print(f"✓ Cache compacté : {gardes} entrées gardées, {liberes / 2**20:.1f} Mo libérés")
+        
         # Entraîner les modèles
         modeles = classificateur.entrainer_modeles(X_train, y_train)
         
+        # Optimiser les hyperparamètres
+        modeles.update(classificateur.optimiser_modeles(X_train, y_train))
+        
         # Évaluer les modèles
         df_resultats, meilleur_modele, meilleur_nom, meilleur_score = classificateur.evaluer_modeles(
             modeles, X_test, y_test
@@ -404,7 +673,7 @@ def main():
         
         print("\n✅ AMÉLIORATION BERT TERMINÉE !")
         print(f"📂 Résultats dans : {classificateur.dossier_sortie}")
-        
+    
     except Exception as e:
         print(f"\n❌ Erreur : {str(e)}")
         raise
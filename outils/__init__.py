@@ -0,0 +1,3 @@
+"""
+Outils partagés entre les étapes du pipeline UVBF
+"""
@@ -0,0 +1,154 @@
+"""
+Stockage des tableaux échangés entre étapes, lisibles par memory-map
+
+Un artefact est un dossier <nom>/ contenant :
+- des fichiers .npy bruts (un tableau dense, ou data/indices/indptr d'une matrice CSR)
+- manifeste.json : type, forme, dtype et empreinte SHA-256 de chaque tableau
+
+Au chargement, les .npy sont ouverts avec mmap_mode='r' : aucune copie n'est
+désérialisée, les pages sont lues à la demande. Les empreintes sont
+vérifiées avant de rendre le tableau.
+    
+    sauvegarder_artefact('05_Entrainement/resultats', 'X_test', X_test)
+    X_test = charger_artefact('05_Entrainement/resultats', 'X_test')
+"""
+
+import json
+import shutil
+import hashlib
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+MANIFESTE = 'manifeste.json'
+
+
+class ArtefactInvalide(ValueError):
+    """Artefact absent, incomplet ou dont le contenu ne correspond pas au manifeste"""
+
+
+def empreinte_tableau(tableau, taille_bloc=1 << 24):
+    """SHA-256 des octets d'un tableau (lu par blocs, compatible memory-map)"""
+    octets = np.ascontiguousarray(tableau).reshape(-1).view(np.uint8)
+    empreinte = hashlib.sha256()
+    for debut in range(0, len(octets), taille_bloc):
+        empreinte.update(octets[debut:debut + taille_bloc])
+    return empreinte.hexdigest()
+
+
+def chemin_artefact(dossier, nom):
+    return Path(dossier) / nom
+
+
+def artefact_existe(dossier, nom):
+    return (chemin_artefact(dossier, nom) / MANIFESTE).exists()
+
+
+def sauvegarder_artefact(dossier, nom, valeur, metadonnees=None):
+    """
+    Enregistre un tableau numpy ou une matrice creuse dans le stockage
+    
+    Args:
+        dossier: Dossier contenant les artefacts
+        nom: Nom de l'artefact (ex: X_train)
+        valeur: np.ndarray ou matrice scipy.sparse (convertie en CSR)
+        metadonnees: Dictionnaire libre (JSON) enregistré dans le manifeste
+    
+    Returns:
+        Chemin du dossier de l'artefact
+    """
+    if sparse.issparse(valeur):
+        # Forme canonique (indices triés, sans doublons) : les memory-maps sont en
+        # lecture seule, scipy/scikit-learn ne doivent pas avoir à les retrier
+        valeur = sparse.csr_matrix(valeur, copy=True)
+        valeur.sum_duplicates()
+        type_artefact = 'csr'
+        tableaux = {'data': valeur.data, 'indices': valeur.indices, 'indptr': valeur.indptr}
+    else:
+        valeur = np.asarray(valeur)
+        type_artefact = 'dense'
+        tableaux = {'valeurs': valeur}
+    
+    for tableau in tableaux.values():
+        if tableau.dtype.hasobject:
+            raise TypeError(f"Artefact {nom} : les tableaux d'objets ne sont pas pris en charge")
+    
+    # Écriture dans un dossier temporaire remplacé à la fin
+    sortie = chemin_artefact(dossier, nom)
+    temporaire = sortie.with_name(sortie.name + '.tmp')
+    shutil.rmtree(temporaire, ignore_errors=True)
+    temporaire.mkdir(parents=True)
+    
+    manifeste = {
+        'type': type_artefact,
+        'shape': list(valeur.shape),
+        'tableaux': {},
+        'metadonnees': metadonnees or {}
+    }
+    for cle, tableau in tableaux.items():
+        tableau = np.ascontiguousarray(tableau)
+        np.save(temporaire / f'{cle}.npy', tableau, allow_pickle=False)
+        manifeste['tableaux'][cle] = {
+            'fichier': f'{cle}.npy',
+            'dtype': tableau.dtype.str,
+            'shape': list(tableau.shape),
+            'sha256': empreinte_tableau(tableau)
+        }
+    
+    with open(temporaire / MANIFESTE, 'w', encoding='utf-8') as f:
+        json.dump(manifeste, f, ensure_ascii=False, indent=2)
+    
+    shutil.rmtree(sortie, ignore_errors=True)
+    temporaire.rename(sortie)
+    return sortie
+
+
+def lire_manifeste(dossier, nom):
+    chemin = chemin_artefact(dossier, nom) / MANIFESTE
+    if not chemin.exists():
+        raise ArtefactInvalide(f"Artefact introuvable : {chemin.parent}")
+    with open(chemin, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def charger_artefact(dossier, nom, verifier=True):
+    """
+    Ouvre un artefact sans copie (memory-map en lecture seule)
+    
+    Args:
+        dossier: Dossier contenant les artefacts
+        nom: Nom de l'artefact
+        verifier: Contrôler dtype, forme et empreinte SHA-256 de chaque tableau
+    
+    Returns:
+        np.memmap ou csr_matrix dont les tableaux sont des memory-maps
+    
+    Raises:
+        ArtefactInvalide: Si l'artefact est absent ou ne correspond pas au manifeste
+    """
+    manifeste = lire_manifeste(dossier, nom)
+    racine = chemin_artefact(dossier, nom)
+    
+    tableaux = {}
+    for cle, description in manifeste['tableaux'].items():
+        tableau = np.load(racine / description['fichier'], mmap_mode='r', allow_pickle=False)
+        if verifier:
+            if (tableau.dtype.str != description['dtype']
+                    or list(tableau.shape) != description['shape']):
+                raise ArtefactInvalide(
+                    f"Artefact {nom}/{cle} : {tableau.dtype.str} {list(tableau.shape)} "
+                    f"au lieu de {description['dtype']} {description['shape']}"
+                )
+            if empreinte_tableau(tableau) != description['sha256']:
+                raise ArtefactInvalide(f"Artefact {nom}/{cle} : empreinte SHA-256 différente")
+        tableaux[cle] = tableau
+    
+    if manifeste['type'] == 'csr':
+        matrice = sparse.csr_matrix(
+            (tableaux['data'], tableaux['indices'], tableaux['indptr']),
+            shape=tuple(manifeste['shape']), copy=False
+        )
+        matrice.has_canonical_format = True
+        return matrice
+    return tableaux['valeurs']
@@ -0,0 +1,119 @@
+"""
+Stockage en colonnes (Parquet) du corpus annoté et prétraité
+
+Les statistiques (sentiment, plateforme, likes, date_publication...) n'ont
+besoin que de quelques champs : un fichier Parquet permet de ne lire que ces
+colonnes au lieu de reconstruire toutes les publications. Les étapes
+d'annotation et de prétraitement écrivent un .parquet à côté de leur .json.
+
+Sans pyarrow, tout retombe sur la lecture JSON habituelle.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from outils.corpus import lire_corpus, resoudre_corpus
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+
+if PYARROW_DISPONIBLE:
+    # Types des champs connus d'une publication (ordre des colonnes)
+    SCHEMA_CORPUS = pa.schema([
+        ('id', pa.string()),
+        ('auteur', pa.string()),
+        ('plateforme', pa.string()),
+        ('texte', pa.string()),
+        ('date_publication', pa.string()),
+        ('hashtags', pa.list_(pa.string())),
+        ('likes', pa.int64()),
+        ('retweets_partages', pa.int64()),
+        ('commentaires', pa.int64()),
+        ('sentiment', pa.string()),
+        ('date_annotation', pa.string()),
+        ('annotation_auto', pa.bool_()),
+        ('texte_traite', pa.string()),
+    ])
+
+
+def chemin_parquet(chemin):
+    """Chemin Parquet associé à un fichier de corpus"""
+    return Path(chemin).with_suffix('.parquet')
+
+
+def ecrire_parquet(chemin, enregistrements, taille_bloc=50_000):
+    """
+    Écrit les publications en Parquet, par groupes de lignes
+    
+    Toutes les colonnes de SCHEMA_CORPUS sont écrites, nulles là où une
+    publication n'a pas le champ (un champ qui n'apparaît qu'après le premier
+    bloc, comme sentiment dans un corpus partiellement annoté, est donc
+    gardé) ; les champs inconnus restent uniquement dans le JSON.
+    
+    Args:
+        chemin: Fichier de corpus (.json/.jsonl) dont on écrit la version Parquet
+        enregistrements: Itérable de publications
+        taille_bloc: Nombre de publications par groupe de lignes
+    
+    Returns:
+        Chemin du fichier Parquet, ou None si pyarrow est absent
+    """
+    if not PYARROW_DISPONIBLE:
+        return None
+    
+    sortie = chemin_parquet(chemin)
+    temporaire = sortie.with_name(sortie.name + '.tmp')
+    enregistrements = iter(enregistrements)
+    writer = None
+    
+    try:
+        while True:
+            bloc = [item for _, item in zip(range(taille_bloc), enregistrements)]
+            if not bloc:
+                break
+            if writer is None:
+                writer = pq.ParquetWriter(str(temporaire), SCHEMA_CORPUS)
+            writer.write_table(pa.Table.from_pylist(bloc, schema=SCHEMA_CORPUS))
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if writer is None:
+        return None
+    os.replace(temporaire, sortie)
+    return sortie
+
+
+def charger_colonnes(chemin, colonnes):
+    """
+    Charge uniquement certaines colonnes d'un corpus dans un DataFrame
+    
+    Le Parquet est utilisé s'il existe et n'est pas plus ancien que le
+    .json/.jsonl ; sinon les publications sont lues en flux et seules les
+    colonnes demandées sont gardées. Une colonne absente du corpus est
+    remplie de valeurs manquantes.
+    
+    Args:
+        chemin: Chemin .json historique du corpus
+        colonnes: Liste des colonnes voulues
+    """
+    source = resoudre_corpus(chemin)
+    parquet = chemin_parquet(chemin)
+    
+    if (PYARROW_DISPONIBLE and parquet.exists()
+            and (not source.exists() or parquet.stat().st_mtime >= source.stat().st_mtime)):
+        disponibles = set(pq.read_schema(str(parquet)).names)
+        df = pq.read_table(str(parquet),
+                           columns=[c for c in colonnes if c in disponibles]).to_pandas()
+    else:
+        df = pd.DataFrame([{c: item[c] for c in colonnes if c in item}
+                           for item in lire_corpus(source)])
+    
+    return df.reindex(columns=colonnes)
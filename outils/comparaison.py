@@ -0,0 +1,129 @@
+"""
+Comparaison de modèles par bootstrap apparié
+
+Sur 60 publications de test, une publication vaut 1,7 point d'exactitude :
+le meilleur score de test change d'une exécution à l'autre sans différence
+réelle entre les modèles. Le test est donc rééchantillonné (avec remise) et
+tous les modèles sont évalués sur les mêmes tirages :
+
+- intervalle de confiance (percentile) de l'exactitude de chaque modèle ;
+- pour chaque paire de modèles, intervalle de l'écart d'exactitude et
+  p-valeur bilatérale du bootstrap apparié ;
+- modèle retenu : parmi les modèles que le bootstrap ne distingue pas du
+  meilleur score de test, celui qui a le meilleur score CV.
+
+Les tirages forment une matrice d'indices (rééchantillons x publications),
+convertie en comptes par np.bincount : les exactitudes de tous les modèles
+sur tous les rééchantillons sont un seul produit matriciel (par lots pour
+borner la mémoire).
+    
+    correct = np.stack([pred == y_test for pred in predictions.values()])
+    intervalles, paires = comparer_modeles(correct, list(predictions))
+"""
+
+import numpy as np
+import pandas as pd
+
+SEUIL_SIGNIFICATIVITE = 0.05
+
+
+def exactitudes_bootstrap(correct, n_reechantillons=10000, graine=42, taille_lot=None):
+    """
+    Exactitude de chaque modèle sur chaque rééchantillon du test
+    
+    Args:
+        correct: Matrice booléenne (modèles x publications) des prédictions correctes
+        n_reechantillons: Nombre de rééchantillons
+        graine: Graine des tirages (mêmes tirages pour tous les modèles)
+        taille_lot: Rééchantillons tirés à la fois (défaut : environ 4 millions d'indices)
+    
+    Returns:
+        Matrice (rééchantillons x modèles)
+    """
+    correct = np.asarray(correct, dtype=np.float64)
+    n = correct.shape[1]
+    generateur = np.random.default_rng(graine)
+    taille_lot = taille_lot or max(1, 2**22 // n)
+    
+    exactitudes = np.empty((n_reechantillons, correct.shape[0]))
+    for debut in range(0, n_reechantillons, taille_lot):
+        lot = min(taille_lot, n_reechantillons - debut)
+        indices = generateur.integers(0, n, size=(lot, n))
+        # Nombre de tirages de chaque publication dans chaque rééchantillon
+        comptes = np.bincount((np.arange(lot)[:, None] * n + indices).ravel(),
+                              minlength=lot * n).reshape(lot, n)
+        exactitudes[debut:debut + lot] = comptes @ correct.T / n
+    return exactitudes
+
+
+def comparer_modeles(correct, noms, n_reechantillons=10000, niveau=0.95, graine=42):
+    """
+    Intervalles de confiance et significativité de toutes les paires
+    
+    Args:
+        correct: Matrice booléenne (modèles x publications) des prédictions correctes
+        noms: Nom de chaque modèle, dans l'ordre des lignes
+        n_reechantillons: Nombre de rééchantillons
+        niveau: Niveau des intervalles de confiance
+        graine: Graine des tirages
+    
+    Returns:
+        DataFrame par modèle (Modèle, Exactitude, IC Bas, IC Haut) et
+        DataFrame par paire (Modèle A, Modèle B, Écart, IC Bas, IC Haut, p-valeur)
+    """
+    correct = np.asarray(correct, dtype=bool)
+    noms = np.asarray(noms, dtype=object)
+    exactitudes = exactitudes_bootstrap(correct, n_reechantillons, graine)
+    quantiles = [(1 - niveau) / 2, (1 + niveau) / 2]
+    
+    bornes = np.quantile(exactitudes, quantiles, axis=0)
+    intervalles = pd.DataFrame({
+        'Modèle': noms,
+        'Exactitude': correct.mean(axis=1),
+        'IC Bas': bornes[0],
+        'IC Haut': bornes[1]
+    })
+    
+    a, b = np.triu_indices(len(noms), k=1)
+    ecarts = exactitudes[:, a] - exactitudes[:, b]
+    bornes = np.quantile(ecarts, quantiles, axis=0)
+    # Bilatérale : deux fois la part des rééchantillons où l'écart change de signe
+    p_valeurs = np.minimum(1.0, 2 * np.minimum((ecarts <= 0).mean(axis=0), (ecarts >= 0).mean(axis=0)))
+    paires = pd.DataFrame({
+        'Modèle A': noms[a],
+        'Modèle B': noms[b],
+        'Écart': correct[a].mean(axis=1) - correct[b].mean(axis=1),
+        'IC Bas': bornes[0],
+        'IC Haut': bornes[1],
+        'p-valeur': p_valeurs
+    })
+    return intervalles, paires
+
+
+def choisir_modele(paires, scores_test, scores_cv, seuil=SEUIL_SIGNIFICATIVITE):
+    """
+    Modèle retenu au vu du bootstrap
+    
+    La référence est le premier meilleur score de test. Les modèles dont
+    l'écart avec elle n'est pas significatif (p-valeur >= seuil) sont ex
+    aequo ; le meilleur score CV les départage, puis le score de test.
+    
+    Args:
+        paires: DataFrame des paires (comparer_modeles)
+        scores_test: Dictionnaire {nom: exactitude de test}
+        scores_cv: Dictionnaire {nom: score de validation croisée}
+        seuil: Seuil de significativité
+    
+    Returns:
+        Nom du modèle retenu et liste des ex aequo (ordre d'origine)
+    """
+    reference = max(scores_test, key=scores_test.get)
+    p_valeurs = {}
+    for _, paire in paires.iterrows():
+        if reference in (paire['Modèle A'], paire['Modèle B']):
+            autre = paire['Modèle B'] if paire['Modèle A'] == reference else paire['Modèle A']
+            p_valeurs[autre] = paire['p-valeur']
+    
+    ex_aequo = [nom for nom in scores_test if nom == reference or p_valeurs[nom] >= seuil]
+    retenu = max(ex_aequo, key=lambda nom: (scores_cv[nom], scores_test[nom]))
+    return retenu, ex_aequo
@@ -0,0 +1,130 @@
+"""
+Lecture et écriture du corpus en flux (JSON Lines)
+
+Le format JSONL (une publication par ligne) se lit enregistrement par
+enregistrement : les étapes peuvent traiter des millions de publications
+en mémoire constante. Les anciens fichiers uvbf_data*.json (tableau JSON
+indenté) restent lisibles, mais doivent être chargés en entier.
+
+Conversion des fichiers existants :
+    python -m outils.corpus                    # tous les uvbf_data*.json du projet
+    python -m outils.corpus chemin/vers.json   # un fichier précis
+"""
+
+import os
+import sys
+import json
+import hashlib
+import textwrap
+from pathlib import Path
+
+
+def chemin_jsonl(chemin):
+    """Chemin JSONL associé à un fichier .json"""
+    return Path(chemin).with_suffix('.jsonl')
+
+
+def empreinte_texte(texte):
+    """Empreinte SHA-256 du texte brut d'une publication"""
+    return hashlib.sha256(texte.encode('utf-8')).hexdigest()
+
+
+def lire_corpus(chemin):
+    """
+    Itère sur les publications d'un fichier .jsonl ou .json
+    
+    Args:
+        chemin: Fichier JSONL (lu ligne par ligne) ou JSON (tableau)
+    
+    Yields:
+        Un dictionnaire par publication
+    """
+    chemin = Path(chemin)
+    with open(chemin, 'r', encoding='utf-8') as f:
+        if chemin.suffix == '.jsonl':
+            for ligne in f:
+                if ligne.strip():
+                    yield json.loads(ligne)
+        else:
+            yield from json.load(f)
+
+
+def ecrire_corpus(chemin, enregistrements):
+    """
+    Écrit des publications en flux, au format déduit de l'extension
+    
+    Le fichier .json produit est identique à json.dump(..., indent=2).
+    L'écriture passe par un fichier temporaire remplacé à la fin, ce qui
+    permet de relire le fichier de sortie pendant qu'on le réécrit.
+    
+    Returns:
+        Nombre de publications écrites
+    """
+    chemin = Path(chemin)
+    temporaire = chemin.with_name(chemin.name + '.tmp')
+    nombre = 0
+    
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        if chemin.suffix == '.jsonl':
+            for item in enregistrements:
+                f.write(json.dumps(item, ensure_ascii=False) + '\n')
+                nombre += 1
+        else:
+            for item in enregistrements:
+                f.write('[\n' if nombre == 0 else ',\n')
+                f.write(textwrap.indent(json.dumps(item, ensure_ascii=False, indent=2), '  '))
+                nombre += 1
+            f.write('\n]' if nombre else '[]')
+    
+    os.replace(temporaire, chemin)
+    return nombre
+
+
+def convertir_en_jsonl(chemin_json, chemin_sortie=None):
+    """Convertit un fichier uvbf_data*.json en JSONL"""
+    chemin_sortie = chemin_sortie or chemin_jsonl(chemin_json)
+    nombre = ecrire_corpus(chemin_sortie, lire_corpus(chemin_json))
+    print(f"✓ {chemin_json} → {chemin_sortie} ({nombre} publications)")
+    return chemin_sortie
+
+
+def resoudre_corpus(chemin, convertir=False):
+    """
+    Choisit le fichier à lire pour un corpus attendu en .json
+    
+    La version .jsonl est préférée si elle existe et n'est pas plus ancienne
+    que le .json (un .json réécrit depuis, par l'annotation par exemple, est
+    prioritaire).
+    
+    Args:
+        chemin: Chemin .json historique du corpus
+        convertir: Créer ou rafraîchir la version .jsonl si nécessaire
+    """
+    chemin = Path(chemin)
+    jsonl = chemin_jsonl(chemin)
+    
+    if not chemin.exists():
+        return jsonl
+    if jsonl.exists() and jsonl.stat().st_mtime >= chemin.stat().st_mtime:
+        return jsonl
+    if convertir:
+        return convertir_en_jsonl(chemin, jsonl)
+    return chemin
+
+
+def convertir_projet(projet_dir):
+    """Convertit tous les uvbf_data*.json du projet en JSONL"""
+    return [convertir_en_jsonl(chemin)
+            for chemin in sorted(Path(projet_dir).rglob('uvbf_data*.json'))]
+
+
+def main():
+    if len(sys.argv) > 1:
+        for chemin in sys.argv[1:]:
+            convertir_en_jsonl(Path(chemin))
+    else:
+        convertir_projet(Path(__file__).resolve().parent.parent)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Métriques de classification calculées en une passe
+
+Les prédictions de chaque modèle sont calculées une seule fois. Les matrices
+de confusion de tous les modèles sont comptées d'un coup (np.bincount sur
+les triplets modèle / vraie classe / classe prédite). Exactitude,
+précision, rappel, F1, moyennes macro et pondérée, rapport texte et CSV
+sont ensuite déduits de ces matrices, sans relire les étiquettes.
+
+Les valeurs et la mise en forme sont celles de accuracy_score,
+classification_report (zero_division=0) et confusion_matrix de scikit-learn.
+    
+    matrices = matrices_confusion(y_test, {'NB': pred_nb, 'RF': pred_rf}, n_classes=3)
+    print(rapport_texte(matrices['RF'], classes))
+    rapport_dataframe(matrices['RF'], classes).to_csv('rapport_metriques.csv')
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def matrices_confusion(y_vrai, predictions, n_classes):
+    """
+    Matrices de confusion de plusieurs modèles en un seul comptage
+    
+    Args:
+        y_vrai: Classes encodées (entiers de 0 à n_classes - 1)
+        predictions: Dictionnaire {nom: classes prédites encodées}
+        n_classes: Nombre de classes
+    
+    Returns:
+        Dictionnaire {nom: matrice (vraie classe x classe prédite)}
+    """
+    noms = list(predictions)
+    y_vrai = np.asarray(y_vrai, dtype=np.int64)
+    y_pred = np.stack([np.asarray(predictions[nom], dtype=np.int64) for nom in noms])
+    
+    codes = (np.arange(len(noms))[:, None] * n_classes + y_vrai) * n_classes + y_pred
+    comptes = np.bincount(codes.ravel(), minlength=len(noms) * n_classes * n_classes)
+    return dict(zip(noms, comptes.reshape(len(noms), n_classes, n_classes)))
+
+
+def matrice_confusion(y_vrai, y_pred, n_classes):
+    """Matrice de confusion d'un seul modèle"""
+    return matrices_confusion(y_vrai, {None: y_pred}, n_classes)[None]
+
+
+def _division(numerateur, denominateur):
+    """Division élément par élément, 0 quand le dénominateur est nul (zero_division=0)"""
+    numerateur = np.asarray(numerateur, dtype=np.float64)
+    denominateur = np.asarray(denominateur, dtype=np.float64)
+    return np.divide(numerateur, denominateur, out=np.zeros_like(numerateur),
+                     where=denominateur != 0)
+
+
+def metriques(matrice):
+    """
+    Métriques déduites d'une matrice de confusion
+    
+    Returns:
+        Dictionnaire : 'exactitude', 'precision', 'rappel', 'f1', 'support'
+        (par classe), 'macro' et 'ponderee' (précision, rappel, F1)
+    """
+    matrice = np.asarray(matrice)
+    vrais_positifs = np.diag(matrice)
+    support = matrice.sum(axis=1)
+    predits = matrice.sum(axis=0)
+    total = support.sum()
+    
+    precision = _division(vrais_positifs, predits)
+    rappel = _division(vrais_positifs, support)
+    # Même formule que scikit-learn : 2 VP / (2 VP + FP + FN)
+    f1 = _division(2 * vrais_positifs, support + predits)
+    
+    scores = np.stack([precision, rappel, f1])
+    return {
+        'exactitude': vrais_positifs.sum() / total if total else 0.0,
+        'precision': precision,
+        'rappel': rappel,
+        'f1': f1,
+        'support': support,
+        'macro': scores.mean(axis=1),
+        'ponderee': (scores * support).sum(axis=1) / total if total else np.zeros(3)
+    }
+
+
+def rapport_dataframe(matrice, classes):
+    """
+    Rapport par classe, comme pd.DataFrame(classification_report(..., output_dict=True)).transpose()
+    
+    Args:
+        matrice: Matrice de confusion
+        classes: Nom de chaque classe, dans l'ordre des lignes de la matrice
+    """
+    m = metriques(matrice)
+    lignes = {str(nom): [m['precision'][i], m['rappel'][i], m['f1'][i], float(m['support'][i])]
+              for i, nom in enumerate(classes)}
+    total = float(m['support'].sum())
+    lignes['accuracy'] = [m['exactitude']] * 4
+    lignes['macro avg'] = [*m['macro'], total]
+    lignes['weighted avg'] = [*m['ponderee'], total]
+    return pd.DataFrame.from_dict(lignes, orient='index',
+                                  columns=['precision', 'recall', 'f1-score', 'support'])
+
+
+def rapport_texte(matrice, classes, decimales=2):
+    """Rapport texte, mis en forme comme classification_report"""
+    m = metriques(matrice)
+    classes = [str(nom) for nom in classes]
+    total = int(m['support'].sum())
+    largeur = max(max(len(nom) for nom in classes), len('weighted avg'), decimales)
+    
+    entete = "{:>{largeur}s} " + " {:>9}" * 4
+    ligne = "{:>{largeur}s} " + " {:>9.{decimales}f}" * 3 + " {:>9}\n"
+    texte = entete.format('', 'precision', 'recall', 'f1-score', 'support', largeur=largeur) + "\n\n"
+    for i, nom in enumerate(classes):
+        texte += ligne.format(nom, m['precision'][i], m['rappel'][i], m['f1'][i], int(m['support'][i]),
+                              largeur=largeur, decimales=decimales)
+    texte += "\n"
+    texte += ("{:>{largeur}s} " + " {:>9}" * 2 + " {:>9.{decimales}f} {:>9}\n").format(
+        'accuracy', '', '', m['exactitude'], total, largeur=largeur, decimales=decimales)
+    texte += ligne.format('macro avg', *m['macro'], total, largeur=largeur, decimales=decimales)
+    texte += ligne.format('weighted avg', *m['ponderee'], total, largeur=largeur, decimales=decimales)
+    return texte
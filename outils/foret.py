@@ -0,0 +1,160 @@
+"""
+Forêt aléatoire à mémoire bornée
+
+Une RandomForestClassifier aux arbres complètement développés grossit avec
+le corpus : sur 100 000 publications bruitées, chaque arbre compte environ
+85 000 nœuds et 100 arbres occupent plus de 700 Mo.
+ForetBornee ajoute à la forêt scikit-learn :
+
+- des budgets par arbre (max_depth, min_samples_leaf, max_samples) ;
+- une construction par lots de taille_lot arbres (warm_start), les arbres
+  d'un lot étant construits en parallèle (n_jobs, threads) ;
+- un plafond mémoire : après chaque lot, la taille réelle des arbres est
+  mesurée et la construction s'arrête avant que la matrice d'entrée, la
+  forêt et le lot suivant ne dépassent memoire_max_mo ;
+- un rapport (rapport_) : nœuds, profondeur et taille des arbres, temps par
+  arbre, pic mémoire du processus.
+
+Sans plafond atteint, les arbres sont ceux de RandomForestClassifier avec les
+mêmes paramètres (warm_start tire les mêmes graines qu'un ajustement unique).
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.ensemble import RandomForestClassifier
+
+try:
+    import resource
+    RESOURCE_DISPONIBLE = True
+except ImportError:  # Windows
+    RESOURCE_DISPONIBLE = False
+
+
+def pic_memoire_mo():
+    """Pic de mémoire résidente du processus en Mo (None si indisponible)"""
+    if not RESOURCE_DISPONIBLE:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+    return pic / 2**20 if sys.platform == 'darwin' else pic / 2**10
+
+
+def octets_arbre(arbre):
+    """Taille en octets des nœuds et des valeurs d'un arbre ajusté"""
+    etat = arbre.tree_.__getstate__()
+    return etat['nodes'].nbytes + etat['values'].nbytes
+
+
+def octets_entree(X):
+    """Taille de la copie de X utilisée par les arbres (CSC ou dense, float32)"""
+    if sparse.issparse(X):
+        return X.nnz * 8 + (X.shape[1] + 1) * 8
+    return X.shape[0] * X.shape[1] * 4
+
+
+class ForetBornee(ClassifierMixin, BaseEstimator):
+    """RandomForestClassifier construite par lots, avec budgets et plafond mémoire"""
+    
+    def __init__(self, n_estimators=100, max_depth=None, min_samples_leaf=1, max_features='sqrt',
+                 max_samples=None, memoire_max_mo=None, taille_lot=None, n_jobs=1,
+                 random_state=None):
+        """
+        Args:
+            n_estimators: Nombre d'arbres visé
+            max_depth: Profondeur maximale des arbres (None : illimitée)
+            min_samples_leaf: Nombre minimal de publications par feuille
+            max_features: Features tirées à chaque nœud
+            max_samples: Part (ou nombre) des publications tirées pour chaque arbre
+            memoire_max_mo: Plafond mémoire de l'entrée et de la forêt, en Mo (None : aucun)
+            taille_lot: Arbres construits par lot (défaut : 10)
+            n_jobs: Threads de construction des arbres d'un lot (-1 : tous les cœurs)
+            random_state: Graine de la forêt
+        """
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.max_features = max_features
+        self.max_samples = max_samples
+        self.memoire_max_mo = memoire_max_mo
+        self.taille_lot = taille_lot
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+    
+    def fit(self, X, y):
+        """Construit la forêt par lots et remplit rapport_"""
+        # Conversion unique au format des arbres (sinon refaite à chaque lot)
+        X = X.tocsc().astype(np.float32) if sparse.issparse(X) else np.asarray(X, dtype=np.float32)
+        
+        self.foret_ = RandomForestClassifier(
+            n_estimators=0, max_depth=self.max_depth, min_samples_leaf=self.min_samples_leaf,
+            max_features=self.max_features, max_samples=self.max_samples,
+            bootstrap=True, n_jobs=self.n_jobs, random_state=self.random_state, warm_start=True
+        )
+        
+        plafond = self.memoire_max_mo * 2**20 if self.memoire_max_mo else None
+        taille_lot = self.taille_lot or 10
+        entree = octets_entree(X)
+        tailles, noeuds, profondeurs, temps = [], [], [], []
+        arret_memoire = False
+        
+        while len(tailles) < self.n_estimators:
+            lot = min(taille_lot, self.n_estimators - len(tailles))
+            # Un arbre en construction peut occuper le double de sa taille finale
+            if plafond and tailles and entree + sum(tailles) + 2 * lot * max(tailles) > plafond:
+                arret_memoire = True
+                break
+            
+            debut = time.time()
+            self.foret_.set_params(n_estimators=len(tailles) + lot).fit(X, y)
+            duree = time.time() - debut
+            
+            for arbre in self.foret_.estimators_[len(tailles):]:
+                tailles.append(octets_arbre(arbre))
+                noeuds.append(arbre.tree_.node_count)
+                profondeurs.append(arbre.tree_.max_depth)
+                temps.append(duree / lot)
+        
+        self.classes_ = self.foret_.classes_
+        self.n_features_in_ = self.foret_.n_features_in_
+        self.rapport_ = {
+            'arbres': len(tailles),
+            'noeuds_moyens': float(np.mean(noeuds)),
+            'profondeur_moyenne': float(np.mean(profondeurs)),
+            'octets_arbre_max': max(tailles),
+            'octets_foret': sum(tailles),
+            'octets_entree': entree,
+            'temps_par_arbre': float(np.mean(temps)),
+            'pic_memoire_mo': pic_memoire_mo(),
+            'arret_memoire': arret_memoire
+        }
+        return self
+    
+    @property
+    def estimators_(self):
+        return self.foret_.estimators_
+    
+    @property
+    def feature_importances_(self):
+        return self.foret_.feature_importances_
+    
+    def predict_proba(self, X):
+        return self.foret_.predict_proba(X)
+    
+    def predict(self, X):
+        return self.foret_.predict(X)
+
+
+def resume_rapport(rapport):
+    """Résumé d'une ligne du rapport d'une ForetBornee"""
+    resume = (f"{rapport['arbres']} arbres, {rapport['noeuds_moyens']:.0f} nœuds et profondeur "
+              f"{rapport['profondeur_moyenne']:.1f} en moyenne, {rapport['octets_foret'] / 2**20:.1f} Mo, "
+              f"{rapport['temps_par_arbre'] * 1000:.0f} ms/arbre")
+    if rapport['pic_memoire_mo'] is not None:
+        resume += f", pic {rapport['pic_memoire_mo']:.0f} Mo"
+    if rapport['arret_memoire']:
+        resume += " (arrêt : plafond mémoire)"
+    return resume
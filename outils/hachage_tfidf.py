@@ -0,0 +1,183 @@
+"""
+Vectorisation TF-IDF par hachage, en flux
+
+Le TfidfVectorizer classique garde un dictionnaire du vocabulaire en mémoire
+et doit voir tout le corpus d'un coup. Ici les termes (unigrammes et
+bigrammes) sont hachés dans un espace de taille fixe : seul un compteur de
+fréquence documentaire par colonne est conservé, mis à jour bloc par bloc
+avec partial_fit lorsque de nouvelles publications arrivent, et avec retirer
+lorsqu'une publication est modifiée ou supprimée.
+
+La pondération reproduit celle de TfidfVectorizer (idf lissé, norme L2),
+avec les mêmes filtres min_df / max_df appliqués au moment du transform.
+"""
+
+import numbers
+from itertools import islice
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class VectoriseurHachageTFIDF:
+    """TF-IDF sur features hachées, ajustable par blocs"""
+    
+    def __init__(self, n_features=2**18, ngram_range=(1, 2), min_df=1, max_df=1.0, norm='l2'):
+        """
+        Initialise le vectoriseur
+        
+        Args:
+            n_features: Nombre de colonnes de l'espace haché
+            ngram_range: Taille des n-grammes, comme TfidfVectorizer
+            min_df: Fréquence documentaire minimale (entier : nombre de documents,
+                réel dans [0, 1] : proportion des documents)
+            max_df: Fréquence documentaire maximale (même convention)
+            norm: Normalisation des lignes ('l2', 'l1' ou None)
+        """
+        for nom, valeur in (('min_df', min_df), ('max_df', max_df)):
+            if not isinstance(valeur, numbers.Integral) and not 0.0 <= valeur <= 1.0:
+                raise ValueError(f"{nom} réel doit être dans [0, 1] (reçu {valeur})")
+        
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+        self.max_df = max_df
+        self.norm = norm
+        
+        self.hacheur = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=ngram_range,
+            alternate_sign=False,
+            norm=None
+        )
+        self.frequences_documents_ = np.zeros(n_features, dtype=np.int32)
+        self.n_documents_ = 0
+    
+    def _frequences_bloc(self, textes):
+        """Fréquences documentaires d'un bloc de textes, et nombre de textes"""
+        comptes = self.hacheur.transform(textes).tocsr()
+        comptes.sum_duplicates()
+        return np.bincount(comptes.indices, minlength=self.n_features).astype(np.int32), comptes.shape[0]
+    
+    def partial_fit(self, textes):
+        """Ajoute un bloc de textes aux fréquences documentaires"""
+        frequences, n_documents = self._frequences_bloc(textes)
+        self.frequences_documents_ += frequences
+        self.n_documents_ += n_documents
+        return self
+    
+    def retirer(self, textes):
+        """
+        Retire un bloc de textes déjà comptés par fit / partial_fit
+        
+        Les textes doivent être exactement ceux qui avaient été ajoutés
+        (ancienne version d'une publication modifiée, publication supprimée) :
+        les fréquences reviennent alors à celles d'un fit sans eux.
+        """
+        frequences, n_documents = self._frequences_bloc(textes)
+        if n_documents > self.n_documents_ or np.any(frequences > self.frequences_documents_):
+            raise ValueError("Textes à retirer absents des fréquences documentaires")
+        self.frequences_documents_ -= frequences
+        self.n_documents_ -= n_documents
+        return self
+    
+    def fit(self, textes, taille_bloc=10_000):
+        """Calcule les fréquences documentaires en lisant les textes par blocs"""
+        self.frequences_documents_[:] = 0
+        self.n_documents_ = 0
+        textes = iter(textes)
+        while True:
+            bloc = list(islice(textes, taille_bloc))
+            if not bloc:
+                return self
+            self.partial_fit(bloc)
+    
+    @property
+    def idf_(self):
+        """Idf lissé, comme TfidfTransformer(smooth_idf=True)"""
+        return np.log((1 + self.n_documents_) / (1 + self.frequences_documents_)) + 1
+    
+    def _seuil_documents(self, valeur):
+        """Nombre de documents d'un seuil min_df / max_df (entier ou proportion)"""
+        if isinstance(valeur, numbers.Integral):
+            return valeur
+        return valeur * self.n_documents_
+    
+    def _masque_colonnes(self):
+        """Colonnes gardées par les filtres min_df / max_df"""
+        return ((self.frequences_documents_ >= self._seuil_documents(self.min_df))
+                & (self.frequences_documents_ <= self._seuil_documents(self.max_df)))
+    
+    def transform(self, textes):
+        """Matrice TF-IDF creuse (documents × n_features)"""
+        matrice = self.hacheur.transform(textes).tocsr()
+        matrice.sum_duplicates()
+        
+        poids = np.where(self._masque_colonnes(), self.idf_, 0.0)
+        matrice.data *= poids[matrice.indices]
+        matrice.eliminate_zeros()
+        
+        if self.norm:
+            matrice = normalize(matrice, norm=self.norm, copy=False)
+        return matrice
+    
+    def transform_flux(self, textes, taille_bloc=10_000):
+        """Transforme un itérable de textes bloc par bloc et empile le résultat"""
+        textes = iter(textes)
+        blocs = []
+        while True:
+            bloc = list(islice(textes, taille_bloc))
+            if not bloc:
+                break
+            blocs.append(self.transform(bloc))
+        if not blocs:
+            return sparse.csr_matrix((0, self.n_features))
+        return sparse.vstack(blocs, format='csr')
+    
+    def fit_transform(self, textes):
+        textes = list(textes)
+        return self.fit(textes).transform(textes)
+    
+    def termes_colonnes(self, textes, colonnes=None, taille_bloc=10_000):
+        """
+        Retrouve les n-grammes derrière les colonnes hachées
+        
+        Le hachage n'est pas inversible : on re-hache les n-grammes des textes
+        fournis, bloc par bloc. Seuls les noms des colonnes demandées sont
+        gardés, jamais le vocabulaire complet. Les collisions sont jointes
+        par '|'.
+        
+        Args:
+            textes: Itérable de textes
+            colonnes: Colonnes à nommer (None : celles gardées par min_df / max_df)
+            taille_bloc: Nombre de textes analysés à la fois
+        
+        Returns:
+            Dictionnaire {colonne: terme(s)}
+        """
+        if colonnes is None:
+            voulues = self._masque_colonnes()
+        else:
+            voulues = np.zeros(self.n_features, dtype=bool)
+            voulues[np.asarray(colonnes, dtype=np.int64)] = True
+        
+        analyseur = self.hacheur.build_analyzer()
+        hacheur_termes = FeatureHasher(n_features=self.n_features, input_type='string',
+                                       alternate_sign=False)
+        noms = {}
+        textes = iter(textes)
+        while True:
+            bloc = list(islice(textes, taille_bloc))
+            if not bloc:
+                break
+            termes = list(set().union(*(analyseur(texte) for texte in bloc)))
+            if not termes:
+                continue
+            indices = hacheur_termes.transform([[terme] for terme in termes]).indices
+            for terme, colonne in zip(termes, indices):
+                if voulues[colonne]:
+                    noms.setdefault(int(colonne), set()).add(terme)
+        return {colonne: '|'.join(sorted(liste)) for colonne, liste in noms.items()}
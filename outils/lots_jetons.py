@@ -0,0 +1,80 @@
+"""
+Lots de textes bornés par un budget de jetons
+
+Un lot est complété (padding) jusqu'à son texte le plus long. En lots fixes
+dans l'ordre d'entrée, une publication Facebook de 400 jetons impose 400
+jetons à chacun des 15 tweets de son lot. Les textes sont ici triés par
+longueur et regroupés tant que len(lot) x plus longue longueur reste dans le
+budget et que le plus long texte du lot ne dépasse pas ecart_max fois le plus
+court (à marge_jetons près) : les lots de tweets sont gros, les textes longs
+passent en petits lots, et le padding devient marginal.
+
+Les lots sont des tableaux d'indices dans la liste d'origine : écrire
+resultat[lot] = sorties remet chaque ligne à sa place.
+    
+    lots = planifier_lots(longueurs, budget_jetons=8192)
+    print(statistiques_lots(longueurs, lots)['part_padding'])
+"""
+
+import numpy as np
+
+# 16 textes de 512 jetons : le plus gros lot des anciens lots fixes
+BUDGET_JETONS = 8192
+
+
+def lots_fixes(n_textes, taille_lot):
+    """Lots consécutifs de taille_lot textes, dans l'ordre d'entrée"""
+    return [np.arange(debut, min(debut + taille_lot, n_textes))
+            for debut in range(0, n_textes, taille_lot)]
+
+
+def planifier_lots(longueurs, budget_jetons=BUDGET_JETONS, taille_max=128, ecart_max=1.25,
+                   marge_jetons=8):
+    """
+    Regroupe les textes de longueurs proches sous un budget de jetons
+    
+    Args:
+        longueurs: Nombre de jetons de chaque texte (après troncature)
+        budget_jetons: Jetons par lot, padding compris (len(lot) x plus longue longueur)
+        taille_max: Nombre maximal de textes par lot
+        ecart_max: Rapport maximal entre le plus long et le plus court texte d'un lot
+        marge_jetons: Écart toléré en plus (textes très courts)
+    
+    Returns:
+        Liste de tableaux d'indices, les lots les plus longs en premier
+        (un dépassement mémoire apparaît dès le premier lot)
+    """
+    longueurs = np.asarray(longueurs)
+    ordre = np.argsort(longueurs, kind='stable')
+    
+    lots = []
+    debut = 0
+    while debut < len(ordre):
+        fin = debut + 1
+        # Triés par longueur croissante : le dernier texte ajouté fixe le padding
+        while (fin < len(ordre) and fin - debut < taille_max
+               and (fin - debut + 1) * longueurs[ordre[fin]] <= budget_jetons
+               and longueurs[ordre[fin]] <= ecart_max * longueurs[ordre[debut]] + marge_jetons):
+            fin += 1
+        lots.append(ordre[debut:fin])
+        debut = fin
+    return lots[::-1]
+
+
+def statistiques_lots(longueurs, lots):
+    """
+    Jetons utiles et jetons calculés (padding compris) d'un découpage en lots
+    
+    Returns:
+        Dictionnaire : 'lots', 'jetons', 'jetons_calcules', 'part_padding'
+        (part des jetons calculés qui sont du padding)
+    """
+    longueurs = np.asarray(longueurs)
+    jetons = int(longueurs.sum())
+    jetons_calcules = int(sum(len(lot) * longueurs[lot].max() for lot in lots))
+    return {
+        'lots': len(lots),
+        'jetons': jetons,
+        'jetons_calcules': jetons_calcules,
+        'part_padding': 1 - jetons / jetons_calcules if jetons_calcules else 0.0
+    }
@@ -0,0 +1,143 @@
+"""
+Export creux des résultats TF-IDF
+
+Un export est composé de trois fichiers partageant un préfixe :
+- <prefixe>.npz : matrice CSR (scipy.sparse.save_npz)
+- <prefixe>_vocabulaire.json : terme de chaque colonne, dans l'ordre
+- <prefixe>_index.csv : une ligne de métadonnées (id, plateforme...) par ligne de la matrice
+
+La taille ne dépend que du nombre de valeurs non nulles, contrairement à
+l'ancien CSV dense (documents × vocabulaire).
+
+Conversion de l'ancien export :
+    python -m outils.matrice_creuse 04_Vectorisation/uvbf_tfidf_resultats_complets.csv
+"""
+
+import sys
+import csv
+import json
+from pathlib import Path
+
+import pandas as pd
+from scipy import sparse
+
+# Colonnes de métadonnées possibles en tête de l'ancien CSV dense
+COLONNES_META = ['id', 'plateforme', 'auteur', 'sentiment', 'texte']
+
+
+def nombre_colonnes_meta(entete):
+    """
+    Nombre de colonnes de métadonnées en tête de l'ancien CSV dense
+    
+    L'ancien export écrivait les métadonnées puis les termes : ce sont les
+    premières colonnes, chacune un nom distinct de COLONNES_META. Un terme
+    portant le même nom qu'une métadonnée (ex: plateforme) vient après et
+    reste un terme.
+    """
+    vus = set()
+    for nom in entete:
+        if nom not in COLONNES_META or nom in vus:
+            break
+        vus.add(nom)
+    return len(vus)
+
+
+def chemins_export(dossier, prefixe):
+    """Chemins (matrice, vocabulaire, index) d'un export"""
+    dossier = Path(dossier)
+    return (dossier / f'{prefixe}.npz',
+            dossier / f'{prefixe}_vocabulaire.json',
+            dossier / f'{prefixe}_index.csv')
+
+
+def exporter_matrice_creuse(dossier, prefixe, matrice, termes, metadonnees):
+    """
+    Exporte une matrice TF-IDF creuse avec son vocabulaire et son index
+    
+    Args:
+        dossier: Dossier de sortie
+        prefixe: Préfixe des fichiers (ex: uvbf_tfidf)
+        matrice: Matrice scipy.sparse (documents × termes)
+        termes: Terme de chaque colonne
+        metadonnees: DataFrame aligné sur les lignes de la matrice
+    """
+    if matrice.shape != (len(metadonnees), len(termes)):
+        raise ValueError(
+            f"Dimensions incohérentes : matrice {matrice.shape}, "
+            f"{len(metadonnees)} lignes d'index, {len(termes)} termes"
+        )
+    
+    chemin_matrice, chemin_vocabulaire, chemin_index = chemins_export(dossier, prefixe)
+    sparse.save_npz(chemin_matrice, sparse.csr_matrix(matrice), compressed=True)
+    with open(chemin_vocabulaire, 'w', encoding='utf-8') as f:
+        json.dump([str(terme) for terme in termes], f, ensure_ascii=False)
+    metadonnees.to_csv(chemin_index, index=False)
+    
+    return chemin_matrice, chemin_vocabulaire, chemin_index
+
+
+def charger_matrice_creuse(dossier, prefixe):
+    """
+    Charge un export creux sans jamais densifier la matrice
+    
+    Returns:
+        (matrice CSR, DataFrame des métadonnées aligné sur les lignes, liste des termes)
+    """
+    chemin_matrice, chemin_vocabulaire, chemin_index = chemins_export(dossier, prefixe)
+    matrice = sparse.load_npz(chemin_matrice).tocsr()
+    with open(chemin_vocabulaire, 'r', encoding='utf-8') as f:
+        termes = json.load(f)
+    metadonnees = pd.read_csv(chemin_index, dtype=str, keep_default_na=False)
+    
+    if matrice.shape != (len(metadonnees), len(termes)):
+        raise ValueError(f"Export {prefixe} incohérent : matrice {matrice.shape}")
+    
+    return matrice, metadonnees, termes
+
+
+def convertir_csv_dense(chemin_csv, dossier=None, prefixe='uvbf_tfidf', taille_bloc=1000, n_meta=None):
+    """
+    Convertit l'ancien export CSV dense en export creux
+    
+    L'en-tête est lu tel quel (pandas renommerait un terme en double, comme
+    plateforme, en plateforme.1) et les colonnes sont séparées par position.
+    Le CSV est lu par blocs de lignes : seul un bloc est dense en mémoire.
+    
+    Args:
+        n_meta: Nombre de colonnes de métadonnées en tête (None : déduit de l'en-tête)
+    """
+    chemin_csv = Path(chemin_csv)
+    dossier = Path(dossier) if dossier else chemin_csv.parent
+    
+    with open(chemin_csv, 'r', encoding='utf-8', newline='') as f:
+        entete = next(csv.reader(f))
+    if n_meta is None:
+        n_meta = nombre_colonnes_meta(entete)
+    colonnes_meta, termes = entete[:n_meta], entete[n_meta:]
+    
+    blocs = []
+    metadonnees = []
+    for bloc in pd.read_csv(chemin_csv, header=None, skiprows=1, chunksize=taille_bloc,
+                            dtype=str, keep_default_na=False):
+        meta = bloc.iloc[:, :n_meta]
+        meta.columns = colonnes_meta
+        metadonnees.append(meta)
+        blocs.append(sparse.csr_matrix(bloc.iloc[:, n_meta:].astype(float).to_numpy()))
+    
+    matrice = sparse.vstack(blocs, format='csr')
+    chemins = exporter_matrice_creuse(dossier, prefixe, matrice, termes,
+                                      pd.concat(metadonnees, ignore_index=True))
+    
+    print(f"✓ {chemin_csv} ({chemin_csv.stat().st_size / 1024:.0f} Ko) converti :")
+    for chemin in chemins:
+        print(f"  - {chemin} ({chemin.stat().st_size / 1024:.0f} Ko)")
+    return chemins
+
+
+def main():
+    for chemin in sys.argv[1:]:
+        convertir_csv_dense(chemin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Export compact du modèle de sentiment, relu sans scikit-learn
+
+Le pickle d'un estimateur scikit-learn contient tout l'objet Python ; celui
+d'une forêt aléatoire est volumineux et son chargement importe scikit-learn.
+L'export compact est un unique fichier .npz de tableaux numpy :
+
+- modèles linéaires (LogisticRegression, LinearSVC, SGDClassifier,
+  MultinomialNB) : matrice de poids float32 et biais, sans les colonnes dont
+  tous les poids sont nuls ;
+- forêts et arbres de décision : nœuds de tous les arbres aplatis (enfants,
+  feature, seuil, distribution des classes), sans les colonnes jamais
+  utilisées par un nœud ;
+- le vocabulaire et l'idf d'un TfidfVectorizer, pour prédire directement sur
+  des textes (tout le vocabulaire est gardé : il faut pour la norme L2).
+
+Le chargement (charger_modele_compact) n'utilise que numpy, scipy et re.
+    
+    exporter_modele_compact(modele, encodeur, vectoriseur, 'modele_sentiment.npz')
+    modele = charger_modele_compact('modele_sentiment.npz')
+    modele.predict(X_test)              # matrice de features de l'étape 4
+    modele.predire_textes(['...'])      # étiquettes, à partir des textes prétraités
+"""
+
+import re
+import json
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+# Paramètres de TfidfVectorizer reproduits par predire_textes (valeurs imposées ailleurs)
+PARAMETRES_TEXTE_IMPOSES = {'analyzer': 'word', 'strip_accents': None, 'stop_words': None,
+                            'preprocessor': None, 'tokenizer': None, 'binary': False,
+                            'use_idf': True}
+
+
+def _poids_lineaires(modele):
+    """(poids, biais, type de probabilités) d'un modèle linéaire, ou None"""
+    nom = type(modele).__name__
+    if nom == 'MultinomialNB':
+        return modele.feature_log_prob_, modele.class_log_prior_, 'softmax'
+    if nom not in ('LogisticRegression', 'LinearSVC', 'SGDClassifier'):
+        return None
+    
+    if nom == 'LogisticRegression':
+        probabilites = 'logistique' if modele.coef_.shape[0] == 1 else 'softmax'
+    elif nom == 'SGDClassifier' and modele.loss == 'log_loss':
+        probabilites = 'logistique' if modele.coef_.shape[0] == 1 else 'ovr'
+    elif nom == 'SGDClassifier' and modele.loss == 'modified_huber':
+        probabilites = 'huber'
+    else:
+        probabilites = ''
+    return modele.coef_, np.atleast_1d(modele.intercept_), probabilites
+
+
+def _seuils_float32(seuils):
+    """
+    Seuils float32 équivalents aux seuils float64 des arbres
+    
+    Les arbres comparent des features float32 au seuil float64 ; le plus grand
+    float32 inférieur ou égal au seuil donne exactement les mêmes décisions.
+    """
+    seuils32 = seuils.astype(np.float32)
+    trop_grands = seuils32.astype(np.float64) > seuils
+    seuils32[trop_grands] = np.nextafter(seuils32[trop_grands], np.float32(-np.inf))
+    return seuils32
+
+
+def _tableaux_arbres(modele):
+    """Nœuds aplatis d'une forêt ou d'un arbre de décision, ou None"""
+    nom = type(modele).__name__
+    if nom in ('RandomForestClassifier', 'ExtraTreesClassifier', 'ForetBornee'):
+        arbres = [estimateur.tree_ for estimateur in modele.estimators_]
+    elif nom in ('DecisionTreeClassifier', 'ExtraTreeClassifier'):
+        arbres = [modele.tree_]
+    else:
+        return None
+    
+    racines = np.cumsum([0] + [arbre.node_count for arbre in arbres[:-1]])
+    gauche = np.concatenate([np.where(a.children_left >= 0, a.children_left + r, -1)
+                             for a, r in zip(arbres, racines)])
+    droite = np.concatenate([np.where(a.children_right >= 0, a.children_right + r, -1)
+                             for a, r in zip(arbres, racines)])
+    valeurs = np.concatenate([a.value[:, 0, :] for a in arbres])
+    valeurs = valeurs / valeurs.sum(axis=1, keepdims=True)
+    return {
+        'racines': racines.astype(np.int32),
+        'gauche': gauche.astype(np.int32),
+        'droite': droite.astype(np.int32),
+        'feature': np.concatenate([np.maximum(a.feature, 0) for a in arbres]).astype(np.int64),
+        'seuil': _seuils_float32(np.concatenate([a.threshold for a in arbres])),
+        'valeurs': valeurs.astype(np.float32)
+    }
+
+
+def _vocabulaire(vectoriseur):
+    """Tableaux et paramètres d'un TfidfVectorizer pour predire_textes, ou {}"""
+    if type(vectoriseur).__name__ != 'TfidfVectorizer':
+        return {}
+    parametres = vectoriseur.get_params()
+    if any(parametres.get(nom) != valeur for nom, valeur in PARAMETRES_TEXTE_IMPOSES.items()):
+        return {}
+    
+    termes = sorted(vectoriseur.vocabulary_, key=vectoriseur.vocabulary_.get)
+    texte = {nom: parametres[nom] for nom in ('lowercase', 'token_pattern', 'norm', 'sublinear_tf')}
+    texte['ngram_range'] = list(parametres['ngram_range'])
+    return {
+        # Termes joints par '\n' (absent des tokens) : bien plus compact qu'un tableau de chaînes
+        'termes': np.frombuffer('\n'.join(termes).encode('utf-8'), dtype=np.uint8),
+        'idf': vectoriseur.idf_.astype(np.float32),
+        'texte': texte
+    }
+
+
+def exporter_modele_compact(modele, encodeur, vectoriseur, chemin):
+    """
+    Écrit l'export compact d'un modèle ajusté
+    
+    Args:
+        modele: Modèle linéaire, forêt ou arbre de décision ajusté
+        encodeur: LabelEncoder des sentiments (étiquettes des classes)
+        vectoriseur: Vectoriseur de l'étape 4 (vocabulaire gardé si TfidfVectorizer)
+        chemin: Fichier .npz de sortie
+    
+    Returns:
+        Chemin écrit
+    
+    Raises:
+        ValueError: Type de modèle non pris en charge (garder le pickle)
+    """
+    n_features = modele.n_features_in_
+    meta = {'modele': type(modele).__name__, 'n_features': int(n_features)}
+    tableaux = {'classes': np.asarray(modele.classes_),
+                'etiquettes': np.asarray(encodeur.classes_, dtype=str)}
+    
+    lineaire = _poids_lineaires(modele)
+    arbres = _tableaux_arbres(modele) if lineaire is None else None
+    if lineaire is not None:
+        poids, biais, probabilites = lineaire
+        colonnes = np.flatnonzero(np.any(poids != 0, axis=0))
+        meta.update({'type': 'lineaire', 'probabilites': probabilites})
+        tableaux.update({'poids': poids[:, colonnes].astype(np.float32),
+                         'biais': biais.astype(np.float32)})
+    elif arbres is not None:
+        # Colonnes utilisées par au moins un nœud interne, renumérotées
+        internes = arbres['gauche'] >= 0
+        colonnes = np.unique(arbres['feature'][internes])
+        arbres['feature'] = np.searchsorted(colonnes, arbres['feature']).astype(np.int32)
+        arbres['feature'][~internes] = 0
+        meta['type'] = 'arbres'
+        tableaux.update(arbres)
+    else:
+        raise ValueError(f"Export compact non pris en charge pour {type(modele).__name__}")
+    
+    tableaux['colonnes'] = colonnes.astype(np.int32)
+    vocabulaire = _vocabulaire(vectoriseur)
+    if vocabulaire:
+        if len(vocabulaire['idf']) != n_features:
+            raise ValueError("Le vectoriseur ne correspond pas au modèle")
+        meta['texte'] = vocabulaire.pop('texte')
+        tableaux.update(vocabulaire)
+    
+    tableaux['meta'] = np.array(json.dumps(meta, ensure_ascii=False))
+    chemin = Path(chemin)
+    with open(chemin, 'wb') as f:
+        np.savez(f, **tableaux)
+    return chemin
+
+
+class ModeleCompact:
+    """Modèle relu depuis un export compact (predict, predict_proba, predire_textes)"""
+    
+    def __init__(self, tableaux):
+        self.meta = json.loads(str(tableaux['meta']))
+        self.type = self.meta['type']
+        self.n_features_in_ = self.meta['n_features']
+        self.classes_ = tableaux['classes']
+        self.etiquettes = tableaux['etiquettes']
+        self.colonnes = tableaux['colonnes']
+        self.tableaux = {nom: tableaux[nom] for nom in tableaux.files
+                         if nom not in ('meta', 'termes')}
+        
+        self.index_termes = None
+        if 'termes' in tableaux.files:
+            termes = tableaux['termes'].tobytes().decode('utf-8').split('\n')
+            self.index_termes = {terme: i for i, terme in enumerate(termes)}
+            self.token_pattern = re.compile(self.meta['texte']['token_pattern'])
+    
+    def _selection(self, X):
+        """Colonnes gardées de X : creuses si X l'est, sinon float32 dense"""
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"{X.shape[1]} features, {self.n_features_in_} attendues")
+        if sparse.issparse(X):
+            return sparse.csr_matrix(X)[:, self.colonnes]
+        return np.asarray(X, dtype=np.float32)[:, self.colonnes]
+    
+    def decision_function(self, X):
+        """Scores linéaires (une colonne par classe, ou une seule en binaire)"""
+        if self.type != 'lineaire':
+            raise AttributeError("decision_function n'existe que pour les modèles linéaires")
+        # Produit creux x dense : X n'est jamais densifié
+        scores = np.asarray(self._selection(X) @ self.tableaux['poids'].T) + self.tableaux['biais']
+        return scores[:, 0] if scores.shape[1] == 1 else scores
+    
+    def _probabilites_arbres(self, X):
+        """Moyenne des distributions des feuilles atteintes dans chaque arbre"""
+        # Seules les colonnes utilisées par un nœud sont densifiées
+        X = self._selection(X)
+        if sparse.issparse(X):
+            X = X.toarray().astype(np.float32)
+        gauche, droite = self.tableaux['gauche'], self.tableaux['droite']
+        feature, seuil = self.tableaux['feature'], self.tableaux['seuil']
+        
+        # Seules les paires (publication, arbre) pas encore arrivées à une feuille avancent
+        n_arbres = len(self.tableaux['racines'])
+        noeuds = np.tile(self.tableaux['racines'], X.shape[0])
+        lignes = np.repeat(np.arange(X.shape[0]), n_arbres)
+        actifs = np.flatnonzero(gauche[noeuds] >= 0)
+        while actifs.size:
+            courants = noeuds[actifs]
+            a_gauche = X[lignes[actifs], feature[courants]] <= seuil[courants]
+            noeuds[actifs] = np.where(a_gauche, gauche[courants], droite[courants])
+            actifs = actifs[gauche[noeuds[actifs]] >= 0]
+        noeuds = noeuds.reshape(X.shape[0], n_arbres)
+        return self.tableaux['valeurs'][noeuds].astype(np.float64).mean(axis=1)
+    
+    def predict_proba(self, X):
+        """Probabilités des classes (ordre de classes_)"""
+        if self.type == 'arbres':
+            return self._probabilites_arbres(X)
+        
+        probabilites = self.meta['probabilites']
+        scores = self.decision_function(X).astype(np.float64)
+        if probabilites == 'softmax':
+            scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return scores / scores.sum(axis=1, keepdims=True)
+        if probabilites == 'logistique':
+            positif = 1 / (1 + np.exp(-scores))
+            return np.column_stack([1 - positif, positif])
+        if probabilites == 'ovr':
+            scores = 1 / (1 + np.exp(-scores))
+            return scores / scores.sum(axis=1, keepdims=True)
+        if probabilites == 'huber':
+            # SGDClassifier(loss='modified_huber') : (clip(d, -1, 1) + 1) / 2, normalisé
+            scores = (np.clip(scores, -1, 1) + 1) / 2
+            if scores.ndim == 1:
+                return np.column_stack([1 - scores, scores])
+            sommes = scores.sum(axis=1)
+            nulles = sommes == 0
+            scores[nulles] = 1
+            sommes[nulles] = scores.shape[1]
+            return scores / sommes[:, np.newaxis]
+        raise AttributeError(f"{self.meta['modele']} n'a pas de predict_proba")
+    
+    def predict(self, X):
+        """Classes prédites (valeurs de classes_, comme le modèle d'origine)"""
+        if self.type == 'arbres':
+            return self.classes_[self._probabilites_arbres(X).argmax(axis=1)]
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+    
+    def vectoriser(self, textes):
+        """Matrice TF-IDF des textes, identique au TfidfVectorizer exporté"""
+        if self.index_termes is None:
+            raise ValueError("L'export ne contient pas de vocabulaire TfidfVectorizer")
+        textes = list(textes)
+        texte = self.meta['texte']
+        n_min, n_max = texte['ngram_range']
+        
+        lignes, colonnes, valeurs = [], [], []
+        for i, document in enumerate(textes):
+            tokens = self.token_pattern.findall(document.lower() if texte['lowercase'] else document)
+            comptes = {}
+            for n in range(n_min, n_max + 1):
+                for debut in range(len(tokens) - n + 1):
+                    colonne = self.index_termes.get(' '.join(tokens[debut:debut + n]))
+                    if colonne is not None:
+                        comptes[colonne] = comptes.get(colonne, 0) + 1
+            lignes.extend([i] * len(comptes))
+            colonnes.extend(comptes)
+            valeurs.extend(comptes.values())
+        
+        matrice = sparse.csr_matrix((np.asarray(valeurs, dtype=np.float64), (lignes, colonnes)),
+                                    shape=(len(textes), len(self.index_termes)))
+        if texte['sublinear_tf']:
+            np.log(matrice.data, out=matrice.data)
+            matrice.data += 1
+        matrice = matrice @ sparse.diags(self.tableaux['idf'].astype(np.float64))
+        if texte['norm']:
+            ordre = 2 if texte['norm'] == 'l2' else 1
+            normes = np.asarray(abs(matrice).power(ordre).sum(axis=1)).ravel() ** (1 / ordre)
+            normes[normes == 0] = 1
+            matrice = sparse.diags(1 / normes) @ matrice
+        return matrice.tocsr()
+    
+    def predire_textes(self, textes):
+        """Étiquettes de sentiment de textes prétraités"""
+        return self.etiquettes[self.predict(self.vectoriser(textes))]
+
+
+def charger_modele_compact(chemin):
+    """Relit un export compact (sans importer scikit-learn)"""
+    with np.load(chemin, allow_pickle=False) as tableaux:
+        return ModeleCompact(tableaux)
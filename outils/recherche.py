@@ -0,0 +1,242 @@
+"""
+Recherche d'hyperparamètres par divisions successives (successive halving)
+
+Tous les candidats sont d'abord évalués en validation croisée sur une petite
+fraction de chaque pli d'entraînement ; seul le meilleur tiers (facteur=3)
+passe au tour suivant, où la fraction est multipliée par le facteur. Le
+dernier tour utilise les plis complets : ses scores sont des scores de
+validation croisée ordinaires.
+
+Chaque essai (modèle, paramètres, fraction) est ajouté à un historique JSON
+identifié par l'empreinte des données et des plis : une nouvelle exécution
+sur les mêmes données reprend les scores connus au lieu de réajuster. Quand
+les données ont changé (nouvelles annotations), la recherche est amorcée par
+l'exécution précédente : seul son meilleur tiers de candidats est réévalué,
+en repartant de la plus petite fraction.
+    
+    recherche = RechercheHalving(ESPACES, historique='resultats/historique_recherche.json')
+    meilleurs = recherche.executer(X_train, y_train)
+"""
+
+import json
+import math
+import hashlib
+import warnings
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, check_cv, train_test_split
+
+from outils.artefacts import empreinte_tableau
+
+
+def empreinte_donnees(X, y):
+    """Empreinte SHA-256 d'un ensemble (X dense ou creux, y)"""
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X, copy=True)
+        X.sum_duplicates()
+        tableaux = [X.data, X.indices, X.indptr]
+    else:
+        tableaux = [np.asarray(X)]
+    empreinte = hashlib.sha256(str(X.shape).encode())
+    for tableau in tableaux + [np.asarray(y)]:
+        empreinte.update(empreinte_tableau(tableau).encode())
+    return empreinte.hexdigest()
+
+
+def _evaluer(modele, X, y, train, test):
+    """Score d'un candidat sur un pli (exécuté dans un worker)"""
+    warnings.filterwarnings('ignore')
+    return clone(modele).fit(X[train], y[train]).score(X[test], y[test])
+
+
+class RechercheHalving:
+    """Recherche par divisions successives sur plusieurs familles de modèles"""
+    
+    def __init__(self, espaces, facteur=3, min_echantillons=30, cv=5, n_jobs=-1,
+                 historique=None, amorcage=True, random_state=42):
+        """
+        Args:
+            espaces: Dictionnaire {nom: (estimateur de base, grille de paramètres)}
+            facteur: Part des candidats éliminés à chaque tour (on garde 1/facteur)
+            min_echantillons: Taille minimale d'un sous-ensemble d'entraînement
+            cv: Nombre de plis ou objet de validation croisée scikit-learn
+            n_jobs: Nombre de processus pour les évaluations
+            historique: Fichier JSON des essais (None : pas de persistance)
+            amorcage: Sur des données nouvelles, ne réévaluer que le meilleur
+                      tiers des candidats de l'exécution précédente
+            random_state: Graine des sous-échantillonnages
+        """
+        self.espaces = espaces
+        self.facteur = facteur
+        self.min_echantillons = min_echantillons
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.historique = Path(historique) if historique else None
+        self.amorcage = amorcage
+        self.random_state = random_state
+        self.essais = self._charger_historique()
+    
+    def _charger_historique(self):
+        if self.historique is None or not self.historique.exists():
+            return []
+        with open(self.historique, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _sauvegarder_historique(self):
+        if self.historique is None:
+            return
+        self.historique.parent.mkdir(parents=True, exist_ok=True)
+        temporaire = self.historique.with_name(self.historique.name + '.tmp')
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(self.essais, f, ensure_ascii=False, indent=2)
+        temporaire.replace(self.historique)
+    
+    @staticmethod
+    def _cle(empreinte, nom, parametres, fraction):
+        return (empreinte, nom, json.dumps(parametres, sort_keys=True), round(fraction, 6))
+    
+    def survivants_precedents(self, nom, candidats, empreinte):
+        """
+        Candidats de la grille qui ont passé le premier tour de l'exécution précédente
+        
+        L'exécution précédente est la dernière empreinte de l'historique pour
+        ce modèle avant la première apparition de l'empreinte actuelle. Ses candidats sont classés par
+        fraction atteinte puis par score à cette fraction ; le premier tiers
+        (1/facteur de la grille) est gardé, ainsi que les candidats absents de
+        l'exécution précédente (grille élargie depuis).
+        
+        Returns:
+            Sous-liste de candidats (ordre de la grille), ou None sans
+            exécution précédente exploitable
+        """
+        precedents = [e for e in self.essais if e['modele'] == nom]
+        # Une nouvelle exécution sur les mêmes données refait le même amorçage
+        # (celui de sa première exécution) et retrouve ainsi tous ses essais
+        premier = next((i for i, e in enumerate(precedents) if e['empreinte'] == empreinte), len(precedents))
+        precedents = precedents[:premier]
+        if not precedents:
+            return None
+        derniere = precedents[-1]['empreinte']
+        
+        cles = [json.dumps(parametres, sort_keys=True) for parametres in candidats]
+        niveaux = {}
+        for essai in precedents:
+            cle = json.dumps(essai['parametres'], sort_keys=True)
+            if essai['empreinte'] == derniere and cle in cles:
+                niveaux[cle] = max(niveaux.get(cle, (0.0, 0.0)), (essai['fraction'], essai['score']))
+        
+        garder = max(1, math.ceil(len(candidats) / self.facteur))
+        gardes = set(sorted(niveaux, key=niveaux.get, reverse=True)[:garder])
+        retenus = [parametres for parametres, cle in zip(candidats, cles)
+                   if cle in gardes or cle not in niveaux]
+        return retenus if len(retenus) < len(candidats) else None
+    
+    def fractions(self, n_candidats, n_train):
+        """Fractions des plis d'entraînement utilisées à chaque tour (la dernière vaut 1)"""
+        n_tours = max(1, math.ceil(math.log(max(n_candidats, 1), self.facteur)) + 1)
+        while n_tours > 1 and n_train / self.facteur ** (n_tours - 1) < self.min_echantillons:
+            n_tours -= 1
+        return [1 / self.facteur ** (n_tours - 1 - i) for i in range(n_tours)]
+    
+    def _sous_plis(self, plis, y, fraction):
+        """Sous-ensembles stratifiés (déterministes) des plis d'entraînement"""
+        if fraction >= 1:
+            return plis
+        sous_plis = []
+        for train, test in plis:
+            taille = max(int(round(len(train) * fraction)), len(np.unique(y[train])))
+            sous_train, _ = train_test_split(train, train_size=taille, stratify=y[train],
+                                             random_state=self.random_state)
+            sous_plis.append((np.sort(sous_train), test))
+        return sous_plis
+    
+    def executer(self, X, y, plis=None, evaluateur=None):
+        """
+        Lance la recherche sur chaque famille de modèles
+        
+        Args:
+            X, y: Ensemble d'entraînement
+            plis: Liste (train, test) à utiliser ; par défaut check_cv(cv)
+            evaluateur: Fonction (nom, estimateurs) -> (scores moyens, nombre
+                        d'ajustements) utilisée pour le dernier tour (plis
+                        complets), par exemple pour partager un cache de plis
+        
+        Returns:
+            Dictionnaire {nom: {'modele' (réajusté sur X), 'parametres', 'score_cv',
+            'evaluations', 'reprises', 'amorces'}} ; amorces est le nombre de
+            candidats repris de l'exécution précédente (0 sans amorçage)
+        """
+        y = np.asarray(y)
+        if plis is None:
+            plis = list(check_cv(self.cv, y, classifier=True).split(X, y))
+        
+        # Les essais ne sont réutilisables qu'avec les mêmes données, plis et graine
+        empreinte = hashlib.sha256(f'{empreinte_donnees(X, y)}|{self.random_state}'.encode())
+        for train, test in plis:
+            empreinte.update(empreinte_tableau(np.asarray(train)).encode())
+            empreinte.update(empreinte_tableau(np.asarray(test)).encode())
+        empreinte = empreinte.hexdigest()
+        connus = {self._cle(e['empreinte'], e['modele'], e['parametres'], e['fraction']): e['score']
+                  for e in self.essais}
+        
+        resultats = {}
+        for nom, (base, grille) in self.espaces.items():
+            candidats = list(ParameterGrid(grille))
+            amorces = self.survivants_precedents(nom, candidats, empreinte) if self.amorcage else None
+            if amorces:
+                candidats = amorces
+            fractions = self.fractions(len(candidats), min(len(train) for train, _ in plis))
+            evaluations = 0
+            reprises = 0
+            
+            for tour, fraction in enumerate(fractions):
+                sous_plis = self._sous_plis(plis, y, fraction)
+                cles = [self._cle(empreinte, nom, parametres, fraction) for parametres in candidats]
+                a_evaluer = [i for i, cle in enumerate(cles) if cle not in connus]
+                reprises += len(candidats) - len(a_evaluer)
+                
+                estimateurs = [clone(base).set_params(**candidats[i]) for i in a_evaluer]
+                if not estimateurs:
+                    nouveaux_scores = []
+                elif fraction >= 1 and evaluateur is not None:
+                    nouveaux_scores, ajustements = evaluateur(nom, estimateurs)
+                    evaluations += ajustements
+                else:
+                    scores_plis = Parallel(n_jobs=self.n_jobs)(
+                        delayed(_evaluer)(estimateur, X, y, train, test)
+                        for estimateur in estimateurs for train, test in sous_plis
+                    )
+                    evaluations += len(scores_plis)
+                    nouveaux_scores = [np.mean(scores_plis[j * len(sous_plis):(j + 1) * len(sous_plis)])
+                                       for j in range(len(estimateurs))]
+                
+                for i, score in zip(a_evaluer, nouveaux_scores):
+                    score = float(score)
+                    connus[cles[i]] = score
+                    self.essais.append({'empreinte': empreinte, 'modele': nom,
+                                        'parametres': candidats[i], 'fraction': round(fraction, 6),
+                                        'score': score})
+                self._sauvegarder_historique()
+                
+                # Tri stable : à score égal, l'ordre de la grille est conservé
+                scores = [connus[cle] for cle in cles]
+                ordre = sorted(range(len(candidats)), key=lambda i: -scores[i])
+                if tour < len(fractions) - 1:
+                    garder = max(1, math.ceil(len(candidats) / self.facteur))
+                    candidats = [candidats[i] for i in sorted(ordre[:garder])]
+            
+            meilleur = candidats[ordre[0]]
+            resultats[nom] = {
+                'modele': clone(base).set_params(**meilleur).fit(X, y),
+                'parametres': meilleur,
+                'score_cv': scores[ordre[0]],
+                'evaluations': evaluations,
+                'reprises': reprises,
+                'amorces': len(amorces) if amorces else 0
+            }
+        
+        return resultats
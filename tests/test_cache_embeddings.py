@@ -0,0 +1,85 @@
+"""
+Cache persistant des embeddings BERT (ameliorations/cache_embeddings.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE / 'ameliorations'))
+
+from cache_embeddings import CacheEmbeddings, EMBEDDINGS, INDEX
+
+DIMENSION = 4
+
+
+def embeddings_aleatoires(n, graine=0):
+    return np.random.default_rng(graine).normal(size=(n, DIMENSION)).astype(np.float32)
+
+
+def test_ajout_puis_reouverture(tmp_path):
+    textes = ["premier texte", "deuxième texte", "troisième texte"]
+    embeddings = embeddings_aleatoires(3)
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    cache.enregistrer_lot(textes[:2], embeddings[:2])
+    cache.enregistrer_lot(textes[1:], embeddings[1:])
+    
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    trouves, absents = cache.obtenir_lot(textes[::-1] + ["texte inconnu"])
+    
+    assert absents == [3]
+    np.testing.assert_array_equal(trouves[:3], embeddings[::-1])
+    assert cache.statistiques()['entrees'] == 3
+    assert (cache.dossier / EMBEDDINGS).stat().st_size == 3 * DIMENSION * 4
+
+
+def test_troncature_des_lignes_non_indexees(tmp_path):
+    textes = ["premier texte", "deuxième texte"]
+    embeddings = embeddings_aleatoires(3)
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    cache.enregistrer_lot(textes, embeddings[:2])
+    
+    # Interruption entre l'écriture des embeddings et celle de l'index
+    with open(cache.dossier / EMBEDDINGS, 'ab') as f:
+        f.write(embeddings[2].tobytes() + b'\x00\x01')
+    with open(cache.dossier / INDEX, 'a', encoding='utf-8') as f:
+        f.write("abc")
+    
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    assert cache.n_lignes == 2
+    assert (cache.dossier / EMBEDDINGS).stat().st_size == 2 * DIMENSION * 4
+    
+    # Le prochain ajout reprend à la ligne 2
+    cache.enregistrer_lot(["troisième texte"], embeddings[2:])
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    trouves, absents = cache.obtenir_lot(textes + ["troisième texte"])
+    assert absents == []
+    np.testing.assert_array_equal(trouves, embeddings)
+
+
+def test_compacter_garde_les_textes_demandes(tmp_path):
+    textes = [f"texte {i}" for i in range(5)]
+    embeddings = embeddings_aleatoires(5)
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    cache.enregistrer_lot(textes, embeddings)
+    
+    gardes, liberes = cache.compacter([textes[3], textes[1], "texte absent du cache"])
+    
+    assert gardes == 2
+    assert liberes == 3 * DIMENSION * 4
+    cache = CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    trouves, absents = cache.obtenir_lot(textes)
+    assert absents == [0, 2, 4]
+    np.testing.assert_array_equal(trouves[[1, 3]], embeddings[[1, 3]])
+
+
+def test_dimension_differente(tmp_path):
+    CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION)
+    with pytest.raises(ValueError):
+        CacheEmbeddings(tmp_path, 'modele', 'cls', DIMENSION * 2)
+    
+    # Un autre pooling a son propre dossier
+    assert CacheEmbeddings(tmp_path, 'modele', 'moyenne', DIMENSION * 2).dimension == DIMENSION * 2
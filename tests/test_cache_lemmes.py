@@ -0,0 +1,31 @@
+"""
+Éviction LRU du cache de lemmes (03_Pretraitement/cache_lemmes.py)
+"""
+
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE / '03_Pretraitement'))
+
+import cache_lemmes
+from cache_lemmes import CacheLemmes
+
+
+def test_succes_memoire_compte_pour_l_eviction(tmp_path, monkeypatch):
+    horloge = iter(range(1, 100))
+    monkeypatch.setattr(cache_lemmes.time, 'time', lambda: next(horloge))
+    cache = CacheLemmes(tmp_path / 'cache.sqlite', 'modele', '1.0', taille_max=2)
+    
+    cache.enregistrer('texte a', ['a'])
+    cache.enregistrer('texte b', ['b'])
+    # « texte a » est servi par la LRU en mémoire : il devient le plus récent sur disque
+    assert cache.obtenir('texte a') == ['a']
+    assert cache.succes_memoire == 1
+    cache.enregistrer('texte c', ['c'])
+    cache.fermer()
+    
+    cache = CacheLemmes(tmp_path / 'cache.sqlite', 'modele', '1.0', taille_max=2)
+    assert cache.obtenir_lot(['texte a', 'texte b', 'texte c']) == {'texte a': ['a'], 'texte c': ['c']}
+    assert cache.succes_disque == 2
+    cache.fermer()
@@ -0,0 +1,29 @@
+"""
+Schéma du stockage Parquet du corpus (outils/colonnes.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip('pyarrow')
+
+from outils.colonnes import ecrire_parquet, charger_colonnes
+
+
+def test_champ_apparu_apres_le_premier_bloc(tmp_path):
+    chemin = tmp_path / 'corpus.json'
+    publications = [{'id': str(i), 'texte': f"texte {i}"} for i in range(5)]
+    publications[3]['sentiment'] = 'positif'
+    publications[4]['date_annotation'] = '2026-01-01T00:00:00'
+    
+    ecrire_parquet(chemin, publications, taille_bloc=2)
+    df = charger_colonnes(chemin, ['id', 'sentiment', 'date_annotation'])
+    
+    assert df['id'].tolist() == ['0', '1', '2', '3', '4']
+    assert df['sentiment'].tolist()[3] == 'positif'
+    assert df['sentiment'].isna().sum() == 4
+    assert df['date_annotation'].tolist()[4] == '2026-01-01T00:00:00'
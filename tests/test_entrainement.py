@@ -0,0 +1,68 @@
+"""
+Alignement de la matrice TF-IDF sur les publications annotées
+(EntraineurSentiment.matrice_alignee, 05_Entrainement/entrainement.py)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+sys.path.insert(0, str(RACINE / '05_Entrainement'))
+sys.path.insert(0, str(RACINE / '03_Pretraitement'))
+
+from outils.corpus import empreinte_texte
+from outils.artefacts import sauvegarder_artefact
+from entrainement import EntraineurSentiment
+from pretraitement import nettoyer_textes, pretraitement_lot
+
+PUBLICATIONS = [
+    {'id': 'P1', 'texte': "Les cours en ligne de l'UVBF sont excellents !", 'sentiment': 'positif'},
+    {'id': 'P2', 'texte': "La plateforme est lente, impossible de suivre les cours.", 'sentiment': 'negatif'},
+    {'id': 'P3', 'texte': "Inscription ouverte pour les étudiants.", 'sentiment': 'neutre'},
+    {'id': 'P4', 'texte': "Encore une coupure de la plateforme pendant l'examen.", 'sentiment': 'negatif'},
+    {'id': 'P5', 'texte': "Merci aux enseignants pour leur disponibilité.", 'sentiment': 'positif'},
+]
+
+
+def test_lignes_reprises_et_manquantes(tmp_path):
+    traites = [' '.join(tokens) for tokens in
+               pretraitement_lot(nettoyer_textes([p['texte'] for p in PUBLICATIONS]))]
+    vectoriseur = TfidfVectorizer().fit(traites)
+    
+    # Matrice de l'étape 4 pour P1 et P3 seulement
+    dossier_vectorisation = tmp_path / '04_Vectorisation'
+    dossier_vectorisation.mkdir()
+    exportes = [0, 2]
+    sauvegarder_artefact(dossier_vectorisation, 'matrice_tfidf',
+                         vectoriseur.transform([traites[i] for i in exportes]))
+    pd.DataFrame({
+        'id': [PUBLICATIONS[i]['id'] for i in exportes],
+        'empreinte': [empreinte_texte(PUBLICATIONS[i]['texte']) for i in exportes],
+    }).to_csv(dossier_vectorisation / 'uvbf_tfidf_index.csv', index=False)
+    
+    # Corpus prétraité pour P2 et P4 ; P5 n'est nulle part et doit être lemmatisée
+    dossier_pretraitement = tmp_path / '03_Pretraitement'
+    dossier_pretraitement.mkdir()
+    with open(dossier_pretraitement / 'uvbf_data_pretraite.json', 'w', encoding='utf-8') as f:
+        json.dump([{**PUBLICATIONS[i], 'texte_traite': traites[i]} for i in (1, 3)], f)
+    
+    entraineur = EntraineurSentiment(n_jobs=1)
+    entraineur.projet_dir = tmp_path
+    X = entraineur.matrice_alignee(pd.DataFrame(PUBLICATIONS), vectoriseur)
+    
+    np.testing.assert_allclose(X.toarray(), vectoriseur.transform(traites).toarray())
+
+
+def test_df_vide_sans_artefact(tmp_path):
+    vectoriseur = TfidfVectorizer().fit(["cours en ligne", "plateforme lente"])
+    entraineur = EntraineurSentiment(n_jobs=1)
+    entraineur.projet_dir = tmp_path
+    X = entraineur.matrice_alignee(pd.DataFrame(columns=['id', 'texte', 'sentiment']), vectoriseur)
+    
+    assert X.shape == (0, len(vectoriseur.vocabulary_))
@@ -0,0 +1,73 @@
+"""
+Delta des annotations de l'entraînement incrémental
+(05_Entrainement/entrainement_incremental.py)
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+sys.path.insert(0, str(RACINE / '05_Entrainement'))
+
+from entrainement_incremental import EntraineurIncremental
+
+PUBLICATIONS = [
+    ('P1', "cours excellent", 'positif', '2026-01-01T10:00:00'),
+    ('P2', "plateforme lente", 'negatif', '2026-01-01T10:00:00'),
+    ('P3', "inscription ouverte", 'neutre', '2026-01-01T11:00:00'),
+    ('P4', "enseignant disponible merci", 'positif', '2026-01-01T11:00:00'),
+]
+
+
+def ecrire_annotations(projet, publications):
+    with open(projet / '02_Annotation' / 'uvbf_data_annote.json', 'w', encoding='utf-8') as f:
+        json.dump([{'id': i, 'texte': t, 'texte_traite': t, 'sentiment': s, 'date_annotation': d}
+                   for i, t, s, d in publications], f, ensure_ascii=False)
+
+
+def entraineur(projet):
+    entraineur = EntraineurIncremental(modele='nb')
+    entraineur.projet_dir = projet
+    entraineur.script_dir = projet / '05_Entrainement'
+    entraineur.dossier_points = entraineur.script_dir / 'points_controle'
+    entraineur.chemin_vectoriseur = projet / '04_Vectorisation' / 'vectoriseur.pkl'
+    return entraineur
+
+
+def test_reannotation_et_meme_horodatage(tmp_path):
+    for dossier in ('02_Annotation', '04_Vectorisation', '05_Entrainement'):
+        (tmp_path / dossier).mkdir()
+    textes = [t for _, t, _, _ in PUBLICATIONS] + ["examen reporté"]
+    vectoriseur = TfidfVectorizer().fit(textes)
+    joblib.dump(vectoriseur, tmp_path / '04_Vectorisation' / 'vectoriseur.pkl')
+    
+    ecrire_annotations(tmp_path, PUBLICATIONS)
+    assert entraineur(tmp_path).mettre_a_jour()['publications'] == 4
+    
+    # P2 réannotée, P5 annotée à la même seconde que la dernière annotation apprise
+    publications = PUBLICATIONS + [('P5', "examen reporté", 'negatif', '2026-01-01T11:00:00')]
+    publications[1] = ('P2', "plateforme lente", 'neutre', '2026-01-02T09:00:00')
+    ecrire_annotations(tmp_path, publications)
+    point = entraineur(tmp_path).mettre_a_jour()
+    assert (point['nouvelles_publications'], point['publications_reannotees']) == (1, 1)
+    assert point['publications'] == 5
+    
+    # Comptes identiques à un MultinomialNB appris d'un coup sur les sentiments finaux
+    modele = joblib.load(tmp_path / '05_Entrainement' / 'modele_incremental.pkl')
+    encodeur = joblib.load(tmp_path / '05_Entrainement' / 'encodeur_incremental.pkl')
+    reference = MultinomialNB().fit(vectoriseur.transform([t for _, t, _, _ in publications]),
+                                    encodeur.transform([s for _, _, s, _ in publications]))
+    np.testing.assert_allclose(modele.feature_count_, reference.feature_count_, atol=1e-12)
+    np.testing.assert_allclose(modele.class_count_, reference.class_count_)
+    np.testing.assert_allclose(modele.feature_log_prob_, reference.feature_log_prob_)
+    
+    # Rien de nouveau : modèle inchangé ; modele_sentiment n'est jamais écrit sans option
+    assert entraineur(tmp_path).mettre_a_jour() is None
+    assert not (tmp_path / '05_Entrainement' / 'modele_sentiment.pkl').exists()
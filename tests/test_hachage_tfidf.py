@@ -0,0 +1,90 @@
+"""
+Vectoriseur TF-IDF par hachage (outils/hachage_tfidf.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE))
+sys.path.insert(0, str(RACINE / '04_Vectorisation'))
+
+import pandas as pd
+
+from outils.hachage_tfidf import VectoriseurHachageTFIDF
+from outils.matrice_creuse import chemins_export
+from vectorisation_tfidf import vectoriser_hachage
+
+TEXTES = [
+    "cours uvbf plateforme accès",
+    "plateforme uvbf lente",
+    "cours en ligne uvbf",
+    "accès plateforme difficile",
+    "bon cours",
+]
+
+
+@pytest.mark.parametrize('min_df, max_df', [(2, 0.8), (0.4, 1.0), (0.3, 3)])
+def test_termes_et_poids_comme_tfidf(min_df, max_df):
+    hachage = VectoriseurHachageTFIDF(min_df=min_df, max_df=max_df, ngram_range=(1, 2))
+    matrice = hachage.fit_transform(TEXTES)
+    noms = hachage.termes_colonnes(TEXTES, taille_bloc=2)
+    
+    reference = TfidfVectorizer(min_df=min_df, max_df=max_df, ngram_range=(1, 2))
+    attendue = reference.fit_transform(TEXTES)
+    termes = reference.get_feature_names_out()
+    
+    assert sorted(noms.values()) == sorted(termes)
+    colonnes = {terme: colonne for colonne, terme in noms.items()}
+    np.testing.assert_allclose(matrice[:, [colonnes[t] for t in termes]].toarray(),
+                               attendue.toarray())
+
+
+def test_noms_limites_aux_colonnes_demandees():
+    hachage = VectoriseurHachageTFIDF().fit(TEXTES)
+    colonne = next(iter(hachage.termes_colonnes(["cours"])))
+    assert hachage.termes_colonnes(TEXTES, colonnes=[colonne]) == {colonne: 'cours'}
+
+
+@pytest.mark.parametrize('parametres', [{'min_df': 1.5}, {'max_df': -0.1}])
+def test_proportion_hors_bornes(parametres):
+    with pytest.raises(ValueError):
+        VectoriseurHachageTFIDF(**parametres)
+
+
+def test_mise_a_jour_comme_un_fit_complet(tmp_path):
+    avant = pd.DataFrame({'id': ['P1', 'P2', 'P3', 'P4', 'P5'], 'texte': TEXTES})
+    vectoriseur = VectoriseurHachageTFIDF(min_df=2, max_df=0.8).fit(avant['texte'])
+    avant.to_csv(chemins_export(tmp_path, 'uvbf_tfidf')[2], index=False)
+    
+    # P2 modifiée, P4 supprimée, P6 nouvelle, P7 en double
+    apres = pd.DataFrame({
+        'id': ['P1', 'P2', 'P3', 'P5', 'P6', 'P7', 'P7'],
+        'texte': [TEXTES[0], "plateforme uvbf rapide", TEXTES[2], TEXTES[4],
+                  "accès cours difficile", "cours uvbf", "cours uvbf"],
+    })
+    matrice, vectoriseur = vectoriser_hachage(apres, taille_bloc=2, vectoriseur=vectoriseur,
+                                              dossier_sortie=tmp_path)
+    
+    reference = VectoriseurHachageTFIDF(min_df=2, max_df=0.8).fit(apres['texte'])
+    assert vectoriseur.n_documents_ == reference.n_documents_ == len(apres)
+    np.testing.assert_array_equal(vectoriseur.frequences_documents_, reference.frequences_documents_)
+    np.testing.assert_allclose(matrice.toarray(), reference.transform(apres['texte']).toarray())
+
+
+def test_mise_a_jour_sans_index_reajuste(tmp_path):
+    vectoriseur = VectoriseurHachageTFIDF().fit(TEXTES)
+    apres = pd.DataFrame({'id': ['P1', 'P2'], 'texte': TEXTES[:2]})
+    _, vectoriseur = vectoriser_hachage(apres, vectoriseur=vectoriseur, dossier_sortie=tmp_path)
+    
+    assert vectoriseur.n_documents_ == 2
+
+
+def test_retirer_un_texte_jamais_compte():
+    vectoriseur = VectoriseurHachageTFIDF().fit(TEXTES[:2])
+    with pytest.raises(ValueError):
+        vectoriseur.retirer(["texte inconnu"])
@@ -0,0 +1,69 @@
+"""
+Lots bornés par un budget de jetons (outils/lots_jetons.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.lots_jetons import planifier_lots, lots_fixes, statistiques_lots
+
+
+def longueurs_melangees(n=500, graine=0):
+    """Tweets courts et quelques publications longues, dans le désordre"""
+    generateur = np.random.default_rng(graine)
+    longueurs = generateur.integers(5, 60, size=n)
+    longues = generateur.choice(n, size=n // 20, replace=False)
+    longueurs[longues] = generateur.integers(200, 513, size=len(longues))
+    return longueurs
+
+
+@pytest.mark.parametrize('budget', [512, 2048, 8192])
+def test_chaque_texte_une_seule_fois(budget):
+    longueurs = longueurs_melangees()
+    lots = planifier_lots(longueurs, budget_jetons=budget)
+    
+    indices = np.concatenate(lots)
+    assert np.array_equal(np.sort(indices), np.arange(len(longueurs)))
+
+
+@pytest.mark.parametrize('budget', [512, 2048, 8192])
+def test_budget_respecte(budget):
+    longueurs = longueurs_melangees()
+    for lot in planifier_lots(longueurs, budget_jetons=budget):
+        if len(lot) > 1:
+            assert len(lot) * longueurs[lot].max() <= budget
+
+
+def test_texte_plus_long_que_le_budget_seul():
+    longueurs = np.array([10, 600, 12, 11, 700])
+    lots = planifier_lots(longueurs, budget_jetons=512)
+    
+    assert [1] in [lot.tolist() for lot in lots]
+    assert [4] in [lot.tolist() for lot in lots]
+    assert np.array_equal(np.sort(np.concatenate(lots)), np.arange(5))
+
+
+def test_sorties_remises_dans_l_ordre_d_entree():
+    longueurs = longueurs_melangees()
+    resultat = np.empty((len(longueurs), 2))
+    for lot in planifier_lots(longueurs, budget_jetons=2048):
+        # Sortie factice d'un encodeur : la ligne i porte l'indice i et sa longueur
+        sorties = np.column_stack([lot, longueurs[lot]])
+        resultat[lot] = sorties
+    
+    assert np.array_equal(resultat[:, 0], np.arange(len(longueurs)))
+    assert np.array_equal(resultat[:, 1], longueurs)
+
+
+def test_moins_de_padding_que_les_lots_fixes():
+    longueurs = longueurs_melangees()
+    fixes = statistiques_lots(longueurs, lots_fixes(len(longueurs), 16))
+    budget = statistiques_lots(longueurs, planifier_lots(longueurs))
+    
+    assert budget['jetons'] == fixes['jetons'] == longueurs.sum()
+    assert budget['part_padding'] < fixes['part_padding']
@@ -0,0 +1,30 @@
+"""
+Conversion de l'ancien CSV TF-IDF dense (outils/matrice_creuse.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.matrice_creuse import convertir_csv_dense, charger_matrice_creuse
+
+
+def test_termes_homonymes_des_metadonnees(tmp_path):
+    chemin = tmp_path / 'dense.csv'
+    chemin.write_text(
+        "id,plateforme,texte,cours,id,plateforme\n"
+        "a1,twitter,bon cours,0.5,0.0,0.8\n"
+        "a2,facebook,id plateforme,0.0,0.6,0.4\n",
+        encoding='utf-8'
+    )
+    
+    convertir_csv_dense(chemin, tmp_path, taille_bloc=1)
+    matrice, metadonnees, termes = charger_matrice_creuse(tmp_path, 'uvbf_tfidf')
+    
+    assert list(metadonnees.columns) == ['id', 'plateforme', 'texte']
+    assert metadonnees['plateforme'].tolist() == ['twitter', 'facebook']
+    assert termes == ['cours', 'id', 'plateforme']
+    np.testing.assert_allclose(matrice.toarray(), [[0.5, 0.0, 0.8], [0.0, 0.6, 0.4]])
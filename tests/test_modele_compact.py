@@ -0,0 +1,47 @@
+"""
+Parité de l'export compact avec le modèle scikit-learn (outils/modele_compact.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.modele_compact import exporter_modele_compact, charger_modele_compact
+
+MODELES = {
+    'nb': lambda: MultinomialNB(),
+    'logistique': lambda: LogisticRegression(max_iter=1000),
+    'sgd_log_loss': lambda: SGDClassifier(loss='log_loss', random_state=0),
+    'sgd_modified_huber': lambda: SGDClassifier(loss='modified_huber', random_state=0),
+}
+
+
+def donnees(n_classes, graine=0):
+    generateur = np.random.default_rng(graine)
+    X = sparse.random(400, 2000, density=0.01, format='csr', random_state=graine)
+    y = generateur.integers(0, n_classes, size=400)
+    # Quelques colonnes liées à la classe pour que le problème soit apprenable
+    X = sparse.hstack([X, sparse.csr_matrix(np.eye(n_classes)[y] * generateur.random((400, 1)))], format='csr')
+    return X, y
+
+
+@pytest.mark.parametrize('n_classes', [2, 3])
+@pytest.mark.parametrize('nom', sorted(MODELES))
+def test_parite_predict_proba(tmp_path, nom, n_classes):
+    X, y = donnees(n_classes)
+    modele = MODELES[nom]().fit(X, y)
+    encodeur = LabelEncoder().fit([f"classe{i}" for i in range(n_classes)])
+    chemin = exporter_modele_compact(modele, encodeur, None, tmp_path / 'modele.npz')
+    compact = charger_modele_compact(chemin)
+    
+    np.testing.assert_array_equal(compact.predict(X), modele.predict(X))
+    np.testing.assert_allclose(compact.predict_proba(X), modele.predict_proba(X), atol=1e-5)
+    np.testing.assert_allclose(compact.predict_proba(X.toarray()), modele.predict_proba(X), atol=1e-5)
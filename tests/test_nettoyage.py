@@ -0,0 +1,51 @@
+"""
+Équivalence de nettoyer_texte avec l'ancienne chaîne de re.sub
+
+Mêmes cas que benchmark_nettoyage.py (cas limites, corpus annoté, textes
+aléatoires), exécutables avec pytest :
+    python -m pytest tests
+"""
+
+import sys
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+RACINE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RACINE / '03_Pretraitement'))
+
+from pretraitement import nettoyer_texte, nettoyer_textes
+from benchmark_nettoyage import nettoyer_texte_reference, CAS_LIMITES, textes_aleatoires
+
+
+def corpus_annote():
+    with open(RACINE / '02_Annotation' / 'uvbf_data_annote.json', 'r', encoding='utf-8') as f:
+        return [item.get('texte') for item in json.load(f)]
+
+
+@pytest.mark.parametrize('texte', CAS_LIMITES)
+def test_cas_limites(texte):
+    assert nettoyer_texte(texte) == nettoyer_texte_reference(texte)
+
+
+@pytest.mark.parametrize('graine', range(5))
+def test_textes_aleatoires(graine):
+    textes = textes_aleatoires(20_000, graine=graine)
+    differences = [t for t in textes if nettoyer_texte(t) != nettoyer_texte_reference(t)]
+    assert not differences, differences[:5]
+
+
+def test_corpus_annote():
+    corpus = corpus_annote()
+    assert nettoyer_textes(corpus) == [nettoyer_texte_reference(t) for t in corpus]
+
+
+def test_series_index_conserve():
+    corpus = corpus_annote()
+    serie = pd.Series(corpus, index=range(100, 100 + len(corpus)), name='texte')
+    resultat = nettoyer_textes(serie)
+    assert resultat.index.equals(serie.index)
+    assert resultat.name == 'texte'
+    assert resultat.tolist() == [nettoyer_texte_reference(t) for t in corpus]
@@ -0,0 +1,42 @@
+"""
+Recherche par divisions successives et son historique (outils/recherche.py)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from outils.recherche import RechercheHalving
+
+ESPACES = {'Régression Logistique': (LogisticRegression(max_iter=200),
+                                     {'C': [0.001, 0.01, 0.1, 1.0, 10.0, 100.0, 1000.0, 1e4, 1e5]})}
+
+
+def donnees(n, graine):
+    generateur = np.random.default_rng(graine)
+    X = generateur.normal(size=(n, 5))
+    y = (X[:, 0] + 0.5 * generateur.normal(size=n) > 0).astype(int)
+    return X, y
+
+
+def test_amorcage_sur_nouvelles_donnees(tmp_path):
+    historique = tmp_path / 'historique.json'
+    premiere = RechercheHalving(ESPACES, n_jobs=1, historique=historique)
+    resultat = premiere.executer(*donnees(300, 0))['Régression Logistique']
+    assert resultat['amorces'] == 0
+    
+    # Nouvelles annotations : empreinte différente, amorçage par l'exécution précédente
+    seconde = RechercheHalving(ESPACES, n_jobs=1, historique=historique)
+    resultat = seconde.executer(*donnees(330, 1))['Régression Logistique']
+    assert resultat['amorces'] == 3
+    assert resultat['evaluations'] < 9 * 5
+    
+    # Mêmes données : même amorçage, tous les essais sont repris
+    troisieme = RechercheHalving(ESPACES, n_jobs=1, historique=historique)
+    resultat = troisieme.executer(*donnees(330, 1))['Régression Logistique']
+    assert resultat['amorces'] == 3
+    assert resultat['evaluations'] == 0